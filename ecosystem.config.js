@@ -24,7 +24,7 @@ module.exports = {
             script: 'start-tts.sh',
             cwd: './voice',
             interpreter: 'bash',
-            listen_timeout: 60000,
+            listen_timeout: 15000,     // /health answers while the model loads
             autorestart: true,
             max_restarts: 5,
             restart_delay: 15000,
@@ -25,6 +25,7 @@ import time
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 import content_cache
+import device_registry
 import dial
 import tv_prep
 
@@ -35,6 +36,14 @@ if len(sys.argv) < 4:
 HOST = sys.argv[1]
 PORT = int(sys.argv[2])
 CMD  = sys.argv[3]
+NAME = os.getenv('CHROMECAST_NAME', 'Chromecaste')
+
+# The registry (kept current by the voice server's zeroconf browser) beats
+# the configured address: it follows the device when its IP changes.
+_KNOWN = device_registry.lookup(NAME) or device_registry.lookup(host=HOST)
+if _KNOWN:
+    NAME = _KNOWN['name']
+    HOST, PORT = _KNOWN['host'], int(_KNOWN['port'])
 
 _MEDIA_TYPES = {
     # Video
@@ -56,10 +65,40 @@ _NAMED_SERVICES = {'netflix', 'crunchyroll', 'disney', 'prime'}
 
 def _connect_cast():
     import pychromecast
+    known = _KNOWN or {}
     cast = pychromecast.get_chromecast_from_host(
-        (HOST, PORT, None, None, 'Chromecaste'),
+        (HOST, PORT, known.get('uuid') or None, known.get('model') or None, NAME),
+    )
+    try:
+        cast.wait(timeout=10)
+    except pychromecast.error.RequestTimeout:
+        pass                        # status stays None: handled below
+    if cast.status is None:
+        # Cached address no longer answers — the device probably moved.
+        cast.disconnect(blocking=False)
+        cast = _rediscover()
+    return cast
+
+
+def _rediscover():
+    global HOST, PORT
+    import pychromecast
+    print(f'[cast] {NAME} not answering at {HOST}:{PORT}, rediscovering…', file=sys.stderr)
+    casts, browser = pychromecast.get_listed_chromecasts(
+        friendly_names=[NAME], discovery_timeout=5,
     )
-    cast.wait(timeout=10)
+    pychromecast.discovery.stop_discovery(browser)
+    if not casts:
+        raise RuntimeError(f'Chromecast "{NAME}" not found on the network')
+    cast = casts[0]
+    info = cast.cast_info
+    HOST, PORT = info.host, info.port
+    device_registry.record(NAME, info.host, info.port, str(info.uuid), info.model_name or '')
+    try:
+        cast.wait(timeout=10)
+    except pychromecast.error.RequestTimeout:
+        cast.disconnect(blocking=False)
+        raise RuntimeError(f'Chromecast "{NAME}" found at {HOST}:{PORT} but not answering')
     return cast
 
 
@@ -0,0 +1,59 @@
+"""
+device_registry.py — Cast devices known to the house.
+
+Registry file: data/cast-devices.json (project root), kept current by the
+voice server's zeroconf browser (voice/cast_registry.py):
+
+{
+  "devices": [
+    { "name": "Chromecaste", "host": "10.0.0.140", "port": 8009,
+      "uuid": "…", "model": "Chromecast", "seen": 1718000000.0 }
+  ]
+}
+
+cast.py is a one-shot process: it connects straight from the cached entry
+(no scan), and only when that address no longer answers does it run a short
+discovery for the device and write the new address back.
+"""
+
+import json
+import os
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_PROJECT_ROOT = os.path.abspath(os.path.join(_HERE, '..', '..'))
+REGISTRY_FILE = os.path.join(_PROJECT_ROOT, 'data', 'cast-devices.json')
+
+
+def _load() -> list[dict]:
+    try:
+        with open(REGISTRY_FILE, encoding='utf-8') as f:
+            return json.load(f).get('devices', [])
+    except FileNotFoundError:
+        return []
+    except Exception as exc:
+        print(f'[registry] unreadable {REGISTRY_FILE}: {exc}', file=sys.stderr)
+        return []
+
+
+def lookup(name: str | None = None, host: str | None = None) -> dict | None:
+    """Most recently seen device matching ``name`` (case-insensitive) or ``host``."""
+    matches = [
+        d for d in _load()
+        if (name and d.get('name', '').lower() == name.lower()) or (host and d.get('host') == host)
+    ]
+    return max(matches, key=lambda d: d.get('seen', 0)) if matches else None
+
+
+def record(name: str, host: str, port: int, uuid: str = '', model: str = '') -> None:
+    """Store a device's current address (replacing its previous entry)."""
+    key = uuid or name.lower()
+    devices = [d for d in _load() if (d.get('uuid') or d.get('name', '').lower()) != key]
+    devices.append({'name': name, 'host': host, 'port': port, 'uuid': uuid,
+                    'model': model, 'seen': time.time()})
+    os.makedirs(os.path.dirname(REGISTRY_FILE), exist_ok=True)
+    tmp = REGISTRY_FILE + '.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'devices': devices}, f, indent=2)
+    os.replace(tmp, REGISTRY_FILE)
@@ -0,0 +1,26 @@
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+import device_registry as reg
+
+
+def _setup_registry():
+    reg.REGISTRY_FILE = os.path.join(tempfile.mkdtemp(), 'cast-devices.json')
+
+
+def test_lookup_missing_registry_returns_none():
+    _setup_registry()
+    assert reg.lookup('Chromecaste') is None
+
+
+def test_record_replaces_moved_device():
+    _setup_registry()
+    reg.record('Chromecaste', '10.0.0.140', 8009, 'uuid-tv', 'Chromecast')
+    reg.record('Salon', '10.0.0.20', 8009, 'uuid-salon')
+    reg.record('Chromecaste', '10.0.0.141', 8009, 'uuid-tv', 'Chromecast')
+    dev = reg.lookup('chromecaste')
+    assert dev['host'] == '10.0.0.141', dev
+    assert reg.lookup(host='10.0.0.20')['name'] == 'Salon'
+    assert reg.lookup(host='10.0.0.140') is None
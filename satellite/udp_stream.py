@@ -1,39 +1,74 @@
+import os
+import socket
+import struct
 import subprocess
 import time
+import zlib
 
-# FFmpeg command: capture from USB mic (ALSA hw:1,0) and stream raw PCM over UDP
+SERVER = (os.getenv("YUI_AUDIO_HOST", "10.0.0.101"), int(os.getenv("AUDIO_UDP_PORT", "5002")))  # Yui server LAN IP
+
+SAMPLE_RATE = 16000     # the voice server consumes 16 kHz mono directly
+FRAME_MS = 20           # one datagram per 20 ms of audio
+FRAME_BYTES = SAMPLE_RATE * FRAME_MS // 1000 * 2
+
+# Datagram header — mirrors voice/jitter_buffer.py (network byte order):
+# magic "YU", version, format, stream id, flags, sequence number, capture µs.
+HEADER = struct.Struct("!2sBBHHIQ")
+MAGIC = b"YU"
+VERSION = 1
+FORMAT_S16LE_16K_MONO = 1
+# Identifies this satellite (room) on the server; defaults to a hash of the hostname.
+STREAM_ID = int(os.getenv("STREAM_ID", str(zlib.crc32(socket.gethostname().encode()) & 0xFFFF)))
+
+# FFmpeg command: capture from USB mic (ALSA hw:1,0) and write raw PCM to stdout
 FFMPEG_CMD = [
     "ffmpeg",
     "-f", "alsa",       # ALSA input
     "-channels", "1",   # force mono input
     "-i", "hw:1,0",     # USB Microphone (card 1, device 0)
     "-ac", "1",         # mono output
-    "-ar", "48000",     # 48 kHz sample rate
+    "-ar", str(SAMPLE_RATE),
     "-f", "s16le",      # raw signed 16-bit PCM, little-endian (no WAV header)
     "-loglevel", "error",
     "-hide_banner",
-    "udp://10.0.0.101:5002"  # Yui server LAN IP
+    "pipe:1"
 ]
 
+_seq = 0    # keeps counting across ffmpeg restarts so the server sees one stream
+
 
 def start_stream():
     """Launch FFmpeg and return the process handle."""
     print("🎤 Starting UDP audio stream...")
-    return subprocess.Popen(FFMPEG_CMD, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    return subprocess.Popen(FFMPEG_CMD, stdout=subprocess.PIPE)  # stderr → service error log
+
+
+def send_frames(process, sock):
+    """Read fixed 20 ms frames from FFmpeg and send each with a sequenced,
+    timestamped header."""
+    global _seq
+    while True:
+        pcm = process.stdout.read(FRAME_BYTES)
+        if not pcm:
+            return
+        # The frame just finished capturing; its first sample is FRAME_MS older.
+        capture_us = time.time_ns() // 1000 - FRAME_MS * 1000
+        header = HEADER.pack(MAGIC, VERSION, FORMAT_S16LE_16K_MONO, STREAM_ID, 0, _seq, capture_us)
+        try:
+            sock.sendto(header + pcm, SERVER)
+        except OSError as e:
+            print(f"⚠️ Send failed: {e}")
+        _seq = (_seq + 1) & 0xFFFFFFFF
 
 
 def monitor_stream():
     """Watch the FFmpeg process and restart it on crash."""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     while True:
         process = start_stream()
-
-        for line in process.stderr:
-            print(line.strip())
-            if "Invalid argument" in line or "Error" in line:
-                print("⚠️ Error detected, restarting stream...")
-                process.terminate()
-                time.sleep(2)
-                break
+        send_frames(process, sock)
+        process.terminate()
+        process.wait()
 
         print("⏳ FFmpeg stopped, restarting...")
         time.sleep(2)
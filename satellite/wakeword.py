@@ -14,12 +14,20 @@ The model is selected by ``model_path``, which accepts either:
 
 Backbones ship bundled with the openwakeword pip package — no download needed.
 
+An ``EnergyGate`` skips model inference on clearly silent chunks (low RMS,
+no spectral onset); skipped chunks still advance the rolling buffers as
+silence, and the last ones are re-featurized from the raw audio when the
+gate opens, so detection at speech onset is not delayed.
+
 Dependencies (Pi): openwakeword==0.4.0, onnxruntime, numpy
 """
 from __future__ import annotations
 
 import logging
 import os
+import time
+from collections import defaultdict, deque
+from functools import partial
 
 import numpy as np
 
@@ -30,10 +38,139 @@ OWW_CHUNK = 1280
 # Surface any score at or above this floor at INFO level, to ease threshold
 # tuning from the logs (silence scores ~0.0, so this stays quiet when idle).
 LOG_FLOOR = 0.1
-# Chunks of silence fed on reset() to flush the rolling feature buffers
-# (~2.5 s — longer than the inference window) so the just-fired wake word
-# cannot immediately re-trigger after an utterance.
+# Chunks of silence fed once at startup to flush the rolling feature buffers
+# (~2.5 s — longer than the inference window); reset() restores that state
+# so the just-fired wake word cannot immediately re-trigger after an utterance.
 FLUSH_CHUNKS = 32
+# Raw samples kept in the snapshot: the streaming melspectrogram only reads
+# the last (accumulated + 480) samples of the 10 s raw buffer.
+_RAW_TAIL = 4 * OWW_CHUNK
+# Energy pre-gate: a chunk under WAKE_GATE_RMS (int16 units; 0 disables the
+# gate) whose loudest band energies rose by less than WAKE_GATE_FLUX_DB
+# skips inference, once WAKE_GATE_HANGOVER chunks have passed since the
+# last loud one.
+WAKE_GATE_RMS = float(os.getenv("WAKE_GATE_RMS", "100"))
+WAKE_GATE_FLUX_DB = float(os.getenv("WAKE_GATE_FLUX_DB", "6"))
+WAKE_GATE_HANGOVER = int(os.getenv("WAKE_GATE_HANGOVER", "12"))
+_GATE_BANDS = 16
+# Skipped chunks re-featurized when the gate opens: the head's 16-embedding
+# window plus the ~10 chunks of mel context behind its oldest embedding.
+_PREROLL_CHUNKS = 26
+# Log the gate's savings every ~5 min of audio.
+GATE_LOG_EVERY = 3750
+
+
+def _capture(model) -> dict:
+    """Copy of a Model's streaming state (preprocessor buffers, score history)."""
+    pre = model.preprocessor
+    return {
+        "raw": list(pre.raw_data_buffer)[-_RAW_TAIL:],
+        "raw_maxlen": pre.raw_data_buffer.maxlen,
+        "mel": pre.melspectrogram_buffer.copy(),
+        "features": pre.feature_buffer.copy(),
+        "accumulated": pre.accumulated_samples,
+        "scores": {k: list(v) for k, v in model.prediction_buffer.items()},
+    }
+
+
+def _restore(model, state: dict) -> None:
+    """Put ``state`` (from ``_capture``) back into ``model`` — array copies
+    only, no inference."""
+    pre = model.preprocessor
+    pre.raw_data_buffer = deque(state["raw"], maxlen=state["raw_maxlen"])
+    pre.melspectrogram_buffer = state["mel"].copy()
+    pre.feature_buffer = state["features"].copy()
+    pre.accumulated_samples = state["accumulated"]
+    model.prediction_buffer = defaultdict(partial(deque, maxlen=30))
+    for k, scores in state["scores"].items():
+        model.prediction_buffer[k].extend(scores)
+
+
+def _advance_silent(model, chunk: np.ndarray, silent: dict) -> None:
+    """Advance the streaming state over ``chunk`` without inference, using
+    the flushed-silence mel frames and embedding; the raw audio is kept."""
+    pre = model.preprocessor
+    pre.raw_data_buffer.extend(chunk.tolist())
+    pre.melspectrogram_buffer = np.vstack(
+        (pre.melspectrogram_buffer, silent["mel"][-8:]))[-pre.melspectrogram_max_len:]
+    pre.feature_buffer = np.vstack(
+        (pre.feature_buffer, silent["features"][-1:]))[-pre.feature_buffer_max_len:]
+    for k in silent["scores"]:
+        model.prediction_buffer[k].append(0.0)
+
+
+def _rewind_silent(model, n: int) -> None:
+    """Drop the placeholders of the last ``n`` skipped chunks so the next
+    ``predict()`` re-featurizes them from the raw buffer."""
+    pre = model.preprocessor
+    pre.melspectrogram_buffer = pre.melspectrogram_buffer[:-8 * n]
+    pre.feature_buffer = pre.feature_buffer[:-n]
+    pre.accumulated_samples = n * OWW_CHUNK
+
+
+class EnergyGate:
+    """Per-chunk decision to skip inference: RMS under ``rms_floor``, the
+    quarter of log band energies that rose most rose by less than
+    ``flux_db``, and ``hangover`` chunks since the last loud one."""
+
+    def __init__(self, rms_floor: float = WAKE_GATE_RMS, flux_db: float = WAKE_GATE_FLUX_DB,
+                 hangover: int = WAKE_GATE_HANGOVER):
+        self.rms_floor = rms_floor
+        self.flux_db = flux_db
+        self.hangover = hangover
+        self._window = np.hanning(OWW_CHUNK).astype(np.float32)
+        self._edges = np.linspace(0, OWW_CHUNK // 2 + 1, _GATE_BANDS + 1).astype(int)[:-1]
+        self._prev = None
+        self._open = hangover
+        self.chunks = 0
+        self.skipped = 0
+        self.gate_s = 0.0
+        self.model_s = 0.0
+        self.runs = 0
+        self.preroll_s = 0.0
+
+    def silent(self, chunk: np.ndarray) -> bool:
+        self.chunks += 1
+        if self.rms_floor <= 0:
+            return False
+        t0 = time.perf_counter()
+        x = chunk.astype(np.float32)
+        rms = float(np.sqrt(np.dot(x, x) / len(x)))
+        power = np.abs(np.fft.rfft(x * self._window)) ** 2
+        bands = 10.0 * np.log10(np.add.reduceat(power, self._edges) + 1.0)
+        flux = 0.0 if self._prev is None else float(
+            np.mean(np.sort(np.maximum(bands - self._prev, 0.0))[-_GATE_BANDS // 4:]))
+        self._prev = bands
+        if rms >= self.rms_floor or flux >= self.flux_db:
+            self._open = self.hangover
+            skip = False
+        elif self._open > 0:
+            self._open -= 1
+            skip = False
+        else:
+            skip = True
+        self.skipped += skip
+        self.gate_s += time.perf_counter() - t0
+        return skip
+
+    def ran(self, seconds: float) -> None:
+        self.model_s += seconds
+        self.runs += 1
+
+    def prerolled(self, seconds: float) -> None:
+        self.preroll_s += seconds
+
+    def stats(self) -> dict:
+        saved_s = (self.skipped * self.model_s / self.runs if self.runs else 0.0) \
+            - self.gate_s - self.preroll_s
+        return {
+            "chunks": self.chunks,
+            "skipped_fraction": round(self.skipped / self.chunks, 3) if self.chunks else 0.0,
+            "model_ms": round(self.model_s / self.runs * 1000, 2) if self.runs else None,
+            "gate_us": round(self.gate_s / self.chunks * 1e6, 1) if self.chunks else None,
+            "preroll_s": round(self.preroll_s, 1),
+            "cpu_saved_s": round(saved_s, 1),
+        }
 
 
 def _resolve_model(model: str) -> str:
@@ -80,15 +217,39 @@ class WakeWordEngine:
         self._model = Model(wakeword_model_paths=[path])
         # openwakeword registers the model under a key derived from the filename.
         self._key = list(self._model.models.keys())[0]
+        silence = np.zeros(OWW_CHUNK, dtype=np.int16)
+        for _ in range(FLUSH_CHUNKS):
+            self._model.predict(silence)
+        self._flushed = _capture(self._model)
+        self._gate = EnergyGate()
+        self._pending = 0           # chunks skipped since the last scored one
         log.info(
             f"OpenWakeWord ready (model={path}, key={self._key}, "
-            f"threshold={threshold}, frame_length={self.frame_length})"
+            f"threshold={threshold}, frame_length={self.frame_length}, "
+            f"gate_rms={WAKE_GATE_RMS})"
         )
 
     def score(self, pcm_int16: np.ndarray) -> float:
         """Feed one OWW_CHUNK frame, return current wake score in [0, 1]."""
-        preds = self._model.predict(pcm_int16)
-        return float(preds[self._key])
+        gate = self._gate
+        if (self._model.preprocessor.accumulated_samples == 0 and len(pcm_int16) == OWW_CHUNK
+                and gate.silent(pcm_int16)):
+            _advance_silent(self._model, pcm_int16, self._flushed)
+            self._pending += 1
+            score = 0.0
+        else:
+            if self._pending:
+                t0 = time.perf_counter()
+                _rewind_silent(self._model, min(self._pending, _PREROLL_CHUNKS))
+                gate.prerolled(time.perf_counter() - t0)
+                self._pending = 0
+            t0 = time.perf_counter()
+            score = float(self._model.predict(pcm_int16)[self._key])
+            if len(pcm_int16) == OWW_CHUNK:
+                gate.ran(time.perf_counter() - t0)
+        if gate.chunks and gate.chunks % GATE_LOG_EVERY == 0:
+            log.info(f"wake gate: {gate.stats()}")
+        return score
 
     def process(self, pcm_int16: np.ndarray) -> bool:
         """Feed one frame; return True if the wake word just fired."""
@@ -105,13 +266,13 @@ class WakeWordEngine:
         (notably the wake word that just fired) cannot re-trigger detection.
 
         ``Model.reset()`` only clears the score history; the preprocessor's
-        rolling feature/melspectrogram buffers still hold the wake word, so we
-        also push silence through to age it out of the inference window.
+        rolling feature/melspectrogram buffers still hold the wake word. We
+        restore the state captured after flushing silence at startup: the
+        same result as pushing FLUSH_CHUNKS of silence through, without
+        running the models, so detection resumes immediately.
         """
-        self._model.reset()
-        silence = np.zeros(OWW_CHUNK, dtype=np.int16)
-        for _ in range(FLUSH_CHUNKS):
-            self._model.predict(silence)
+        _restore(self._model, self._flushed)
+        self._pending = 0
 
     def cleanup(self) -> None:
         pass  # openwakeword / onnxruntime need no explicit teardown
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+XTTS benchmark — real-time factor and time-to-first-audio
+=========================================================
+Synthesizes a fixed set of French sentences on a running XTTS server
+(voice/tts_engine.py) and reports, per sentence and overall:
+
+  TTFA  time from request to the first PCM bytes (POST /tts/stream)
+  RTF   synthesis wall time / audio duration (< 1 is faster than real time)
+
+Run it once per server profile (e.g. XTTS_PROFILE=gpu, then cpu) and compare
+the JSON reports; --save-dir keeps the WAVs for a listening comparison.
+The profile reported by the server's /health is recorded in the report.
+Requests go out as interactive jobs, the only class streamed as it is
+synthesized: run it against an idle server.
+
+Usage:
+    python scripts/bench_tts.py
+    python scripts/bench_tts.py --runs 3 --mode both --json bench-cpu.json --save-dir /tmp/cpu
+
+Environment:
+    XTTS_SERVER_URL  — XTTS server base URL (default: http://localhost:18770)
+    XTTS_SPEAKER     — built-in speaker (default: server default)
+    XTTS_SPEED       — speed multiplier (default: 1.15)
+"""
+import argparse
+import json
+import os
+import statistics
+import struct
+import sys
+import time
+
+import requests
+
+XTTS_URL = os.getenv("XTTS_SERVER_URL", "http://localhost:18770").rstrip("/")
+SPEAKER  = os.getenv("XTTS_SPEAKER", "")
+SPEED    = float(os.getenv("XTTS_SPEED", "1.15"))
+
+# Fixed set, short confirmations to long answers: keep it stable so reports compare.
+SENTENCES = [
+    "D'accord.",
+    "C'est fait, la lumière du salon est éteinte.",
+    "Il est huit heures trente et il fait quatorze degrés dehors.",
+    "Ton prochain rendez-vous est demain à dix heures, chez le dentiste, rue de la République.",
+    "Aujourd'hui, le ciel sera couvert le matin avec quelques averses, puis le soleil reviendra "
+    "dans l'après-midi, avec une température maximale de vingt-deux degrés.",
+    "J'ai ajouté du lait, des œufs et trois baguettes à la liste de courses ; "
+    "veux-tu que je te la lise ?",
+]
+
+HEADER = 44             # WAV header from tts_engine.py (16-bit mono)
+
+
+def _payload(text: str) -> dict:
+    body = {"text": text, "language": "fr", "speed": SPEED, "priority": "interactive"}
+    if SPEAKER:
+        body["speaker"] = SPEAKER
+    return body
+
+
+def _rate(header: bytes) -> int:
+    return struct.unpack_from("<I", header, 24)[0]
+
+
+def bench_stream(text: str) -> tuple[dict, bytes]:
+    t0 = time.perf_counter()
+    ttfa = None
+    data = b""
+    with requests.post(f"{XTTS_URL}/tts/stream", json=_payload(text), stream=True, timeout=300) as r:
+        r.raise_for_status()
+        for chunk in r.iter_content(chunk_size=None):
+            data += chunk
+            if ttfa is None and len(data) > HEADER:
+                ttfa = time.perf_counter() - t0
+    total = time.perf_counter() - t0
+    audio_s = (len(data) - HEADER) / 2 / _rate(data)
+    return {"ttfa_ms": round((ttfa or total) * 1000, 1), "total_ms": round(total * 1000, 1),
+            "audio_s": round(audio_s, 2), "rtf": round(total / audio_s, 3) if audio_s else None}, data
+
+
+def bench_full(text: str) -> tuple[dict, bytes]:
+    t0 = time.perf_counter()
+    r = requests.post(f"{XTTS_URL}/tts", json=_payload(text), timeout=300)
+    r.raise_for_status()
+    total = time.perf_counter() - t0
+    data = r.content
+    idx = data.find(b"data", 12)
+    size = struct.unpack_from("<I", data, idx + 4)[0]
+    bits = struct.unpack_from("<H", data, 34)[0]
+    audio_s = size / (bits // 8) / _rate(data)
+    # Nothing plays before the whole clip is back: TTFA is the total time.
+    return {"ttfa_ms": round(total * 1000, 1), "total_ms": round(total * 1000, 1),
+            "audio_s": round(audio_s, 2), "rtf": round(total / audio_s, 3) if audio_s else None}, data
+
+
+def _summary(rows: list[dict]) -> dict:
+    ttfa = sorted(r["ttfa_ms"] for r in rows)
+    rtf = [r["rtf"] for r in rows if r["rtf"] is not None]
+    return {
+        "n": len(rows),
+        "ttfa_ms_p50": statistics.median(ttfa),
+        "ttfa_ms_p95": ttfa[min(len(ttfa) - 1, int(0.95 * len(ttfa)))],
+        "rtf_mean": round(statistics.mean(rtf), 3) if rtf else None,
+        "rtf_overall": round(sum(r["total_ms"] for r in rows) / 1000
+                             / sum(r["audio_s"] for r in rows), 3),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--mode", choices=("stream", "full", "both"), default="stream")
+    parser.add_argument("--runs", type=int, default=3, help="timed passes over the sentence set")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed passes first")
+    parser.add_argument("--json", help="write the full report here")
+    parser.add_argument("--save-dir", help="keep the last pass's WAVs here")
+    args = parser.parse_args()
+
+    try:
+        health = requests.get(f"{XTTS_URL}/health", timeout=5)
+        health.raise_for_status()
+        profile = health.json().get("profile") if health.content else None
+    except Exception as e:
+        print(f"XTTS server not reachable at {XTTS_URL}: {e}", file=sys.stderr)
+        return 1
+    print(f"Server profile: {profile or 'unknown'}")
+
+    modes = ("stream", "full") if args.mode == "both" else (args.mode,)
+    bench = {"stream": bench_stream, "full": bench_full}
+    report = {"url": XTTS_URL, "profile": profile, "speed": SPEED, "modes": {}}
+    for mode in modes:
+        for _ in range(args.warmup):
+            for text in SENTENCES:
+                bench[mode](text)
+        rows = []
+        for run in range(args.runs):
+            for i, text in enumerate(SENTENCES):
+                row, wav = bench[mode](text)
+                rows.append({"run": run, "sentence": i, **row})
+                if args.save_dir and run == args.runs - 1:
+                    os.makedirs(args.save_dir, exist_ok=True)
+                    with open(os.path.join(args.save_dir, f"{mode}-{i:02d}.wav"), "wb") as f:
+                        f.write(wav)
+        summary = _summary(rows)
+        report["modes"][mode] = {"summary": summary, "rows": rows}
+
+        print(f"\n[{mode}]  {'#':>2}  {'audio s':>7}  {'TTFA ms':>8}  {'total ms':>8}  {'RTF':>6}")
+        for row in rows[-len(SENTENCES):]:
+            print(f"{'':>8}  {row['sentence']:>2}  {row['audio_s']:>7.2f}  {row['ttfa_ms']:>8.0f}  "
+                  f"{row['total_ms']:>8.0f}  {row['rtf']:>6.3f}")
+        print(f"{'':>8}  TTFA p50 {summary['ttfa_ms_p50']:.0f} ms, p95 {summary['ttfa_ms_p95']:.0f} ms"
+              f" — RTF {summary['rtf_overall']:.3f} over {summary['n']} syntheses")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
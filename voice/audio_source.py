@@ -1,80 +1,496 @@
 """UDP audio receiver with a thread-safe ring of int16 samples. Live software
-gain is applied on read so tuning changes take effect immediately."""
+gain is applied on read so tuning changes take effect immediately.
+
+The ring is a fixed-capacity, preallocated int16 array: memory stays bounded
+no matter how long the reader stalls (e.g. during an STT/LLM/TTS turn), and
+the overflow policy decides what gets thrown away when it fills up.
+
+Ingest is zero-copy: datagrams are received with ``recvmsg_into`` straight
+into the ring's free space (scattered over the wrap point), and a socket that
+is readable is drained in one batch before the reader is woken up.
+
+Framed satellite packets (see ``jitter_buffer``) go through a jitter buffer
+that restores sequence order and conceals losses; in-order packets are still
+committed in place. Legacy headerless PCM is appended as-is.
+
+Several satellites can share the port: datagrams are demultiplexed by stream
+id (framed) or sender IP (legacy) into one ``AudioStream`` per room, each with
+its own ring and jitter buffer."""
 from __future__ import annotations
 
 import logging
+import selectors
 import socket
 import threading
+import time
 from collections import deque
 from typing import Callable
 
 import numpy as np
 
+from jitter_buffer import FORMAT_S16LE_16K_MONO, HEADER_SIZE, JitterBuffer, parse_header
+
 log = logging.getLogger("voice")
 
+# Overflow policies — what to do when a push doesn't fit in the ring.
+DROP_OLDEST = "drop_oldest"     # overwrite the oldest unread samples (sliding window)
+SKIP_TO_NOW = "skip_to_now"     # discard the whole backlog, keep only the new audio
+OVERFLOW_POLICIES = (DROP_OLDEST, SKIP_TO_NOW)
 
-class AudioSource:
-    def __init__(self, port: int, get_gain: Callable[[], float]):
-        self._port = port
+MAX_DATAGRAM = 65536            # bytes — largest UDP payload we accept
+RECV_BATCH = 64                 # datagrams drained per wake-up before notifying the reader
+JITTER_IDLE_FLUSH_S = 0.1       # release held packets if the stream pauses mid-gap
+STATS_LOG_S = 60.0              # transport stats summary period
+
+
+class AudioRing:
+    """Fixed-capacity single-producer/single-consumer ring of int16 samples.
+
+    Positions are absolute sample counters (never wrapped), so ``lag`` is just
+    ``write - read`` and the array index is ``pos % capacity``.
+    """
+
+    def __init__(self, capacity: int, overflow: str = DROP_OLDEST):
+        if capacity <= 0:
+            raise ValueError(f"ring capacity must be > 0 (got {capacity})")
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"unknown overflow policy {overflow!r} (expected one of {OVERFLOW_POLICIES})")
+        self.capacity = capacity
+        self.overflow = overflow
+        self._data = np.zeros(capacity, dtype=np.int16)
+        self._write = 0
+        self._read = 0
+        self.dropped = 0            # samples discarded by overflow or skip_to_now()
+        self.max_view = 0           # largest read_view() handed out
+
+    @property
+    def lag(self) -> int:
+        """Unread samples currently buffered."""
+        return self._write - self._read
+
+    @property
+    def write_pos(self) -> int:
+        return self._write
+
+    @property
+    def read_pos(self) -> int:
+        return self._read
+
+    @property
+    def free(self) -> int:
+        """Samples that can be written without overwriting unread audio."""
+        return self.capacity - self.lag
+
+    def _make_room(self, n: int) -> None:
+        overflow = self.lag + n - self.capacity
+        if overflow > 0:
+            if self.overflow == SKIP_TO_NOW:
+                self.skip_to_now()
+            else:
+                self._read += overflow
+                self.dropped += overflow
+
+    def write(self, arr: np.ndarray) -> None:
+        n = len(arr)
+        if n == 0:
+            return
+        if n > self.capacity:                       # larger than the ring: keep the tail
+            self.dropped += n - self.capacity
+            arr = arr[-self.capacity:]
+            n = self.capacity
+        self._make_room(n)
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        self._data[start:start + first] = arr[:first]
+        if first < n:
+            self._data[:n - first] = arr[first:]
+        self._write += n
+
+    def write_buffers(self, n: int) -> list[memoryview]:
+        """Byte views over the next ``n`` sample slots (two when they wrap), for
+        ``recvmsg_into``. Only safe when ``n <= free``; finish with ``commit()``."""
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        bufs = [memoryview(self._data[start:start + first]).cast("B")]
+        if first < n:
+            bufs.append(memoryview(self._data[:n - first]).cast("B"))
+        return bufs
+
+    def staged(self, n: int) -> np.ndarray:
+        """Copy of ``n`` samples received in place but not committed."""
+        start = self._write % self.capacity
+        first = min(n, self.capacity - start)
+        if first == n:
+            return self._data[start:start + n].copy()
+        return np.concatenate([self._data[start:], self._data[:n - first]])
+
+    def commit(self, n: int) -> None:
+        """Publish ``n`` samples written in place through ``write_buffers()``."""
+        self._make_room(n)
+        self._write += n
+
+    def read_into(self, out: np.ndarray) -> None:
+        """Copy ``len(out)`` samples into ``out``; caller ensures ``lag >= len(out)``."""
+        n = len(out)
+        start = self._read % self.capacity
+        first = min(n, self.capacity - start)
+        out[:first] = self._data[start:start + first]
+        if first < n:
+            out[first:] = self._data[:n - first]
+        self._read += n
+
+    def read_view(self, n: int) -> np.ndarray | None:
+        """Read-only view of the next ``n`` samples if they are contiguous, else
+        None. The view stays valid until the writer wraps back onto it, about
+        ``capacity - n`` samples later; ``AudioSource`` only receives in place
+        while a whole datagram still fits before it (see ``in_place_ok``)."""
+        start = self._read % self.capacity
+        if start + n > self.capacity:
+            return None
+        view = self._data[start:start + n]
+        view.flags.writeable = False
+        self._read += n
+        self.max_view = max(self.max_view, n)
+        return view
+
+    def in_place_ok(self, n: int) -> bool:
+        """Whether ``n`` samples can be received straight into the free region
+        without reaching unread audio or the slots of the latest read views."""
+        return self.free - n >= self.max_view
+
+    def skip_to_now(self, keep: int = 0) -> int:
+        """Drop the backlog except the newest ``keep`` samples. Returns samples dropped."""
+        skipped = max(0, self.lag - max(0, keep))
+        self._read += skipped
+        self.dropped += skipped
+        return skipped
+
+
+class AudioStream:
+    """One room's audio: ring, jitter buffer and capture-time bookkeeping.
+
+    Filled by ``AudioSource``'s receive thread, read by that room's pipeline.
+    """
+
+    def __init__(self, room: str, get_gain: Callable[[], float],
+                 capacity_s: float = 10.0, overflow: str = DROP_OLDEST,
+                 sample_rate: int = 16000, jitter_depth: int = 3):
+        self.room = room
         self._get_gain = get_gain
-        self._buf = deque()                 # of np.int16 arrays
+        self._rate = sample_rate
+        self._ring = AudioRing(max(1, int(capacity_s * sample_rate)), overflow)
         self._lock = threading.Lock()
         self._cond = threading.Condition(self._lock)
-        self._available = 0
-        self._running = False
-        self._thread: threading.Thread | None = None
-        self._sock: socket.socket | None = None
+        self._jitter_depth = jitter_depth
+        self._jitter = JitterBuffer(jitter_depth)
+        self._last_arrival = 0.0                # time.time() of the latest datagram
+        self._stream_id: int | None = None
+        self._marks: deque = deque(maxlen=512)   # (ring write pos, capture_us) per packet
+        self._latency_ms: float | None = None
+        self._legacy_packets = 0
+        self._bad_format = 0
 
-    def _push(self, data: bytes) -> None:
-        arr = np.frombuffer(data, dtype=np.int16)
-        if len(arr) == 0:
-            return
+    @property
+    def lag_samples(self) -> int:
+        """Samples received but not yet read — how far behind real time the reader is."""
+        with self._lock:
+            return self._ring.lag
+
+    @property
+    def dropped_samples(self) -> int:
+        """Total samples discarded by overflow or skip_to_now() since start."""
+        with self._lock:
+            return self._ring.dropped
+
+    def stats(self) -> dict:
+        """Transport counters: jitter-buffer loss/reorder/jitter, capture-to-read
+        latency (needs satellite and server clocks in sync, e.g. NTP) and ring state."""
+        with self._lock:
+            return {
+                **self._jitter.stats(),
+                "latency_ms": None if self._latency_ms is None else round(self._latency_ms, 1),
+                "legacy_packets": self._legacy_packets,
+                "bad_format": self._bad_format,
+                "lag_samples": self._ring.lag,
+                "dropped_samples": self._ring.dropped,
+            }
+
+    def skip_to_now(self, keep_ms: int = 0) -> int:
+        """Discard stale backlog (e.g. after a turn) so the next read is fresh audio."""
+        with self._lock:
+            skipped = self._ring.skip_to_now(keep_ms * self._rate // 1000)
+        if skipped:
+            log.info(f"AudioStream[{self.room}] skipped {skipped / self._rate:.2f}s of stale audio")
+        return skipped
+
+    def _push(self, data: bytes, arrival: float | None = None) -> None:
+        """Ingest one datagram, framed or legacy (copying path)."""
+        hdr = parse_header(data)
+        offset = HEADER_SIZE if hdr else 0
+        arr = np.frombuffer(data, dtype=np.int16, offset=offset, count=(len(data) - offset) // 2)
+        arrival = time.time() if arrival is None else arrival
         with self._cond:
-            self._buf.append(arr)
-            self._available += len(arr)
+            self._last_arrival = arrival
+            if hdr is None:
+                self._legacy_packets += 1
+                self._ring.write(arr)
+            elif self._accept(hdr):
+                self._release(self._jitter.push(hdr.seq, hdr.capture_us, arr, arrival))
             self._cond.notify_all()
 
-    def read(self, n_samples: int) -> np.ndarray:
+    def _accept(self, hdr) -> bool:
+        """Format / stream checks for a framed packet (lock held)."""
+        if hdr.format != FORMAT_S16LE_16K_MONO:
+            if not self._bad_format:
+                log.warning(f"AudioStream[{self.room}]: unsupported frame format {hdr.format} — dropping")
+            self._bad_format += 1
+            return False
+        if hdr.stream_id != self._stream_id:
+            if self._stream_id is not None:
+                log.info(f"AudioStream[{self.room}]: stream {self._stream_id} -> {hdr.stream_id}, "
+                         f"jitter buffer reset")
+            self._stream_id = hdr.stream_id
+            self._jitter = JitterBuffer(self._jitter_depth)
+        return True
+
+    def _flush_if_idle(self, now: float) -> float | None:
+        """Release held packets once no datagram came for ``JITTER_IDLE_FLUSH_S``.
+
+        Returns the seconds until this stream's flush is due, or None when
+        nothing is held.
+        """
         with self._cond:
-            while self._available < n_samples:
-                self._cond.wait(timeout=5.0)
-            out = np.empty(n_samples, dtype=np.int16)
-            filled = 0
-            while filled < n_samples:
-                head = self._buf[0]
-                take = min(len(head), n_samples - filled)
-                out[filled:filled + take] = head[:take]
-                if take == len(head):
-                    self._buf.popleft()
-                else:
-                    self._buf[0] = head[take:]
-                filled += take
-                self._available -= take
+            if not self._jitter.holding:
+                return None
+            due = self._last_arrival + JITTER_IDLE_FLUSH_S - now
+            if due > 0:
+                return due
+            self._release(self._jitter.flush())
+            self._cond.notify_all()
+            return None
+
+    def _release(self, chunks) -> None:
+        """Append jitter-buffer output to the ring, recording capture times (lock held)."""
+        for samples, capture_us in chunks:
+            if capture_us is not None:
+                self._marks.append((self._ring.write_pos, capture_us))
+            self._ring.write(samples)
+
+    def _update_latency(self) -> None:
+        """Capture-to-read latency of the sample just consumed (lock held)."""
+        pos = self._ring.read_pos
+        marks = self._marks
+        while len(marks) > 1 and marks[1][0] <= pos:
+            marks.popleft()
+        if not marks or marks[0][0] > pos:
+            return
+        mark_pos, capture_us = marks[0]
+        captured_ms = capture_us / 1000.0 + (pos - mark_pos) * 1000.0 / self._rate
+        latency = time.time() * 1000.0 - captured_ms
+        self._latency_ms = latency if self._latency_ms is None else self._latency_ms + (latency - self._latency_ms) / 16.0
+
+    def read(self, n_samples: int, copy: bool = True) -> np.ndarray:
+        """Block until ``n_samples`` are buffered and return them.
+
+        With ``copy=False`` and unity gain, a contiguous span comes back as a
+        read-only view into the ring (see ``AudioRing.read_view``) instead of
+        a fresh array — for consumers that use the chunk straight away.
+        """
+        if n_samples > self._ring.capacity:
+            raise ValueError(f"read of {n_samples} samples exceeds ring capacity {self._ring.capacity}")
         gain = self._get_gain()
+        with self._cond:
+            while self._ring.lag < n_samples:
+                self._cond.wait(timeout=5.0)
+            view = self._ring.read_view(n_samples) if not copy and gain == 1.0 else None
+            if view is None:
+                out = np.empty(n_samples, dtype=np.int16)
+                self._ring.read_into(out)
+            if self._marks:
+                self._update_latency()
+        if view is not None:
+            return view
         if gain != 1.0:
             scaled = np.clip(out.astype(np.int32) * gain, -32768, 32767)
             return scaled.astype(np.int16)
         return out
 
+
+class AudioSource:
+    """UDP receiver demultiplexing satellites into per-room ``AudioStream``s.
+
+    ``rooms`` maps a sender key — a framed stream id (as a string) or a sender
+    IP — to a room name. Unmapped senders land in ``default_room``, so a
+    single-satellite setup needs no mapping. ``on_new_stream`` is called (on
+    the receive thread) the first time a room gets audio.
+
+    ``read()``/``skip_to_now()``/``stats()`` and friends act on the default
+    room's stream, for single-room callers.
+    """
+
+    def __init__(self, port: int, get_gain: Callable[[], float],
+                 capacity_s: float = 10.0, overflow: str = DROP_OLDEST,
+                 sample_rate: int = 16000, jitter_depth: int = 3,
+                 rooms: dict[str, str] | None = None, default_room: str = "default",
+                 on_new_stream: Callable[[AudioStream], None] | None = None):
+        self._port = port
+        self._stream_args = dict(get_gain=get_gain, capacity_s=capacity_s, overflow=overflow,
+                                 sample_rate=sample_rate, jitter_depth=jitter_depth)
+        self._rate = sample_rate
+        self._rooms = dict(rooms or {})
+        self.default_room = default_room
+        self._on_new_stream = on_new_stream
+        self._streams: dict[str, AudioStream] = {}
+        self._streams_lock = threading.Lock()
+        self._landing: AudioStream | None = None     # stream the next datagram is received into
+        self._running = False
+        self._thread: threading.Thread | None = None
+        self._sock: socket.socket | None = None
+        # Fallback landing zone when the ring is too full to receive in place.
+        self._scratch = np.empty(MAX_DATAGRAM // 2, dtype=np.int16)
+        self._scratch_buf = memoryview(self._scratch).cast("B")
+        self._hdr = np.empty(HEADER_SIZE // 2, dtype=np.int16)
+        self._hdr_buf = memoryview(self._hdr).cast("B")
+
+    # ---- per-room streams ----
+    def stream(self, room: str) -> AudioStream:
+        """The stream for ``room``, created on first use."""
+        created = None
+        with self._streams_lock:
+            st = self._streams.get(room)
+            if st is None:
+                st = created = self._streams[room] = AudioStream(room, **self._stream_args)
+        if created is not None and self._on_new_stream is not None:
+            self._on_new_stream(created)
+        return st
+
+    def streams(self) -> list[AudioStream]:
+        with self._streams_lock:
+            return list(self._streams.values())
+
+    def room_for(self, stream_id: int | None, sender_ip: str | None) -> str:
+        if stream_id is not None and str(stream_id) in self._rooms:
+            return self._rooms[str(stream_id)]
+        if sender_ip is not None and sender_ip in self._rooms:
+            return self._rooms[sender_ip]
+        return self.default_room
+
+    # ---- default-room shortcuts ----
+    @property
+    def lag_samples(self) -> int:
+        return self.stream(self.default_room).lag_samples
+
+    @property
+    def dropped_samples(self) -> int:
+        return self.stream(self.default_room).dropped_samples
+
+    def stats(self) -> dict:
+        return self.stream(self.default_room).stats()
+
+    def skip_to_now(self, keep_ms: int = 0) -> int:
+        return self.stream(self.default_room).skip_to_now(keep_ms)
+
+    def read(self, n_samples: int, copy: bool = True) -> np.ndarray:
+        return self.stream(self.default_room).read(n_samples, copy)
+
+    def _push(self, data: bytes, sender_ip: str | None = None, arrival: float | None = None) -> None:
+        """Route one datagram to its room's stream (copying path)."""
+        hdr = parse_header(data)
+        room = self.room_for(hdr.stream_id if hdr else None, sender_ip)
+        self.stream(room)._push(data, arrival)
+
+    # ---- socket ----
     def start(self) -> None:
         self._running = True
         self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
         self._sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
         self._sock.bind(("0.0.0.0", self._port))
-        self._sock.settimeout(1.0)
+        self._sock.setblocking(False)
         self._thread = threading.Thread(target=self._recv_loop, daemon=True)
         self._thread.start()
-        log.info(f"AudioSource listening on UDP :{self._port}")
+        args = self._stream_args
+        log.info(
+            f"AudioSource listening on UDP :{self._port} "
+            f"(ring={args['capacity_s']:.1f}s, overflow={args['overflow']}, "
+            f"jitter_depth={args['jitter_depth']}, rooms={self._rooms or '-'})"
+        )
+
+    def _recv_one(self, touched: set) -> bool:
+        """Receive one datagram into its room's ring. False when the socket is drained."""
+        # The payload is received straight into the free region of the stream
+        # that got the previous datagram (the only one, with a single
+        # satellite). That region is never touched by the reader, so the
+        # kernel can write into it without holding the lock. If the datagram
+        # turns out to belong to another room, it is copied across.
+        landing = self._landing
+        ring = landing._ring if landing is not None else None
+        in_place = ring is not None and ring.in_place_ok(MAX_DATAGRAM // 2)
+        body = ring.write_buffers(MAX_DATAGRAM // 2) if in_place else [self._scratch_buf]
+        try:
+            nbytes, _, _, addr = self._sock.recvmsg_into([self._hdr_buf, *body])
+        except (BlockingIOError, InterruptedError):
+            return False
+        arrival = time.time()
+        hdr = parse_header(self._hdr_buf) if nbytes >= HEADER_SIZE else None
+        n = max(0, nbytes - HEADER_SIZE) // 2
+        st = self.stream(self.room_for(hdr.stream_id if hdr else None, addr[0]))
+        if st is not landing:
+            if in_place:
+                self._scratch[:n] = ring.staged(n)
+                in_place = False
+            self._landing = st
+        with st._lock:
+            st._last_arrival = arrival
+            if hdr is None:
+                # Legacy raw PCM: its first bytes went to the header buffer.
+                st._legacy_packets += 1
+                tail = st._ring.staged(n) if in_place else self._scratch[:n]
+                st._ring.write(self._hdr[:min(nbytes, HEADER_SIZE) // 2])
+                st._ring.write(tail)
+            elif not st._accept(hdr) or not n:
+                pass
+            elif in_place and st._jitter.in_order(hdr.seq):
+                # Passes straight through; the placeholder only conveys the length.
+                st._jitter.push(hdr.seq, hdr.capture_us, self._scratch[:n], arrival)
+                st._marks.append((st._ring.write_pos, hdr.capture_us))
+                st._ring.commit(n)
+            else:
+                payload = st._ring.staged(n) if in_place else self._scratch[:n].copy()
+                st._release(st._jitter.push(hdr.seq, hdr.capture_us, payload, arrival))
+        touched.add(st)
+        return True
 
     def _recv_loop(self) -> None:
-        while self._running:
-            try:
-                data, _ = self._sock.recvfrom(65536)
-            except socket.timeout:
-                continue
-            except OSError:
-                break
-            self._push(data)
+        # Python has no recvmmsg(); draining a readable non-blocking socket per
+        # poll gives the same effect — one wake-up and one notify per batch.
+        sel = selectors.DefaultSelector()
+        sel.register(self._sock, selectors.EVENT_READ)
+        next_stats = time.time() + STATS_LOG_S
+        try:
+            while self._running:
+                # Checked on every pass, not only when the socket is quiet:
+                # another room's traffic must not keep a paused stream held.
+                now = time.time()
+                due = [d for st in self.streams() if (d := st._flush_if_idle(now)) is not None]
+                if not sel.select(timeout=min(due, default=1.0)):
+                    continue
+                touched: set = set()
+                got = 0
+                try:
+                    while got < RECV_BATCH and self._recv_one(touched):
+                        got += 1
+                except OSError:
+                    break
+                for st in touched:
+                    with st._cond:
+                        st._cond.notify_all()
+                if time.time() >= next_stats:
+                    next_stats = time.time() + STATS_LOG_S
+                    for st in self.streams():
+                        if st._jitter.received:
+                            log.info(f"AudioStream[{st.room}] transport: {st.stats()}")
+        finally:
+            sel.close()
 
     def stop(self) -> None:
         self._running = False
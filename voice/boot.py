@@ -0,0 +1,163 @@
+"""Parallel, observable startup of the voice server's subsystems.
+
+Loading Whisper, the wake-word model and the cast connection one after the
+other keeps the server deaf for the sum of all of them. ``Boot`` starts each
+subsystem in its own thread as soon as its dependencies are up, runs an
+optional warm-up (a first inference, so the first real command doesn't pay
+for cold kernels) and records per-subsystem state and timings. Consumers
+block on ``wait(name)`` only when they actually need a subsystem.
+
+``serve_ready`` exposes the state as ``GET /ready``: 200 once every required
+subsystem is ready, 503 before (or after a failure), with the timing report
+as JSON either way.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Iterable, Optional
+
+log = logging.getLogger("voice")
+
+PENDING, LOADING, WARMING, READY, FAILED = "pending", "loading", "warming", "ready", "failed"
+
+
+class Subsystem:
+    def __init__(self, name: str, load: Callable[[], Any],
+                 warmup: Optional[Callable[[Any], None]], after: tuple[str, ...], required: bool):
+        self.name = name
+        self.load = load
+        self.warmup = warmup
+        self.after = after
+        self.required = required
+        self.state = PENDING
+        self.error: Optional[str] = None
+        self.result: Any = None
+        self.start_ms: Optional[float] = None   # since boot start
+        self.load_ms: Optional[float] = None
+        self.warmup_ms: Optional[float] = None
+        self.done = threading.Event()
+
+    def describe(self) -> dict:
+        out = {"state": self.state, "required": self.required, "start_ms": self.start_ms,
+               "load_ms": self.load_ms, "warmup_ms": self.warmup_ms}
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class Boot:
+    def __init__(self):
+        self.started = time.monotonic()
+        self._subsystems: dict[str, Subsystem] = {}
+        self._lock = threading.Lock()
+        self._reported = False
+
+    def add(self, name: str, load: Callable[[], Any],
+            warmup: Optional[Callable[[Any], None]] = None,
+            after: Iterable[str] = (), required: bool = True) -> None:
+        """Register a subsystem: ``load()`` builds it, ``warmup(result)``
+        primes it; it starts once every subsystem in ``after`` is ready.
+        A failed optional (``required=False``) subsystem doesn't block /ready."""
+        self._subsystems[name] = Subsystem(name, load, warmup, tuple(after), required)
+
+    def start(self) -> None:
+        for sub in self._subsystems.values():
+            threading.Thread(target=self._run, args=(sub,), name=f"boot-{sub.name}",
+                             daemon=True).start()
+
+    def _run(self, sub: Subsystem) -> None:
+        try:
+            for dep in sub.after:
+                self.wait(dep)
+            sub.start_ms = _ms(time.monotonic() - self.started)
+            sub.state = LOADING
+            t0 = time.monotonic()
+            result = sub.load()
+            sub.load_ms = _ms(time.monotonic() - t0)
+            if sub.warmup is not None:
+                sub.state = WARMING
+                t0 = time.monotonic()
+                sub.warmup(result)
+                sub.warmup_ms = _ms(time.monotonic() - t0)
+            sub.result = result
+            sub.state = READY
+        except Exception as e:
+            sub.state, sub.error = FAILED, str(e) or type(e).__name__
+            log.error(f"startup: {sub.name} failed: {sub.error}")
+        sub.done.set()
+        self._maybe_report()
+
+    # ---- consumers ----
+    def wait(self, name: str, timeout: Optional[float] = None) -> Any:
+        """Block until ``name`` is ready and return what its loader built.
+
+        Raises RuntimeError if it failed (or TimeoutError after ``timeout``).
+        """
+        sub = self._subsystems[name]
+        if not sub.done.wait(timeout):
+            raise TimeoutError(f"{name} not ready after {timeout}s")
+        if sub.state != READY:
+            raise RuntimeError(f"{name} failed to start: {sub.error}")
+        return sub.result
+
+    def get(self, name: str) -> Any:
+        """The subsystem if it is ready, else None (never blocks)."""
+        sub = self._subsystems.get(name)
+        return sub.result if sub is not None and sub.state == READY else None
+
+    @property
+    def ready(self) -> bool:
+        return all(s.state == READY for s in self._subsystems.values() if s.required)
+
+    def report(self) -> dict:
+        return {
+            "ready": self.ready,
+            "uptime_ms": _ms(time.monotonic() - self.started),
+            "subsystems": {name: s.describe() for name, s in self._subsystems.items()},
+        }
+
+    def _maybe_report(self) -> None:
+        with self._lock:
+            if self._reported or not all(s.done.is_set() for s in self._subsystems.values()):
+                return
+            self._reported = True
+        parts = []
+        for s in sorted(self._subsystems.values(), key=lambda s: s.start_ms or 0):
+            timing = f"{s.load_ms:.0f} ms" if s.load_ms is not None else s.state
+            if s.warmup_ms is not None:
+                timing += f" + {s.warmup_ms:.0f} ms warm-up"
+            parts.append(f"{s.name} @{s.start_ms or 0:.0f} ms: {timing}")
+        log.info(f"startup {'complete' if self.ready else 'DEGRADED'} in "
+                 f"{_ms(time.monotonic() - self.started):.0f} ms — {'; '.join(parts)}")
+
+
+def serve_ready(boot: Boot, port: int) -> ThreadingHTTPServer:
+    """Serve ``GET /ready`` for ``boot`` on ``port`` (background thread)."""
+
+    class _ReadyHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/ready":
+                self.send_error(404)
+                return
+            body = json.dumps(boot.report()).encode()
+            self.send_response(200 if boot.ready else 503)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *_):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), _ReadyHandler)
+    threading.Thread(target=server.serve_forever, name="ready-http", daemon=True).start()
+    log.info(f"Readiness endpoint on :{port}/ready")
+    return server
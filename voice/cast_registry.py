@@ -0,0 +1,131 @@
+"""Known cast devices, kept current by a background zeroconf browser.
+
+A blocking 10 s Bonjour scan at startup delays the voice server and is
+never repeated, so a device that changes IP is lost until restart. Instead,
+devices seen on the network are persisted (name → host/port/uuid) in
+``data/cast-devices.json``: a client connects at once from the cached entry,
+while ``CastDiscovery`` keeps a zeroconf browser running for the life of the
+process and reports devices that appear or move. ``mcp-chromecast/cast.py``
+reads the same file.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, NamedTuple, Optional
+
+log = logging.getLogger("voice")
+
+
+class CastDevice(NamedTuple):
+    name: str
+    host: str
+    port: int = 8009
+    uuid: str = ""
+    model: str = ""
+    seen: float = 0.0           # time.time() of the last announcement
+
+    @property
+    def address(self) -> tuple:
+        """Argument for ``pychromecast.get_chromecast_from_host``."""
+        return (self.host, self.port, self.uuid or None, self.model or None, self.name)
+
+
+class DeviceRegistry:
+    """Thread-safe JSON-backed ``{uuid or name: CastDevice}``."""
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._lock = threading.Lock()
+        self._devices: dict[str, CastDevice] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path) as f:
+                    for entry in json.load(f).get("devices", []):
+                        device = CastDevice(**entry)
+                        self._devices[device.uuid or device.name.lower()] = device
+            except Exception as e:
+                log.warning(f"Could not read cast registry {path}: {e}")
+
+    def get(self, name: str) -> Optional[CastDevice]:
+        """Most recently seen device called ``name`` (case-insensitive)."""
+        with self._lock:
+            matches = [d for d in self._devices.values() if d.name.lower() == name.lower()]
+        return max(matches, key=lambda d: d.seen) if matches else None
+
+    def devices(self) -> list[CastDevice]:
+        with self._lock:
+            return sorted(self._devices.values(), key=lambda d: d.name.lower())
+
+    def update(self, device: CastDevice) -> bool:
+        """Record an announcement; True if the device is new or moved/renamed."""
+        key = device.uuid or device.name.lower()
+        with self._lock:
+            old = self._devices.get(key)
+            self._devices[key] = device
+            changed = old is None or old[:3] != device[:3]
+            if changed:
+                self._save()
+        return changed
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump({"devices": [d._asdict() for d in self._devices.values()]}, f, indent=2)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            log.warning(f"Could not write cast registry {self.path}: {e}")
+
+
+class CastDiscovery:
+    """Long-lived zeroconf browser feeding a ``DeviceRegistry``.
+
+    ``on_device(device, changed)`` is called from the zeroconf thread for
+    every announcement; ``changed`` is True when the device is new, moved
+    or renamed.
+    """
+
+    def __init__(self, registry: DeviceRegistry,
+                 on_device: Optional[Callable[[CastDevice, bool], None]] = None):
+        self.registry = registry
+        self._on_device = on_device
+        self._browser = None
+        self._zconf = None
+
+    def start(self) -> None:
+        """Start browsing in the background (returns immediately)."""
+        import pychromecast
+        import zeroconf
+
+        self._zconf = zeroconf.Zeroconf()
+        listener = pychromecast.discovery.SimpleCastListener(
+            add_callback=self._on_service, update_callback=self._on_service)
+        self._browser = pychromecast.discovery.CastBrowser(listener, self._zconf)
+        self._browser.start_discovery()
+        log.info("Cast discovery running (zeroconf)")
+
+    def stop(self) -> None:
+        if self._browser is not None:
+            self._browser.stop_discovery()
+            self._browser = None
+
+    def _on_service(self, uuid, _service=None) -> None:
+        info = self._browser.services.get(uuid) if self._browser else None
+        if info is None or not info.host:
+            return
+        self.observe(CastDevice(info.friendly_name or "", info.host, int(info.port or 8009),
+                                str(uuid), info.model_name or "", time.time()))
+
+    def observe(self, device: CastDevice) -> None:
+        changed = self.registry.update(device)
+        if changed:
+            log.info(f"Cast device '{device.name}' at {device.host}:{device.port}")
+        if self._on_device is not None:
+            self._on_device(device, changed)
@@ -0,0 +1,149 @@
+"""Cast playback completion from media status events.
+
+Instead of sleeping for a clip's estimated duration and polling
+``player_state``, a ``PlaybackTracker`` is registered as the media
+controller's status listener. Each clip is announced with ``expect()``
+before ``play_media``; the receiver's status updates resolve it — PLAYING
+marks it started, IDLE for the same content id marks it finished — so the
+next sentence can go out as soon as the device reports the end.
+
+Per clip it records load-to-play (``play_media`` → first PLAYING) and end
+detection (IDLE event vs. start + audio duration) for tuning. A live stream's
+duration is only known once it is closed: it is announced with
+``duration_s=None`` and its watch gets ``duration_s`` set before the wait.
+
+Waits sleep on the tracker's condition until a clip resolves or the
+deadline passes; whoever sets a wait's stop event calls ``interrupt()`` so
+the wait sees it at once.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from typing import Optional
+
+log = logging.getLogger("voice")
+
+PLAYING_STATES = ("PLAYING", "BUFFERING")
+
+
+class ClipWatch:
+    """One announced clip; ``wait()`` returns how its playback ended."""
+
+    def __init__(self, content_id: str, duration_s: Optional[float], tracker: "PlaybackTracker"):
+        self.content_id = content_id
+        self.duration_s = duration_s
+        self._tracker = tracker
+        self.requested = time.monotonic()
+        self.started: Optional[float] = None
+        self.ended: Optional[float] = None
+        self.outcome: Optional[str] = None      # finished / cancelled / interrupted / error
+        self._done = threading.Event()
+
+    @property
+    def load_ms(self) -> Optional[float]:
+        return None if self.started is None else (self.started - self.requested) * 1000
+
+    @property
+    def end_lag_ms(self) -> Optional[float]:
+        """IDLE event time minus the expected end (start + duration)."""
+        if self.started is None or self.ended is None or self.duration_s is None:
+            return None
+        return (self.ended - self.started - self.duration_s) * 1000
+
+    def wait(self, stop_event: threading.Event, timeout: Optional[float] = None) -> str:
+        """Block until the receiver reports the end, ``stop_event`` is set
+        ("stopped", seen on ``PlaybackTracker.interrupt()``) or ``timeout``
+        passes ("timeout")."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = self._tracker._changed
+        with changed:
+            while self.outcome is None and not stop_event.is_set():
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                changed.wait(remaining)
+        if self.outcome is None:
+            self._tracker._resolve(self, "stopped" if stop_event.is_set() else "timeout")
+        return self.outcome
+
+
+class PlaybackTracker:
+    """``pychromecast`` media status listener resolving ``ClipWatch``es."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)     # a clip resolved / interrupt()
+        self._watches: dict[str, ClipWatch] = {}
+        self.clips = 0
+        self.outcomes: dict[str, int] = {}
+        self.load_ms_total = 0.0
+        self.end_lag_ms_total = 0.0
+        self.timed = 0                          # clips with both measurements
+
+    def expect(self, content_id: str, duration_s: Optional[float] = 0.0) -> ClipWatch:
+        """Announce a clip before ``play_media(content_id, …)``; ``None``: duration
+        not known yet (the clip is left out of the averages unless it is set)."""
+        watch = ClipWatch(content_id, duration_s, self)
+        with self._lock:
+            self._watches[content_id] = watch
+        return watch
+
+    # ---- pychromecast listener interface ----
+    def new_media_status(self, status) -> None:
+        content_id = getattr(status, "content_id", None)
+        state = getattr(status, "player_state", None)
+        with self._lock:
+            watch = self._watches.get(content_id)
+        if watch is None:
+            return
+        if state in PLAYING_STATES and watch.started is None:
+            watch.started = time.monotonic()
+        elif state == "IDLE":
+            # A clip that never played only ends on an explicit reason (ERROR…).
+            reason = getattr(status, "idle_reason", None)
+            if watch.started is not None or reason:
+                self._resolve(watch, (reason or "finished").lower())
+
+    def load_media_failed(self, item, error_code) -> None:
+        with self._lock:
+            pending = [w for w in self._watches.values() if w.started is None]
+        for watch in pending:
+            log.warning(f"Cast load failed ({error_code}): {watch.content_id}")
+            self._resolve(watch, "error")
+
+    def interrupt(self) -> None:
+        """Wake every ``ClipWatch.wait()`` to re-check its stop event."""
+        with self._changed:
+            self._changed.notify_all()
+
+    # ---- bookkeeping ----
+    def _resolve(self, watch: ClipWatch, outcome: str) -> None:
+        with self._lock:
+            if watch.outcome is not None:
+                return
+            watch.outcome = outcome
+            watch.ended = time.monotonic()
+            if self._watches.get(watch.content_id) is watch:
+                del self._watches[watch.content_id]
+            self.clips += 1
+            self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+            if outcome == "finished" and watch.end_lag_ms is not None:
+                self.timed += 1
+                self.load_ms_total += watch.load_ms
+                self.end_lag_ms_total += watch.end_lag_ms
+            self._changed.notify_all()
+        watch._done.set()
+        if watch.end_lag_ms is not None:
+            log.debug(f"Cast clip {outcome}: load {watch.load_ms:.0f} ms, "
+                      f"end lag {watch.end_lag_ms:+.0f} ms")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "clips": self.clips,
+                "outcomes": dict(self.outcomes),
+                "avg_load_ms": round(self.load_ms_total / self.timed, 1) if self.timed else 0.0,
+                "avg_end_lag_ms": round(self.end_lag_ms_total / self.timed, 1) if self.timed else 0.0,
+            }
@@ -0,0 +1,114 @@
+"""Audio clips served to the cast device, one URL per clip.
+
+Every clip (sentence, chime, announcement) is stored under the hash of its
+bytes, so clips never overwrite each other: the next sentence can be staged
+while the current one plays, and a chime can't replace an answer mid-fetch.
+Clips expire ``ttl_s`` after they were last stored or served, or when the
+store outgrows ``max_bytes`` (least recently used first). ``byte_range``
+implements the single-range subset of HTTP Range requests that media
+players send when seeking.
+"""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Union
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)$")
+
+EXTENSIONS = {"audio/wav": "wav", "audio/mpeg": "mp3", "audio/ogg": "ogg"}
+
+
+class Clip(NamedTuple):
+    data: bytes
+    mime: str
+    etag: str
+    stored: float               # time.time(), for Last-Modified
+
+    @property
+    def ext(self) -> str:
+        return EXTENSIONS.get(self.mime, "bin")
+
+
+def byte_range(header: Optional[str], size: int) -> Union[None, tuple[int, int], str]:
+    """Parse a Range header against a body of ``size`` bytes.
+
+    Returns None to send the whole body, ``(start, end)`` inclusive for a
+    206, or ``"unsatisfiable"`` for a 416. Multi-range and malformed headers
+    are ignored (whole body), as RFC 9110 allows.
+    """
+    if not header:
+        return None
+    m = _RANGE.match(header.strip())
+    if not m or m.groups() == ("", ""):
+        return None
+    first, last = m.groups()
+    if first == "":                         # suffix: the last N bytes
+        n = int(last)
+        if n == 0:
+            return "unsatisfiable"
+        return max(0, size - n), size - 1
+    start = int(first)
+    end = size - 1 if last == "" else min(int(last), size - 1)
+    if start >= size or end < start:
+        return "unsatisfiable"
+    return start, end
+
+
+class ClipStore:
+    def __init__(self, max_bytes: int = 64 << 20, ttl_s: float = 600.0):
+        self.max_bytes = max_bytes
+        self.ttl_s = ttl_s
+        self._lock = threading.Lock()
+        self._clips: OrderedDict[str, Clip] = OrderedDict()     # least recently used first
+        self._used: dict[str, float] = {}
+        self._size = 0
+        self.served = 0
+        self.missing = 0
+        self.evicted = 0
+
+    def put(self, data: bytes, mime: str = "audio/wav") -> str:
+        """Store ``data``; returns its id (the same bytes always get the same id)."""
+        clip_id = hashlib.sha256(data).hexdigest()[:24]
+        with self._lock:
+            old = self._clips.pop(clip_id, None)
+            if old is not None:
+                self._size -= len(old.data)
+            self._clips[clip_id] = Clip(data, mime, f'"{clip_id}"', time.time())
+            self._used[clip_id] = time.monotonic()
+            self._size += len(data)
+            self._expire()
+        return clip_id
+
+    def get(self, clip_id: str) -> Optional[Clip]:
+        with self._lock:
+            self._expire()
+            clip = self._clips.get(clip_id)
+            if clip is None:
+                self.missing += 1
+                return None
+            self._clips.move_to_end(clip_id)
+            self._used[clip_id] = time.monotonic()
+            self.served += 1
+            return clip
+
+    def _expire(self) -> None:
+        cutoff = time.monotonic() - self.ttl_s
+        while self._clips:
+            clip_id, clip = next(iter(self._clips.items()))
+            # The newest clip stays even alone over budget: it is about to be fetched.
+            fresh = self._used[clip_id] >= cutoff
+            if fresh and (self._size <= self.max_bytes or len(self._clips) == 1):
+                break
+            del self._clips[clip_id]
+            del self._used[clip_id]
+            self._size -= len(clip.data)
+            self.evicted += 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"clips": len(self._clips), "bytes": self._size, "served": self.served,
+                    "missing": self.missing, "evicted": self.evicted}
@@ -8,6 +8,8 @@ import os
 YUI_URL        = os.getenv("YUI_URL", f"http://localhost:{os.getenv('ORCHESTRATOR_PORT', '4000')}/order")
 YUI_STREAM_URL = os.getenv("YUI_STREAM_URL", YUI_URL + "/stream")
 BEARER_TOKEN   = os.getenv("BEARER_TOKEN", "yui")
+# Direct tool calls (local intent fast path), bypassing the LLM
+YUI_TOOLS_URL  = os.getenv("YUI_TOOLS_URL", YUI_URL.rsplit("/order", 1)[0] + "/tools")
 
 # ── Audio input ───────────────────────────────────────────────────────────────
 LISTEN_PORT  = int(os.getenv("VOICE_UDP_PORT", "5002"))
@@ -24,6 +26,44 @@ PRE_BUFFER_BYTES = int(SAMPLE_RATE * SAMPLE_WIDTH * 0.3)  # ~9600 bytes
 MIN_UTTERANCE_S  = 0.5
 MAX_UTTERANCE_S  = 20.0
 
+# Bounded input ring: seconds of audio kept while the pipeline is busy with a
+# turn, and what to discard when it fills ("drop_oldest" | "skip_to_now").
+AUDIO_RING_S   = float(os.getenv("AUDIO_RING_S", "10"))
+AUDIO_OVERFLOW = os.getenv("AUDIO_OVERFLOW", "drop_oldest")
+# Framed satellite packets: how many later packets to hold before a missing
+# one is declared lost and concealed with silence (20 ms each).
+AUDIO_JITTER_DEPTH = int(os.getenv("AUDIO_JITTER_DEPTH", "3"))
+
+# Several satellites on the same port: map each sender (framed stream id or
+# sender IP) to a room, e.g. "1=salon,2=chambre,10.0.0.42=cuisine". Each room
+# gets its own wake/VAD/STT pipeline; unmapped senders go to the default room.
+_RAW_AUDIO_ROOMS = os.getenv("AUDIO_ROOMS", "")
+AUDIO_ROOMS = dict(
+    (k.strip(), v.strip())
+    for k, _, v in (item.partition("=") for item in _RAW_AUDIO_ROOMS.split(","))
+    if k.strip() and v.strip()
+)
+AUDIO_DEFAULT_ROOM = os.getenv("AUDIO_DEFAULT_ROOM", "salon")
+# Worker threads shared by all rooms for Whisper transcription.
+STT_WORKERS = int(os.getenv("STT_WORKERS", "1"))
+# Streaming STT: re-decode the utterance every N ms while it is still being
+# captured, so the transcript is ready at the endpoint (0 = decode only once).
+STT_PARTIAL_MS = int(os.getenv("STT_PARTIAL_MS", "400"))
+# Adaptive endpointing: trailing silence that ends an utterance, chosen per
+# pause between MIN (complete command) and MAX (mid-sentence) from the partial
+# transcript and prosody. ENDPOINT_ADAPTIVE=false keeps the fixed 1.2 s window.
+ENDPOINT_ADAPTIVE = os.getenv("ENDPOINT_ADAPTIVE", "true").lower() in ("1", "true", "yes")
+ENDPOINT_MIN_MS   = int(os.getenv("ENDPOINT_MIN_MS", "350"))
+ENDPOINT_BASE_MS  = int(os.getenv("ENDPOINT_BASE_MS", "800"))
+ENDPOINT_MAX_MS   = int(os.getenv("ENDPOINT_MAX_MS", "1500"))
+# Speculative dispatch (opt-in): once the partial transcript has been stable
+# this long before the endpoint, open the orchestrator request early and
+# buffer the answer; re-issued if the final transcript differs. The
+# orchestrator runs the speculative order for real (tools included), so only
+# enable it where a cancelled request is harmless.
+SPECULATIVE_DISPATCH = os.getenv("SPECULATIVE_DISPATCH", "false").lower() in ("1", "true", "yes")
+SPECULATE_STABLE_MS  = int(os.getenv("SPECULATE_STABLE_MS", "500"))
+
 # ── Whisper / ASR ─────────────────────────────────────────────────────────────
 WHISPER_MODEL = os.getenv("WHISPER_MODEL", "large-v3-turbo")
 WHISPER_LANG  = os.getenv("WHISPER_LANG", "fr")
@@ -47,6 +87,14 @@ WHISPER_CONVO_PROMPT = os.getenv(
 # Minimum RMS energy to send audio to Whisper. Below this = noise, skip entirely.
 WHISPER_MIN_RMS = float(os.getenv("WHISPER_MIN_RMS", "400"))
 
+# Two-tier STT (enabled by WHISPER_FAST_MODEL): keep the fast model's
+# transcript when its mean segment log-prob is above MIN_LOGPROB, its
+# no-speech probability below MAX_NO_SPEECH and at least MIN_VOCAB of its
+# words are known command vocabulary; otherwise re-run the large model.
+STT_CASCADE_MIN_LOGPROB   = float(os.getenv("STT_CASCADE_MIN_LOGPROB", "-0.6"))
+STT_CASCADE_MAX_NO_SPEECH = float(os.getenv("STT_CASCADE_MAX_NO_SPEECH", "0.4"))
+STT_CASCADE_MIN_VOCAB     = float(os.getenv("STT_CASCADE_MIN_VOCAB", "0.8"))
+
 # ── Silero VAD ────────────────────────────────────────────────────────────────
 SILERO_THRESHOLD      = float(os.getenv("SILERO_THRESHOLD", "0.5"))
 SILERO_MIN_SILENCE_MS = int(os.getenv("SILERO_MIN_SILENCE_MS", "1200"))
@@ -57,16 +105,56 @@ XTTS_SERVER_URL  = os.getenv("XTTS_SERVER_URL", "http://localhost:18770/tts")
 XTTS_SPEAKER     = os.getenv("XTTS_SPEAKER", "Lilya Stainthorpe")
 XTTS_SPEAKER_WAV = os.getenv("XTTS_SPEAKER_WAV", "")   # path to voice clone WAV
 XTTS_SPEED       = float(os.getenv("XTTS_SPEED", "1.0"))
+# Streaming synthesis (POST /tts/stream): audio arrives chunk by chunk as
+# XTTS generates it; speed is then applied by the model, not time-stretched.
+XTTS_STREAM      = os.getenv("XTTS_STREAM", "false").lower() in ("1", "true", "yes")
+XTTS_STREAM_URL  = os.getenv("XTTS_STREAM_URL", XTTS_SERVER_URL.rstrip("/") + "/stream")
+# Synthesis scheduler: concurrent requests to the XTTS server, and how many
+# sentences may be synthesized ahead of playback.
+TTS_WORKERS  = int(os.getenv("TTS_WORKERS", "1"))
+TTS_PREFETCH = int(os.getenv("TTS_PREFETCH", "2"))
+# Synthesized audio cache (memory LRU + WAV files under data/); the model
+# version is part of the key so an XTTS upgrade never replays stale audio.
+XTTS_MODEL_VERSION   = os.getenv("XTTS_MODEL_VERSION", "xtts_v2")
+TTS_CACHE_DIR        = os.getenv("TTS_CACHE_DIR", "data/tts-cache")
+TTS_CACHE_MEMORY_MB  = int(os.getenv("TTS_CACHE_MEMORY_MB", "32"))
+TTS_CACHE_DISK_MB    = int(os.getenv("TTS_CACHE_DISK_MB", "512"))
+
+# Live cast stream: one continuous WAV per answer instead of one play_media
+# per sentence (gapless); pause inserted between sentences, and how far
+# synthesized audio may run ahead of playback.
+CAST_LIVE_STREAM     = os.getenv("CAST_LIVE_STREAM", "false").lower() in ("1", "true", "yes")
+CAST_SENTENCE_GAP_MS = int(os.getenv("CAST_SENTENCE_GAP_MS", "150"))
+CAST_LIVE_AHEAD_S    = float(os.getenv("CAST_LIVE_AHEAD_S", "20"))
+# Clips served to the cast device (content-addressed, LRU + TTL).
+CLIP_STORE_MB = int(os.getenv("CLIP_STORE_MB", "64"))
+CLIP_TTL_S    = float(os.getenv("CLIP_TTL_S", "600"))
+# Playback ends on the receiver's IDLE event; this is only the safety margin
+# past the clip's duration when no event arrives.
+CAST_LOAD_TIMEOUT_S  = float(os.getenv("CAST_LOAD_TIMEOUT_S", "10"))
 
 SAVE_AUDIO_DEBUG = os.getenv("SAVE_AUDIO_DEBUG", "").lower() in ("1", "true", "yes")
 AUDIO_DEBUG_DIR  = os.getenv("AUDIO_DEBUG_DIR", "data/audio-debug")
 
 TTS_SPEAKER = os.getenv("TTS_SPEAKER", "Salon")
+# Cast devices seen by the zeroconf browser (shared with mcp-chromecast).
+CAST_REGISTRY_PATH = os.getenv(
+    "CAST_REGISTRY_PATH",
+    os.path.join(os.path.dirname(__file__), "..", "data", "cast-devices.json"),
+)
 LOCAL_IP    = os.getenv("LOCAL_IP", "10.0.0.101")
 TTS_PORT    = int(os.getenv("TTS_PORT", "18765"))
 SPEAK_PORT  = int(os.getenv("SPEAK_PORT", "3001"))
 AUDIO_UDP_PORT = int(os.getenv("AUDIO_UDP_PORT", "5002"))
 DEBUG_WS_PORT  = int(os.getenv("DEBUG_WS_PORT", "5051"))
+READY_PORT     = int(os.getenv("READY_PORT", "5052"))    # GET /ready: startup state + timings
+
+# ── Local intents ─────────────────────────────────────────────────────────────
+# Frequent device commands matched locally and sent straight to the tool
+# endpoint; extra rules are read from data/voice-intents.json.
+INTENTS_ENABLED = os.getenv("INTENTS_ENABLED", "true").lower() in ("1", "true", "yes")
+_RAW_INTENT_ROOMS = os.getenv("INTENT_ROOMS", "salon,cuisine,chambre,bureau,couloir,salle de bain,entrée")
+INTENT_ROOMS = [r.strip() for r in _RAW_INTENT_ROOMS.split(",") if r.strip()]
 
 # ── Conversation / stop words ─────────────────────────────────────────────────
 CONVERSATION_WINDOW_S = float(os.getenv("CONVERSATION_WINDOW_S", "20"))
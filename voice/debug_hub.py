@@ -1,12 +1,13 @@
 """WebSocket hub for the front-end debug page.
 
 Outbound (server->browser):
-  {"type":"score","value":0.42,"threshold":0.5}        (always, when clients connected)
-  {"type":"wake","ts":..,"score":..,"text":..,"wav":"/voice-debug/wakes/<file>"}
-  binary frames: raw int16 PCM (only while a client requested "listen")
+  {"type":"score","value":0.42,"threshold":0.5,"room":"salon"}   (always, when clients connected)
+  {"type":"wake","ts":..,"score":..,"text":..,"wav":"/voice-debug/wakes/<file>","room":..}
+  {"type":"stats",...}                                  (stage queue depths, every minute)
+  binary frames: raw int16 PCM of one room (only while a client requested "listen")
 Inbound (browser->server):
   {"type":"tuning","threshold":0.6,"vad_aggressiveness":2,"gain":1.5}
-  {"type":"listen","on":true}
+  {"type":"listen","on":true,"room":"chambre"}      (room optional, default room otherwise)
 """
 from __future__ import annotations
 
@@ -23,30 +24,41 @@ log = logging.getLogger("voice")
 
 
 class DebugHub:
-    def __init__(self, tuning, on_tuning_change: Callable[[], None], port: int):
+    def __init__(self, tuning, on_tuning_change: Callable[[], None], port: int,
+                 default_room: str | None = None):
         self._tuning = tuning
         self._on_tuning_change = on_tuning_change
         self._port = port
         self._clients: set = set()
         self._listeners: set = set()
         self._wakes: list[dict] = []          # recent wake events (most-recent last, cap 20)
+        self._default_room = default_room
+        self._listen_room = default_room      # whose PCM goes to listeners
         self._loop: asyncio.AbstractEventLoop | None = None
 
     # ---- called from the pipeline thread (thread-safe) ----
-    def publish_score(self, score: float) -> None:
+    def publish_score(self, score: float, room: str | None = None) -> None:
         self._schedule(self._broadcast_json, {
             "type": "score", "value": round(float(score), 4),
-            "threshold": self._tuning.threshold,
+            "threshold": self._tuning.threshold, "room": room,
         })
 
-    def publish_audio(self, chunk_int16: np.ndarray) -> None:
-        if not self._listeners:
+    def publish_audio(self, chunk_int16: np.ndarray, room: str | None = None) -> None:
+        if not self._listeners or room != self._listen_room:
             return
         self._schedule(self._broadcast_binary, chunk_int16.astype("<i2").tobytes())
 
-    def record_wake(self, score: float, text: str, wav_url: str) -> None:
+    def publish_partial(self, committed: str, tentative: str, room: str | None = None) -> None:
+        self._schedule(self._broadcast_json, {
+            "type": "partial", "committed": committed, "tentative": tentative, "room": room,
+        })
+
+    def publish_stats(self, stats: dict) -> None:
+        self._schedule(self._broadcast_json, {"type": "stats", **stats})
+
+    def record_wake(self, score: float, text: str, wav_url: str, room: str | None = None) -> None:
         evt = {"type": "wake", "ts": time.time(), "score": round(float(score), 3),
-               "text": text, "wav": wav_url}
+               "text": text, "wav": wav_url, "room": room}
         self._wakes.append(evt)
         self._wakes = self._wakes[-20:]
         self._schedule(self._broadcast_json, evt)
@@ -86,6 +98,7 @@ class DebugHub:
                     await self._broadcast_json({"type": "tuning", **self._tuning.to_dict()})
                 elif msg.get("type") == "listen":
                     if msg.get("on"):
+                        self._listen_room = msg.get("room") or self._default_room
                         self._listeners.add(ws)
                     else:
                         self._listeners.discard(ws)
@@ -0,0 +1,166 @@
+"""Adaptive endpointing: how much trailing silence ends an utterance.
+
+A fixed 1.2 s silence window makes every short command wait over a second
+before STT starts. ``Endpointer`` picks the window per pause instead, from
+what is known when the silence begins:
+
+* the partial transcript (``streaming_stt``), if it covers all the speech:
+  a complete known command ends fast, a dangling function word ("allume la…")
+  waits longest;
+* the prosody of the last voiced frames: falling pitch/energy reads as a
+  finished statement, level or rising pitch as a pause mid-sentence.
+
+Each decision is kept as a short trace for logging and tuning.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+
+import numpy as np
+
+# Utterances that are complete commands once transcribed (after the trigger
+# word is stripped). Matched on the lowercased partial, punctuation removed.
+COMPLETE_COMMANDS = [
+    r"(allume|éteins|eteins|ouvre|ferme|baisse|monte|coupe|lance|arrête|arrete)"
+    r"( (le|la|les|l'|du|des|tout|toutes))? ?[\w'-]+( (du|de la|de l'|des) [\w'-]+)?",
+    r"(pause|stop|silence|reprends|suivant|précédent|plus fort|moins fort)",
+    r"(mets|règle) (le|la) volume à \d+( %| pour ?cent)?",
+    r"(mets|lance) (un|le) minuteur (de|pour) \d+ (secondes?|minutes?|heures?)",
+    r"quelle heure (est-il|il est)",
+    r"quel temps (fait-il|il fait)( demain| aujourd'hui)?",
+]
+
+# A transcript ending on one of these is mid-sentence.
+DANGLING_WORDS = {
+    "le", "la", "les", "l'", "un", "une", "des", "du", "de", "d'", "au", "aux",
+    "à", "a", "et", "ou", "mais", "pour", "dans", "sur", "avec", "en", "que",
+    "qui", "mon", "ma", "mes", "ton", "ta", "tes", "son", "sa", "ses", "ce",
+    "cette", "est-ce", "allume", "éteins", "mets", "lance", "joue", "règle",
+}
+
+_PUNCT = re.compile(r"[^\w'\s-]+")
+PITCH_MIN_HZ = 80
+PITCH_MAX_HZ = 400
+TAIL_FRAMES = 8                 # last ~240 ms of voiced frames
+FALL_RATIO = 0.92
+RISE_RATIO = 1.08
+ENERGY_DROP_DB = 6.0
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCT.sub(" ", text.lower()).split())
+
+
+def frame_pitch(frame: np.ndarray, sample_rate: int = 16000) -> Optional[float]:
+    """F0 of one frame in Hz by autocorrelation, or None if unvoiced."""
+    x = frame.astype(np.float32)
+    x -= x.mean()
+    n = len(x)
+    spec = np.fft.rfft(x, 2 * n)
+    ac = np.fft.irfft(spec * np.conj(spec))[:n]
+    if ac[0] <= 0:
+        return None
+    lo, hi = sample_rate // PITCH_MAX_HZ, min(n - 1, sample_rate // PITCH_MIN_HZ)
+    lag = lo + int(np.argmax(ac[lo:hi]))
+    if ac[lag] / ac[0] < 0.3:
+        return None
+    return sample_rate / lag
+
+
+def frame_energy_db(frame: np.ndarray) -> float:
+    rms = float(np.sqrt(np.mean(frame.astype(np.float32) ** 2)))
+    return 20.0 * np.log10(max(rms, 1.0))
+
+
+class Endpointer:
+    """Chooses the trailing-silence window for one utterance.
+
+    ``UtteranceCapture`` calls ``observe()`` for every frame and ends the
+    utterance once its silence run reaches ``silence_ms()``. The partial
+    transcript is pushed in with ``set_partial()`` from the STT thread.
+    """
+
+    def __init__(self, min_ms: int = 350, base_ms: int = 800, max_ms: int = 1500,
+                 sample_rate: int = 16000, commands: Optional[list[str]] = None):
+        self.min_ms = min_ms
+        self.base_ms = base_ms
+        self.max_ms = max_ms
+        self._rate = sample_rate
+        self._commands = [re.compile(p) for p in (commands or COMPLETE_COMMANDS)]
+        self._pitch: list[float] = []
+        self._energy: list[float] = []
+        self._samples = 0
+        self._speech_end = 0
+        self._partial = ""
+        self._partial_ms = 0
+        self._decision: Optional[tuple[int, list[str]]] = None
+        self.trace: list[str] = []
+
+    # ---- inputs ----
+    def set_partial(self, text: str, audio_ms: int) -> None:
+        """Latest partial transcript (trigger word stripped) and how much of
+        the utterance it covers; re-decides the current pause."""
+        self._partial, self._partial_ms = text, audio_ms
+        self._decision = None
+
+    def observe(self, frame: np.ndarray, is_speech: bool) -> None:
+        self._samples += len(frame)
+        if not is_speech:
+            return
+        self._speech_end = self._samples
+        self._decision = None               # a new pause gets a new decision
+        self._energy.append(frame_energy_db(frame))
+        f0 = frame_pitch(frame, self._rate)
+        if f0 is not None:
+            self._pitch.append(f0)
+
+    # ---- decision ----
+    def silence_ms(self) -> int:
+        """Trailing silence that ends the utterance at the current pause."""
+        if self._decision is None:
+            self._decision = self._decide()
+            ms, reasons = self._decision
+            at = self._speech_end * 1000 // self._rate
+            self.trace.append(f"{at}ms: {ms}ms ({', '.join(reasons)})")
+        return self._decision[0]
+
+    def _decide(self) -> tuple[int, list[str]]:
+        reasons: list[str] = []
+        text = _normalize(self._partial)
+        if text and self._partial_ms * self._rate // 1000 >= self._speech_end:
+            last = text.split()[-1]
+            if last in DANGLING_WORDS:
+                return self.max_ms, [f"dangling {last!r}"]
+            if any(p.fullmatch(text) for p in self._commands):
+                return self.min_ms, [f"complete command {text!r}"]
+            reasons.append("partial inconclusive")
+        elif text:
+            reasons.append("partial stale")
+        ms = self.base_ms
+        contour = self._contour()
+        if contour == "falling":
+            ms = (ms + self.min_ms) // 2
+        elif contour == "rising":
+            ms = (ms + self.max_ms) // 2
+        reasons.append(f"prosody {contour}")
+        return ms, reasons
+
+    def _contour(self) -> str:
+        if len(self._energy) >= 2 * TAIL_FRAMES:
+            tail = float(np.mean(self._energy[-TAIL_FRAMES:]))
+            body = float(np.median(self._energy[:-TAIL_FRAMES]))
+            if body - tail >= ENERGY_DROP_DB:
+                return "falling"
+        if len(self._pitch) < 2 * TAIL_FRAMES:
+            return "unknown"
+        tail = float(np.median(self._pitch[-TAIL_FRAMES:]))
+        body = float(np.median(self._pitch[:-TAIL_FRAMES]))
+        if tail <= body * FALL_RATIO:
+            return "falling"
+        if tail >= body * RISE_RATIO:
+            return "rising"
+        return "level"
+
+    def describe(self) -> str:
+        return "; ".join(self.trace) or "no pause"
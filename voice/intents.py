@@ -0,0 +1,338 @@
+"""Local intent fast path: common device commands without the LLM.
+
+A small grammar of high-frequency commands (lights, scenes, volume, music,
+timers) is compiled to regexes once; a transcript (trigger word already
+stripped) that fully matches a rule is turned into a direct orchestrator
+tool call (``POST /tools/<name>``). Everything else goes to the LLM as before.
+
+Rules are plain dicts so the built-in grammar and the optional JSON file
+(``data/voice-intents.json``, a list of rules) share one format::
+
+    {"name": "lights_on",
+     "patterns": ["allume (la lumière|les lumières) (du |de la |de l')?{room}"],
+     "tool": "light_set",
+     "args": {"target": "{room}", "on": true},
+     "reply": null}
+
+Pattern macros: ``{room}`` (a known room), ``{percent}`` (0–100, digits or
+French words), ``{duration}`` (e.g. "10 minutes", "une heure et demie",
+converted to seconds), ``{name}`` / ``{label}`` (free text). Placeholders
+in ``args`` and ``reply`` are filled from the macros matched; a string that
+is exactly one placeholder keeps the converted type (int for percent and
+duration). The rule that matches first wins; file rules come first.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from typing import Any, NamedTuple, Optional
+
+from config import STOP_WORDS
+from text_utils import is_stop_command, strip_trigger
+
+log = logging.getLogger("voice")
+
+_UNITS = {
+    "zéro": 0, "un": 1, "une": 1, "deux": 2, "trois": 3, "quatre": 4, "cinq": 5,
+    "six": 6, "sept": 7, "huit": 8, "neuf": 9, "dix": 10, "onze": 11, "douze": 12,
+    "treize": 13, "quatorze": 14, "quinze": 15, "seize": 16, "dix-sept": 17,
+    "dix-huit": 18, "dix-neuf": 19,
+}
+_TENS = {"vingt": 20, "trente": 30, "quarante": 40, "cinquante": 50, "soixante": 60}
+_NUMBER_WORDS = sorted([*_UNITS, *_TENS, "cent", "et"], key=len, reverse=True)
+_NUMBER = r"(?:\d+|(?:(?:{w})[- ]?)+)".format(w="|".join(_NUMBER_WORDS))
+_UNIT_SECONDS = {"seconde": 1, "minute": 60, "heure": 3600}
+
+MACROS = {
+    "percent": rf"(?P<percent>{_NUMBER})(?: ?%| pour ?cent)?",
+    "duration": rf"(?P<duration>{_NUMBER} (?:secondes?|minutes?|heures?)(?: et (?:demie?|{_NUMBER} (?:secondes?|minutes?)))?)",
+    "name": r"(?P<name>[\w' -]+?)",
+    "label": r"(?P<label>[\w' -]+?)",
+}
+
+DEFAULT_GRAMMAR: list[dict] = [
+    {"name": "all_lights_on",
+     "patterns": ["(?:r?allume) (?:toutes les lumières|les lumières|tout)(?: partout)?"],
+     "tool": "light_set", "args": {"target": "all", "on": True}},
+    {"name": "all_lights_off",
+     "patterns": ["éteins (?:toutes les lumières|les lumières)(?: partout)?"],
+     "tool": "light_set", "args": {"target": "all", "on": False}},
+    {"name": "house_off",
+     "patterns": ["(?:éteins|coupe) tout"],
+     "tool": "house_off", "args": {}},
+    {"name": "lights_on",
+     "patterns": ["(?:r?allume) (?:la lumière |les lumières |la lampe |les lampes )?(?:du |de la |de l'|dans le |dans la |le |la |l')?{room}"],
+     "tool": "light_set", "args": {"target": "{room}", "on": True}},
+    {"name": "lights_off",
+     "patterns": ["éteins (?:la lumière |les lumières |la lampe |les lampes )?(?:du |de la |de l'|dans le |dans la |le |la |l')?{room}"],
+     "tool": "light_set", "args": {"target": "{room}", "on": False}},
+    {"name": "brightness",
+     "patterns": ["(?:mets|règle|baisse|monte) (?:la lumière |les lumières )?(?:du |de la |de l'|le |la |l')?{room} à {percent}"],
+     "tool": "light_set", "args": {"target": "{room}", "on": True, "brightness": "{percent}"}},
+    {"name": "scene",
+     "patterns": ["(?:lance|mets|active) (?:la |une )?(?:scène|ambiance) {name}", "ambiance {name}"],
+     "tool": "scene_trigger", "args": {"id": "{name}"}},
+    {"name": "volume",
+     "patterns": ["(?:mets|règle|monte|baisse) le volume à {percent}", "volume à {percent}"],
+     "tool": "set_volume", "args": {"percent": "{percent}"}},
+    {"name": "music_pause",
+     "patterns": ["(?:mets )?(?:la musique )?en pause", "pause(?: la musique)?"],
+     "tool": "pause_music", "args": {}},
+    {"name": "music_stop",
+     "patterns": ["(?:arrête|coupe|stoppe|stop) la musique"],
+     "tool": "stop_music", "args": {}},
+    {"name": "music_next",
+     "patterns": ["(?:chanson|morceau|piste|titre) suivante?", "suivant(?:e)?", "passe (?:à la chanson suivante|au suivant)"],
+     "tool": "next_track", "args": {}},
+    {"name": "music_previous",
+     "patterns": ["(?:chanson|morceau|piste|titre) précédente?", "précédent(?:e)?"],
+     "tool": "previous_track", "args": {}},
+    {"name": "timer",
+     "patterns": ["(?:mets|lance|démarre|programme) (?:un|le) (?:minuteur|timer|chrono) (?:de |pour )?{duration}(?: pour (?:les |la |le |l')?{label})?",
+                  "minuteur (?:de )?{duration}(?: pour (?:les |la |le |l')?{label})?"],
+     "tool": "timer_set",
+     "args": {"label": "{label}", "duration_seconds": "{duration}", "room": "{current_room}"},
+     "reply": "Minuteur de {duration_text} lancé."},
+]
+
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+_POLITE = re.compile(r"\b(?:s'il te pla[iî]t|s'il vous pla[iî]t|stp|merci)\b")
+
+
+def normalize(text: str) -> str:
+    """Lowercase, drop punctuation and polite suffixes, collapse spaces."""
+    text = _POLITE.sub(" ", text.lower())
+    text = re.sub(r"[^\w'%\s-]+", " ", text.replace("’", "'"))
+    return " ".join(text.split())
+
+
+def parse_number(words: str) -> Optional[int]:
+    """French number 0–199 in digits or words ("vingt-cinq", "soixante et onze")."""
+    words = words.strip()
+    if words.isdigit():
+        return int(words)
+    total = 0
+    for part in re.split(r"[- ]+", words):
+        if part in ("", "et"):
+            continue
+        if part == "cent":
+            total = (total or 1) * 100
+        elif part in _TENS:
+            total += _TENS[part]
+        elif part in _UNITS:
+            total += _UNITS[part]
+        else:
+            return None
+    return total
+
+
+def parse_duration(text: str) -> Optional[int]:
+    """Seconds in "10 minutes", "une heure et demie", "2 minutes et 30 secondes"."""
+    m = re.fullmatch(rf"({_NUMBER}) (seconde|minute|heure)s?(?: et (demie?|({_NUMBER}) (seconde|minute)s?))?", text)
+    if not m:
+        return None
+    n = parse_number(m.group(1))
+    if n is None:
+        return None
+    unit = _UNIT_SECONDS[m.group(2)]
+    seconds = n * unit
+    if m.group(3):
+        if m.group(3).startswith("demi"):
+            seconds += unit // 2
+        else:
+            extra = parse_number(m.group(4))
+            if extra is None:
+                return None
+            seconds += extra * _UNIT_SECONDS[m.group(5)]
+    return seconds
+
+
+class Intent(NamedTuple):
+    name: str
+    tool: str
+    args: dict
+    reply: Optional[str]
+
+
+class _Rule(NamedTuple):
+    name: str
+    regexes: list
+    tool: str
+    args: dict
+    reply: Optional[str]
+
+
+def _fill(value: Any, slots: dict) -> Any:
+    if isinstance(value, str):
+        m = _PLACEHOLDER.fullmatch(value)
+        if m:
+            return slots.get(m.group(1))
+        return _PLACEHOLDER.sub(lambda g: str(slots.get(g.group(1), "")), value)
+    if isinstance(value, dict):
+        filled = {k: _fill(v, slots) for k, v in value.items()}
+        return {k: v for k, v in filled.items() if v is not None}     # unset optional slots
+    if isinstance(value, list):
+        return [_fill(v, slots) for v in value]
+    return value
+
+
+class IntentMatcher:
+    """Compiled grammar; ``match(text)`` returns an ``Intent`` or None."""
+
+    def __init__(self, rooms: list[str], rules: Optional[list[dict]] = None):
+        self.rooms = sorted({normalize(r) for r in rooms if r.strip()}, key=len, reverse=True)
+        macros = dict(MACROS, room=r"(?P<room>{})".format("|".join(map(re.escape, self.rooms)) or r"(?!)"))
+        self._rules: list[_Rule] = []
+        for rule in (rules if rules is not None else DEFAULT_GRAMMAR):
+            regexes = [re.compile(_PLACEHOLDER.sub(lambda g: macros.get(g.group(1), g.group(0)), p))
+                       for p in rule["patterns"]]
+            self._rules.append(_Rule(rule["name"], regexes, rule["tool"],
+                                     rule.get("args", {}), rule.get("reply")))
+        self.hits: dict[str, int] = {}
+        self.misses = 0
+        self.recent_misses: deque[str] = deque(maxlen=20)   # grammar candidates
+        self._lock = threading.Lock()
+
+    @property
+    def patterns(self) -> list[str]:
+        return [rx.pattern for rule in self._rules for rx in rule.regexes]
+
+    def match(self, text: str, room: Optional[str] = None) -> Optional[Intent]:
+        """The intent for ``text``, counted in the hit/miss metrics."""
+        norm = normalize(text)
+        intent = self._find(norm, room)
+        with self._lock:
+            if intent is not None:
+                self.hits[intent.name] = self.hits.get(intent.name, 0) + 1
+            else:
+                self.misses += 1
+                self.recent_misses.append(norm)
+        return intent
+
+    def matches(self, text: str) -> bool:
+        """Whether ``text`` would be handled locally (not counted)."""
+        return self._find(normalize(text), None) is not None
+
+    def _find(self, norm: str, room: Optional[str]) -> Optional[Intent]:
+        for rule in self._rules:
+            for rx in rule.regexes:
+                m = rx.fullmatch(norm)
+                if m is None:
+                    continue
+                slots = self._slots(m, room)
+                if slots is None:
+                    continue
+                return Intent(rule.name, rule.tool, _fill(rule.args, slots),
+                              _fill(rule.reply, slots) if rule.reply else None)
+        return None
+
+    def _slots(self, m: re.Match, room: Optional[str]) -> Optional[dict]:
+        slots: dict[str, Any] = {"current_room": room}
+        for key, value in m.groupdict().items():
+            if value is None:
+                continue
+            if key == "percent":
+                n = parse_number(value)
+                if n is None or n > 100:
+                    return None
+                slots[key] = n
+            elif key == "duration":
+                seconds = parse_duration(value)
+                if not seconds:
+                    return None
+                slots[key] = seconds
+                slots["duration_text"] = value
+            else:
+                slots[key] = value.strip()
+        slots.setdefault("label", "minuteur")
+        return slots
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = sum(self.hits.values())
+            return {"hits": dict(self.hits), "misses": self.misses,
+                    "hit_rate": round(total / (total + self.misses), 3) if total + self.misses else 0.0,
+                    "recent_misses": list(self.recent_misses)}
+
+
+def route(text: str, matcher: Optional[IntentMatcher], room: Optional[str] = None,
+          speaking: bool = False) -> tuple[str, Optional[Intent]]:
+    """How a final transcript is handled: ``("stop", None)``, ``("intent",
+    intent)`` or ``("order", None)`` (sent to the LLM).
+
+    A bare stop word said while a reply is ``speaking`` stops the reply.
+    Otherwise the intents come first, so "pause" or "stop la musique" reach
+    the music tools; a stop-word order no intent knows still stops the reply.
+    """
+    order = strip_trigger(text)
+    if speaking and normalize(order) in STOP_WORDS:
+        return "stop", None
+    if matcher is not None and order:
+        intent = matcher.match(order, room)
+        if intent is not None:
+            return "intent", intent
+    if is_stop_command(text):
+        return "stop", None
+    return "order", None
+
+
+def load_grammar(path: str) -> list[dict]:
+    """Rules from ``path`` (JSON list) ahead of the built-in ones."""
+    try:
+        with open(path) as f:
+            extra = json.load(f)
+        if not isinstance(extra, list):
+            raise ValueError("expected a list of rules")
+        log.info(f"intent grammar: {len(extra)} rule(s) from {path}")
+        return extra + DEFAULT_GRAMMAR
+    except FileNotFoundError:
+        return DEFAULT_GRAMMAR
+    except (json.JSONDecodeError, ValueError) as e:
+        log.warning(f"intent grammar {path} ignored: {e}")
+        return DEFAULT_GRAMMAR
+
+
+class IntentExecutor:
+    """Calls the orchestrator's tool endpoint for a matched intent."""
+
+    def __init__(self, tools_url: str, token: str, timeout: float = 5.0):
+        self.tools_url = tools_url.rstrip("/")
+        self.token = token
+        self.timeout = timeout
+        import requests
+        self._session = requests.Session()      # keep-alive: no TCP setup per command
+        self.calls = 0
+        self.failures = 0
+        self.total_s = 0.0
+
+    def execute(self, intent: Intent) -> bool:
+        t0 = time.monotonic()
+        try:
+            resp = self._session.post(
+                f"{self.tools_url}/{intent.tool}",
+                json=intent.args,
+                headers={"Authorization": f"Bearer {self.token}"},
+                timeout=self.timeout,
+            )
+            ok = resp.status_code == 200
+            detail = "" if ok else f" HTTP {resp.status_code}: {resp.text[:200]}"
+        except Exception as e:
+            ok, detail = False, f" {e}"
+        elapsed = time.monotonic() - t0
+        self.calls += 1
+        self.failures += not ok
+        self.total_s += elapsed
+        ms = elapsed * 1000
+        if ok:
+            log.info(f"intent {intent.name}: {intent.tool}({intent.args}) in {ms:.0f} ms")
+        else:
+            log.warning(f"intent {intent.name}: {intent.tool} failed in {ms:.0f} ms:{detail}")
+        return ok
+
+    def stats(self) -> dict:
+        return {"calls": self.calls, "failures": self.failures,
+                "avg_ms": round(1000 * self.total_s / self.calls, 1) if self.calls else 0.0}
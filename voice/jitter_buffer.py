@@ -0,0 +1,158 @@
+"""Satellite audio framing + a small reordering jitter buffer.
+
+Satellites prefix every UDP datagram with a fixed 20-byte header
+(network byte order), followed by the raw PCM payload:
+
+  magic      2s   b"YU"
+  version    B    1
+  format     B    FORMAT_S16LE_16K_MONO
+  stream_id  H    identifies the satellite (room)
+  flags      H    reserved, 0
+  seq        I    packet counter, +1 per datagram (wraps at 2**32)
+  capture_us Q    capture time of the first sample, µs since the epoch
+
+Datagrams without the magic are legacy headerless s16le and bypass the
+jitter buffer entirely. Mirrors ``satellite/udp_stream.py``.
+"""
+from __future__ import annotations
+
+import struct
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+HEADER = struct.Struct("!2sBBHHIQ")
+HEADER_SIZE = HEADER.size           # 20 bytes
+MAGIC = b"YU"
+VERSION = 1
+FORMAT_S16LE_16K_MONO = 1
+
+_SEQ_MOD = 1 << 32
+
+
+class FrameHeader(NamedTuple):
+    format: int
+    stream_id: int
+    seq: int
+    capture_us: int
+
+
+def parse_header(buf) -> Optional[FrameHeader]:
+    """Return the header of a framed datagram, or None for legacy raw PCM."""
+    if len(buf) < HEADER_SIZE or bytes(buf[:2]) != MAGIC:
+        return None
+    magic, version, fmt, stream_id, _flags, seq, capture_us = HEADER.unpack_from(buf)
+    if version != VERSION:
+        return None
+    return FrameHeader(fmt, stream_id, seq, capture_us)
+
+
+def pack_header(stream_id: int, seq: int, capture_us: int,
+                fmt: int = FORMAT_S16LE_16K_MONO) -> bytes:
+    return HEADER.pack(MAGIC, VERSION, fmt, stream_id, 0, seq % _SEQ_MOD, capture_us)
+
+
+def _seq_delta(a: int, b: int) -> int:
+    """Signed distance a - b in sequence space (handles 32-bit wrap)."""
+    d = (a - b) % _SEQ_MOD
+    return d - _SEQ_MOD if d >= _SEQ_MOD // 2 else d
+
+
+class JitterBuffer:
+    """Releases packets in sequence order, concealing gaps with silence.
+
+    In-order packets go straight through (no added delay). When a packet is
+    missing, later ones are held until ``depth`` of them are queued; the hole
+    is then declared lost and filled with silence. Gaps larger than
+    ``max_gap`` packets (satellite restart, long outage) resync instead of
+    emitting seconds of silence.
+    """
+
+    def __init__(self, depth: int = 3, max_gap: int = 50):
+        self.depth = depth
+        self.max_gap = max_gap
+        self._next: Optional[int] = None
+        self._pending: dict[int, tuple[np.ndarray, int]] = {}
+        self._frame_len = 0                 # samples per packet, for concealment
+        self._last_transit: Optional[float] = None
+        self.received = 0
+        self.lost = 0
+        self.late = 0                       # duplicates or arrived after their slot was concealed
+        self.reordered = 0
+        self.resyncs = 0
+        self.jitter_ms = 0.0                # RFC 3550 interarrival jitter estimate
+
+    @property
+    def holding(self) -> bool:
+        """True while packets are held back waiting for a missing one."""
+        return bool(self._pending)
+
+    def in_order(self, seq: int) -> bool:
+        """True when ``seq`` would be released immediately, on its own."""
+        return not self._pending and (self._next is None or seq == self._next)
+
+    def push(self, seq: int, capture_us: int, payload: np.ndarray,
+             arrival: float) -> list[tuple[np.ndarray, Optional[int]]]:
+        """Add one packet; return the ``(samples, capture_us)`` chunks now
+        ready, in order. Concealment chunks carry ``capture_us=None``."""
+        self.received += 1
+        self._update_jitter(capture_us, arrival)
+        if self._next is None:
+            self._next = seq
+        d = _seq_delta(seq, self._next)
+        if d < 0:
+            if -d > self.max_gap:           # sender restarted its counter
+                self._resync(seq)
+            else:
+                self.late += 1
+                return []
+        elif d > self.max_gap:
+            self._resync(seq)
+        elif seq in self._pending:
+            self.late += 1
+            return []
+        elif d > 0:
+            self.reordered += 1
+        self._pending[seq] = (payload, capture_us)
+        return self._drain(force=False)
+
+    def flush(self) -> list[tuple[np.ndarray, Optional[int]]]:
+        """Release everything held (stream went idle), concealing any holes."""
+        return self._drain(force=True)
+
+    def _resync(self, seq: int) -> None:
+        self.resyncs += 1
+        self._pending.clear()
+        self._next = seq
+
+    def _drain(self, force: bool) -> list[tuple[np.ndarray, Optional[int]]]:
+        out: list[tuple[np.ndarray, Optional[int]]] = []
+        while self._pending:
+            pkt = self._pending.pop(self._next, None)
+            if pkt is None:
+                if not force and len(self._pending) < self.depth:
+                    break
+                self.lost += 1
+                if self._frame_len:
+                    out.append((np.zeros(self._frame_len, dtype=np.int16), None))
+            else:
+                self._frame_len = len(pkt[0])
+                out.append(pkt)
+            self._next = (self._next + 1) % _SEQ_MOD
+        return out
+
+    def _update_jitter(self, capture_us: int, arrival: float) -> None:
+        transit = arrival * 1000.0 - capture_us / 1000.0      # ms, includes clock offset
+        if self._last_transit is not None:
+            self.jitter_ms += (abs(transit - self._last_transit) - self.jitter_ms) / 16.0
+        self._last_transit = transit
+
+    def stats(self) -> dict:
+        return {
+            "received": self.received,
+            "lost": self.lost,
+            "late": self.late,
+            "reordered": self.reordered,
+            "resyncs": self.resyncs,
+            "jitter_ms": round(self.jitter_ms, 2),
+        }
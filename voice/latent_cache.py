@@ -0,0 +1,101 @@
+"""Speaker conditioning latents, computed once per reference voice.
+
+XTTS derives a GPT conditioning latent and a speaker embedding from the
+``speaker_wav`` reference on every ``tts()`` call — a fixed cost paid again
+for each sentence of a cloned voice. ``LatentCache`` keeps them per
+(reference path, mtime, size), so re-recording the reference invalidates
+the entry, and can persist them next to the WAV so a restart does not pay
+for them either. Built-in speakers go through the same cache.
+
+Stdlib only: the torch-specific compute/save/load callables come from
+``tts_engine.py``.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("voice")
+
+SUFFIX = ".xtts-latents.pt"
+
+
+class LatentCache:
+    def __init__(self, compute_wav: Callable[[str], Any], builtin: Callable[[str], Any],
+                 save: Optional[Callable[[Any, str], None]] = None,
+                 load: Optional[Callable[[str], Any]] = None):
+        """``compute_wav(path)`` / ``builtin(name)`` produce the latents;
+        ``save``/``load`` (both or neither) persist them beside the WAV."""
+        self._compute_wav = compute_wav
+        self._builtin = builtin
+        self._save = save
+        self._load = load
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, Any] = {}
+        self.hits = 0
+        self.misses = 0
+        self.loaded = 0             # misses served from a persisted file
+        self.compute_s = 0.0
+
+    @staticmethod
+    def _wav_key(path: str) -> tuple:
+        st = os.stat(path)
+        return ("wav", os.path.realpath(path), st.st_mtime_ns, st.st_size)
+
+    def get(self, speaker: Optional[str] = None, speaker_wav: Optional[str] = None) -> Any:
+        """Latents for the reference WAV if given, else the built-in speaker."""
+        key = self._wav_key(speaker_wav) if speaker_wav else ("speaker", speaker)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+        latents = self._fetch(key)
+        with self._lock:
+            self.misses += 1
+            # Keep one entry per reference file: an edited WAV replaces its old latents.
+            for old in [k for k in self._entries if k[:2] == key[:2]]:
+                del self._entries[old]
+            self._entries[key] = latents
+        return latents
+
+    def _fetch(self, key: tuple) -> Any:
+        if key[0] == "speaker":
+            return self._builtin(key[1])
+        path = key[1]
+        stored = f"{path}{SUFFIX}"
+        if self._load is not None:
+            try:
+                if os.path.getmtime(stored) >= key[2] / 1e9:
+                    latents = self._load(stored)
+                    with self._lock:
+                        self.loaded += 1
+                    return latents
+            except OSError:
+                pass
+            except Exception as e:
+                log.warning(f"Ignoring unreadable latents {stored}: {e}")
+        t0 = time.monotonic()
+        latents = self._compute_wav(path)
+        with self._lock:
+            self.compute_s += time.monotonic() - t0
+        if self._save is not None:
+            try:
+                self._save(latents, stored)
+            except Exception as e:
+                log.warning(f"Could not persist latents to {stored}: {e}")
+        return latents
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "loaded_from_disk": self.loaded,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "compute_ms_total": round(self.compute_s * 1000, 1),
+            }
@@ -0,0 +1,125 @@
+"""One continuous audio stream per answer, for the cast device.
+
+Casting each sentence as its own clip costs a media load and a buffer fill
+per sentence — about a second of silence between sentences. A ``LiveStream``
+is opened once per turn instead: the cast device reads a single endless WAV
+over HTTP, and sentences are appended to it as they are synthesized, with a
+short pause between them.
+
+When the next sentence is late, the reader fills the gap with silence in
+real time (the device would otherwise stall or drop the stream); the filler
+becomes part of the stream so every reader sees the same timeline. The
+stream ends once it is closed and fully sent, or at once when cancelled.
+"""
+from __future__ import annotations
+
+import io
+import threading
+import time
+import uuid
+from typing import Iterator, Optional
+
+import numpy as np
+import soundfile as sf
+
+from wav_stream import WavFormat, wav_header
+
+
+class LiveStream:
+    def __init__(self, fmt: WavFormat, cancel: Optional[threading.Event] = None,
+                 gap_ms: int = 150, lead_ms: int = 300, chunk_ms: int = 100):
+        self.id = uuid.uuid4().hex[:12]
+        self.fmt = fmt
+        self.cancel = cancel or threading.Event()
+        self._rate = fmt.sample_rate * fmt.frame_bytes          # bytes per second
+        self._gap = self._bytes(gap_ms / 1000)
+        self._lead = lead_ms / 1000
+        self._chunk = self._bytes(chunk_ms / 1000)
+        self._cond = threading.Condition()
+        self._pcm = bytearray()
+        self._closed = False
+        self._started: Optional[float] = None   # first read by the device
+        self.sentences = 0
+        self.underrun_s = 0.0                   # silence inserted because audio was late
+
+    def _bytes(self, seconds: float) -> int:
+        n = int(seconds * self._rate)
+        return n - n % self.fmt.frame_bytes
+
+    # ---- producer ----
+    def append(self, pcm: bytes) -> None:
+        """Queue one sentence of PCM (stream format), after a short pause."""
+        with self._cond:
+            if self._closed:
+                raise ValueError("stream is closed")
+            if self.sentences:
+                self._pcm += bytes(self._gap)
+            self._pcm += pcm
+            self.sentences += 1
+            self._cond.notify_all()
+
+    def append_wav(self, wav: bytes) -> None:
+        """Queue a WAV clip, converted to the stream's rate and channels."""
+        audio, rate = sf.read(io.BytesIO(wav), dtype="float32", always_2d=True)
+        audio = audio.mean(axis=1)
+        if rate != self.fmt.sample_rate and len(audio):
+            n = int(len(audio) * self.fmt.sample_rate / rate)
+            audio = np.interp(np.linspace(0, len(audio) - 1, n), np.arange(len(audio)), audio)
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+        if self.fmt.channels > 1:
+            pcm = np.repeat(pcm, self.fmt.channels)
+        self.append(pcm.tobytes())
+
+    def close(self) -> bool:
+        """No more sentences: the stream ends after what is queued.
+
+        Returns False if it was already closed.
+        """
+        with self._cond:
+            if self._closed:
+                return False
+            self._closed = True
+            self._cond.notify_all()
+            return True
+
+    # ---- timeline ----
+    @property
+    def duration_s(self) -> float:
+        with self._cond:
+            return len(self._pcm) / self._rate
+
+    def elapsed_s(self) -> float:
+        """Playback time since the device started reading (0 before)."""
+        with self._cond:
+            return 0.0 if self._started is None else time.monotonic() - self._started
+
+    def ahead_s(self) -> float:
+        """Audio queued beyond what the device has played."""
+        return self.duration_s - self.elapsed_s()
+
+    # ---- consumer (HTTP handler) ----
+    def reader(self) -> Iterator[bytes]:
+        """The WAV stream as the device should receive it: everything queued
+        at once, silence in real time when the next sentence is late."""
+        yield wav_header(self.fmt)
+        sent = 0
+        while not self.cancel.is_set():
+            with self._cond:
+                if self._started is None:
+                    self._started = time.monotonic()
+                if sent < len(self._pcm):
+                    data = bytes(self._pcm[sent:sent + self._chunk])
+                elif self._closed:
+                    return
+                else:
+                    due = self._bytes(time.monotonic() - self._started + self._lead)
+                    if due > sent:
+                        filler = min(due - sent, self._chunk)
+                        self._pcm += bytes(filler)
+                        self.underrun_s += filler / self._rate
+                        data = bytes(self._pcm[sent:])
+                    else:
+                        self._cond.wait(min((sent - due) / self._rate + 0.005, 0.1))
+                        continue
+            sent += len(data)
+            yield data
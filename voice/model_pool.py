@@ -0,0 +1,72 @@
+"""Shared scheduling pool for the heavy models.
+
+Every room's pipeline hands its model calls (Whisper transcription) to one
+``ModelPool`` instead of loading its own copy: jobs run FIFO on a fixed
+number of worker threads, so GPU/CPU memory is paid once no matter how many
+satellites are streaming.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable
+
+log = logging.getLogger("voice")
+
+
+class ModelPool:
+    def __init__(self, workers: int = 1, name: str = "models"):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix=name)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self.jobs = 0
+        self.wait_s = 0.0           # cumulative queue wait
+        self.busy_s = 0.0           # cumulative run time
+
+    @property
+    def depth(self) -> int:
+        """Jobs waiting for a worker."""
+        with self._lock:
+            return self._queued
+
+    def submit(self, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        submitted = time.monotonic()
+        with self._lock:
+            self._queued += 1
+
+        def job():
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                done = time.monotonic()
+                with self._lock:
+                    self._running -= 1
+                    self.jobs += 1
+                    self.wait_s += started - submitted
+                    self.busy_s += done - started
+
+        return self._executor.submit(job)
+
+    def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Submit and block for the result (re-raises the job's exception)."""
+        return self.submit(fn, *args, **kwargs).result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "jobs": self.jobs,
+                "avg_wait_ms": round(1000 * self.wait_s / self.jobs, 1) if self.jobs else 0.0,
+                "avg_run_ms": round(1000 * self.busy_s / self.jobs, 1) if self.jobs else 0.0,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
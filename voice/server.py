@@ -15,8 +15,9 @@ Dependencies (server-side):
 import asyncio
 import json
 import logging
+import itertools
 import os
-import queue as _queue
+import re
 import sys
 import threading
 import time
@@ -37,14 +38,36 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import (
     AUDIO_DEBUG_DIR,
     BEARER_TOKEN,
+    CAST_LIVE_AHEAD_S,
+    CAST_LIVE_STREAM,
     CONVERSATION_WINDOW_S,
     SAVE_AUDIO_DEBUG,
-    STOP_WORDS,
+    STT_CASCADE_MAX_NO_SPEECH,
+    STT_CASCADE_MIN_LOGPROB,
+    STT_CASCADE_MIN_VOCAB,
+    TRIGGER_WORD,
+    TTS_PREFETCH,
+    TTS_WORKERS,
     YUI_STREAM_URL,
+    YUI_TOOLS_URL,
     YUI_URL,
 )
-from text_utils import contains_trigger, find_sentence_end, strip_trigger
-from tts import generate_tts, play_audio_blocking, play_chime
+from text_utils import SentenceSegmenter, contains_trigger, is_stop_command, strip_trigger
+from stt_cascade import COMMAND_VOCABULARY, CascadeSTT, Transcript
+from tts import (
+    clip_store,
+    finish_live_stream,
+    generate_tts,
+    load_chimes,
+    play_audio_blocking,
+    play_chime,
+    playback_tracker,
+    start_cast,
+    start_http,
+    start_live_stream,
+    tts_cache,
+)
+from tts_scheduler import TtsScheduler
 
 log = logging.getLogger("yui-voice-server")
 
@@ -73,10 +96,12 @@ def _save_debug_audio(audio_int16: np.ndarray, label: str) -> None:
 
 class WhisperSTT:
     def __init__(self, model_name: str, device: str = "cuda",
-                 compute_type: str = "float16"):
+                 compute_type: str = "float16", beam_size: int = 5, best_of: int = 5):
         from faster_whisper import WhisperModel
         log.info(f"Loading Whisper model: {model_name} ({device}/{compute_type})…")
         self.model = WhisperModel(model_name, device=device, compute_type=compute_type)
+        self.beam_size = beam_size
+        self.best_of = best_of
         log.info("Whisper model ready.")
 
     # Vocabulary hint — biases Whisper decoder toward home automation terms
@@ -87,15 +112,27 @@ class WhisperSTT:
         "allume, éteins, baisse, monte, règle, mets, lance, joue, coupe."
     )
 
+    def warmup(self) -> None:
+        """One throwaway decode so CUDA kernels and buffers are set up before
+        the first command (the RMS gate would skip it via transcribe())."""
+        noise = np.random.default_rng(0).normal(0, 0.01, 16000).astype(np.float32)
+        segments, _ = self.model.transcribe(noise, language="fr", beam_size=self.beam_size,
+                                            best_of=self.best_of, vad_filter=False)
+        list(segments)
+
     def transcribe(self, audio_int16: np.ndarray) -> str:
         """Transcribe 16kHz int16 PCM. Returns text or '' if silent/hallucination."""
+        return self.transcribe_scored(audio_int16).text
+
+    def transcribe_scored(self, audio_int16: np.ndarray) -> Transcript:
+        """Like transcribe(), with the decoder's confidence (for the STT cascade)."""
         audio_float = audio_int16.astype(np.float32) / 32768.0
 
         # RMS gate — skip Whisper entirely on near-silence
         rms_val = float(np.sqrt(np.mean(audio_float ** 2))) * 32768.0
         if rms_val < WHISPER_MIN_RMS:
             log.info(f"STT skipped: RMS {rms_val:.0f} < {WHISPER_MIN_RMS} (silence gate)")
-            return ""
+            return Transcript("", skipped=True)
 
         # Normalize to -3 dBFS so Whisper always gets a strong signal
         peak = np.max(np.abs(audio_float))
@@ -106,8 +143,8 @@ class WhisperSTT:
             audio_float,
             language="fr",
             initial_prompt=self.INITIAL_PROMPT,
-            beam_size=5,
-            best_of=5,
+            beam_size=self.beam_size,
+            best_of=self.best_of,
             condition_on_previous_text=False,
             no_speech_threshold=0.6,
             log_prob_threshold=-1.0,
@@ -121,11 +158,16 @@ class WhisperSTT:
             suppress_blank=True,
         )
 
+        segments = list(segments)
         text = " ".join(seg.text.strip() for seg in segments).strip()
 
         # Reject if Whisper itself wasn't confident (no_speech_prob high for all segments)
         if not text:
-            return ""
+            return Transcript("")
+
+        durations = [max(seg.end - seg.start, 1e-3) for seg in segments]
+        avg_logprob = sum(seg.avg_logprob * d for seg, d in zip(segments, durations)) / sum(durations)
+        no_speech_prob = max(seg.no_speech_prob for seg in segments)
 
         # Post-filter common French hallucinations
         for pattern in [
@@ -139,93 +181,199 @@ class WhisperSTT:
         ]:
             if pattern in text.lower() and len(text) < len(pattern) + 20:
                 log.warning(f"Filtered hallucination: {text!r}")
-                return ""
+                return Transcript("")
 
-        return text
+        return Transcript(text, avg_logprob, no_speech_prob)
 
 
 # ---------------------------------------------------------------------------
-# Orchestrator + TTS pipeline
-# (mirrors post_order() from voice/pipeline.py, without the stop-word listener)
+# Orchestrator + TTS: dialogue and playback stages
 # ---------------------------------------------------------------------------
 
-_stop_event = threading.Event()
-_conversation_mode_until: float = 0.0
-
+from stages import Stage
+from speculation import Speculation, Speculations, StablePartial
 
-def _post_order(text: str, reset_convo: bool = False) -> None:
-    """
-    Send text to the orchestrator via SSE, TTS each sentence, play on Chromecast.
-    Blocks until all TTS playback is complete.
-    """
-    _stop_event.clear()
-    log.info(f'Order ({"NEW convo" if reset_convo else "convo"}): "{text}"')
+_conversation_mode_until: float = 0.0
 
-    play_queue: _queue.Queue = _queue.Queue()
+DIALOGUE_QUEUE = int(os.getenv("DIALOGUE_QUEUE", "4"))     # commands waiting behind the current answer
+PLAYBACK_QUEUE = int(os.getenv("PLAYBACK_QUEUE", "8"))     # sentences synthesized ahead of playback
+# First TTS chunk may end on a comma once this long (earlier first audio).
+SEGMENT_FIRST_CLAUSE_CHARS = int(os.getenv("SEGMENT_FIRST_CLAUSE_CHARS", "25"))
 
-    class _Slot:
-        def __init__(self):
-            self._q: _queue.Queue = _queue.Queue(maxsize=1)
 
-        def put(self, val):
-            self._q.put(val)
+def _sse_tokens(text: str, reset_convo: bool, stop_event: threading.Event):
+    """Yield the orchestrator's answer tokens from ``YUI_STREAM_URL``.
 
-        def get(self):
-            return self._q.get()
+    Stops (closing the request) as soon as ``stop_event`` is set. Connection
+    errors propagate so the caller can fall back to the blocking endpoint.
+    """
+    resp = requests.post(
+        YUI_STREAM_URL,
+        json={"order": text, "voice": True, "reset": reset_convo},
+        headers={"Authorization": f"Bearer {BEARER_TOKEN}"},
+        stream=True,
+        timeout=90,
+    )
+    try:
+        for raw in resp.iter_lines():
+            if stop_event.is_set():
+                return
+            if not raw:
+                continue
+            line = raw.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+            data = line[6:]
+            if data == "[DONE]":
+                return
+            try:
+                obj = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if "error" in obj:
+                log.error(f"Stream error: {obj['error']}")
+                return
+            token = obj.get("token", "")
+            if token:
+                yield token
+    finally:
+        resp.close()
+
+
+_turn_seq = itertools.count()
+
+
+class Turn:
+    """One command sent to the orchestrator and its spoken answer."""
+
+    def __init__(self, text: str, reset_convo: bool, room: str,
+                 speculation: Speculation | None = None, answer: str | None = None):
+        self.text = text
+        self.reset_convo = reset_convo
+        self.room = room
+        self.speculation = speculation          # already-open request for this text
+        self.answer = answer                    # fixed reply: speak it, no orchestrator call
+        self.stop_event = threading.Event()     # set by a stop word: abort stream + playback
+        self.seq = next(_turn_seq)              # TTS priority: earlier turns first
+        self.sentences = 0
+        self.live = None                        # LiveStream once playback started (live mode)
+
+
+class Responder:
+    """Dialogue/TTS and playback stages, shared by every room (one cast speaker).
+
+    The dialogue stage streams the orchestrator's SSE answer and queues each
+    sentence on the TTS scheduler; the playback stage plays the sentences in
+    order — one clip per sentence, or with ``CAST_LIVE_STREAM`` appended to a
+    single live cast stream per turn. Commands queue behind the current
+    answer; ``stop()`` cancels the answer, the queue and any synthesis not
+    started yet.
+    """
 
-    def _tts_worker(sentence: str, slot: _Slot) -> None:
-        try:
-            slot.put(generate_tts(sentence))
-        except Exception as e:
-            log.error(f"TTS error ({sentence[:40]!r}): {e}")
-            slot.put(None)
+    def __init__(self):
+        self.dialogue = Stage("dialogue", self._run_turn, maxsize=DIALOGUE_QUEUE)
+        self.playback = Stage("playback", self._play, maxsize=PLAYBACK_QUEUE)
+        self.tts = TtsScheduler(generate_tts, TTS_WORKERS, TTS_PREFETCH)
+        self._lock = threading.Lock()
+        self._turns: list[Turn] = []            # submitted, not yet fully played
+        self.speculations = Speculations(_sse_tokens)
+
+    def start(self) -> None:
+        self.dialogue.start()
+        self.playback.start()
+
+    @property
+    def speaking(self) -> bool:
+        """True while an answer is being generated or played."""
+        return self.dialogue.busy or self.playback.busy
+
+    def speculate(self, text: str, reset_convo: bool, room: str) -> None:
+        """Open the orchestrator request for ``text`` before the endpoint.
+
+        Replaces (cancels) the room's previous speculation if the text changed.
+        """
+        self.speculations.open(text, reset_convo, room)
+
+    def cancel_speculation(self, room: str, reason: str) -> None:
+        self.speculations.cancel(room, reason)
+
+    def say(self, text: str, room: str) -> Turn | None:
+        """Speak a fixed reply (local intent confirmation) in turn order."""
+        return self._enqueue(Turn(text, False, room, answer=text))
+
+    def submit(self, text: str, reset_convo: bool, room: str) -> Turn | None:
+        spec = self.speculations.claim(text, reset_convo, room)
+        return self._enqueue(Turn(text, reset_convo, room, spec))
+
+    def _enqueue(self, turn: Turn) -> Turn | None:
+        spec, room = turn.speculation, turn.room
+        with self._lock:
+            if not self.dialogue.put(turn):
+                if spec is not None:
+                    spec.cancel()
+                return None
+            self._turns.append(turn)
+        if len(self._turns) > 1:
+            log.info(f"[{room}] command queued behind {len(self._turns) - 1} answer(s)")
+        return turn
 
-    def _flush(sentence: str) -> None:
-        sentence = sentence.strip()
-        if not sentence:
+    def stop(self) -> None:
+        """Cancel the answer being spoken and every queued command."""
+        with self._lock:
+            turns, self._turns = self._turns, []
+            for turn in turns:
+                turn.stop_event.set()
+                if turn.live is not None:
+                    # Its end marker may be dropped below: stop the device here.
+                    threading.Thread(target=finish_live_stream, args=(turn.live,),
+                                     daemon=True).start()
+            playback_tracker.interrupt()        # the playing clip's wait sees the stop
+            self.speculations.cancel_all()
+            dropped = self.dialogue.clear()
+        self.playback.clear()
+        self.tts.purge()
+        log.info(f"stop: cancelled {len(turns)} turn(s) ({dropped} not started)")
+
+    def _finish(self, turn: Turn) -> None:
+        with self._lock:
+            if turn in self._turns:
+                self._turns.remove(turn)
+
+    def _run_turn(self, turn: Turn) -> None:
+        """
+        Send the turn to the orchestrator via SSE and hand each sentence to the
+        playback stage (synthesis is scheduled per sentence).
+        """
+        if turn.stop_event.is_set():
             return
-        slot = _Slot()
-        play_queue.put(slot)
-        threading.Thread(target=_tts_worker, args=(sentence, slot), daemon=True).start()
+        text, reset_convo = turn.text, turn.reset_convo
+        if turn.answer is None:
+            log.info(f'[{turn.room}] Order ({"NEW convo" if reset_convo else "convo"}): "{text}"')
+
+        def _flush(sentence: str) -> None:
+            sentence = sentence.strip()
+            if not sentence:
+                return
+            job = self.tts.submit(sentence, (turn.seq, turn.sentences), turn.stop_event)
+            turn.sentences += 1
+            # Back-pressure: wait for room in the playback queue unless stopped.
+            while not turn.stop_event.is_set():
+                if self.playback.put((turn, job), block=True, timeout=0.1):
+                    break
 
-    def _sse_reader() -> None:
-        buf = ""
+        segmenter = SentenceSegmenter(SEGMENT_FIRST_CLAUSE_CHARS)
         try:
-            resp = requests.post(
-                YUI_STREAM_URL,
-                json={"order": text, "voice": True, "reset": reset_convo},
-                headers={"Authorization": f"Bearer {BEARER_TOKEN}"},
-                stream=True,
-                timeout=90,
-            )
-            for raw in resp.iter_lines():
-                if not raw:
-                    continue
-                line = raw.decode("utf-8")
-                if not line.startswith("data: "):
-                    continue
-                data = line[6:]
-                if data == "[DONE]":
-                    if buf.strip():
-                        _flush(buf)
-                    break
-                try:
-                    obj = json.loads(data)
-                    if "error" in obj:
-                        log.error(f"Stream error: {obj['error']}")
-                        break
-                    token = obj.get("token", "")
-                    if not token:
-                        continue
-                    buf += token
-                    while True:
-                        end = find_sentence_end(buf)
-                        if end == -1:
-                            break
-                        _flush(buf[: end + 1])
-                        buf = buf[end + 1 :].lstrip()
-                except json.JSONDecodeError:
-                    pass
+            if turn.answer is not None:
+                tokens = [turn.answer]
+            elif turn.speculation is not None:
+                tokens = turn.speculation.tokens(turn.stop_event)
+            else:
+                tokens = _sse_tokens(text, reset_convo, turn.stop_event)
+            for token in tokens:
+                for chunk in segmenter.feed(token):
+                    _flush(chunk)
+            if not turn.stop_event.is_set():
+                _flush(segmenter.flush())
         except Exception as e:
             log.error(f"SSE error: {e} — falling back to blocking call")
             try:
@@ -236,34 +384,49 @@ def _post_order(text: str, reset_convo: bool = False) -> None:
                     timeout=60,
                 )
                 response_text = resp2.json().get("response", "")
-                if response_text:
-                    _flush(response_text)
+                segmenter = SentenceSegmenter(SEGMENT_FIRST_CLAUSE_CHARS)
+                for chunk in segmenter.feed(response_text):
+                    _flush(chunk)
+                _flush(segmenter.flush())
             except Exception as e2:
                 log.error(f"Fallback also failed: {e2}")
         finally:
-            play_queue.put(None)  # sentinel
-
-    threading.Thread(target=_sse_reader, daemon=True).start()
-
-    # Playback loop — plays sentences in order
-    while True:
-        if _stop_event.is_set():
-            break
-        try:
-            item = play_queue.get(timeout=0.1)
-        except _queue.Empty:
-            continue
-        if item is None:
-            break  # SSE reader sentinel
-        if _stop_event.is_set():
-            break
-        result = item.get()  # blocks until TTS is ready
-        if result is None:
-            continue
+            # End-of-turn marker so the playback stage knows when it's done.
+            while not turn.stop_event.is_set():
+                if self.playback.put((turn, None), block=True, timeout=0.1):
+                    break
+            if turn.stop_event.is_set():
+                self._finish(turn)
+
+    def _play(self, item) -> None:
+        turn, job = item
+        if job is None or turn.stop_event.is_set():
+            if turn.live is not None:
+                finish_live_stream(turn.live)
+                turn.live = None
+            self._finish(turn)
+            return
+        result = job.get()  # blocks until TTS is ready
+        if result is None or turn.stop_event.is_set():
+            return
         audio, mime = result
-        play_audio_blocking(audio, mime, _stop_event)
-        if _stop_event.is_set():
-            break
+        if not CAST_LIVE_STREAM:
+            play_audio_blocking(audio, mime, turn.stop_event)
+        elif turn.live is None:
+            turn.live = start_live_stream(audio, turn.stop_event)
+        else:
+            # Keep synthesis from running arbitrarily far ahead of the device.
+            while turn.live.ahead_s() > CAST_LIVE_AHEAD_S and not turn.stop_event.wait(0.1):
+                pass
+            if not turn.stop_event.is_set():
+                turn.live.append_wav(audio)
+
+    def stats(self) -> dict:
+        return {"dialogue": self.dialogue.stats(), "playback": self.playback.stats(),
+                "tts": self.tts.stats(), "tts_cache": tts_cache.stats(),
+                "cast": playback_tracker.stats(), "clips": clip_store.stats(),
+                "turns": len(self._turns),
+                "speculation": self.speculations.stats()}
 
 
 # ---------------------------------------------------------------------------
@@ -271,96 +434,362 @@ def _post_order(text: str, reset_convo: bool = False) -> None:
 # ---------------------------------------------------------------------------
 
 import threading
-from audio_source import AudioSource
+from audio_source import AudioSource, AudioStream
 from wake import WakeDetector, OWW_CHUNK
 from vad_capture import UtteranceCapture
 from tuning import load_tuning, save_tuning
 from debug_hub import DebugHub
-from config import AUDIO_UDP_PORT, DEBUG_WS_PORT, WAKEWORD_NAME
+from model_pool import ModelPool
+from boot import Boot, serve_ready
+from config import (
+    AUDIO_DEFAULT_ROOM,
+    AUDIO_JITTER_DEPTH,
+    AUDIO_OVERFLOW,
+    AUDIO_RING_S,
+    AUDIO_ROOMS,
+    AUDIO_UDP_PORT,
+    DEBUG_WS_PORT,
+    ENDPOINT_ADAPTIVE,
+    ENDPOINT_BASE_MS,
+    ENDPOINT_MAX_MS,
+    ENDPOINT_MIN_MS,
+    INTENT_ROOMS,
+    INTENTS_ENABLED,
+    READY_PORT,
+    SPECULATE_STABLE_MS,
+    SPECULATIVE_DISPATCH,
+    STT_PARTIAL_MS,
+    STT_WORKERS,
+    WAKEWORD_NAME,
+)
+from streaming_stt import IncrementalTranscriber, Partial
+from endpointing import COMPLETE_COMMANDS, Endpointer
+from intents import IntentExecutor, IntentMatcher, load_grammar, route
 
 _TUNING_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "voice-tuning.json")
+_INTENTS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "voice-intents.json")
 _WAKE_WAV_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "voice-debug", "wakes")
 
+
+def _wake_model_path() -> str:
+    return os.getenv("WAKEWORD_MODEL", os.path.join(
+        os.path.dirname(os.path.dirname(__file__)), "assets", "wakeword", f"{WAKEWORD_NAME}.onnx"))
+
+
 # Require the wake score to stay >= threshold for this many consecutive 80 ms
 # chunks before firing — suppresses single-chunk transient spikes.
 WAKE_PATIENCE = int(os.getenv("WAKE_PATIENCE", "2"))
 
+# Endpointing input queue, in 80 ms chunks (drop-oldest audio, never a wake
+# marker; back-to-back markers coalesce, so the wake stage never blocks).
+ENDPOINT_QUEUE = int(os.getenv("ENDPOINT_QUEUE", "64"))
+STATS_LOG_S = 60.0
+
+
+class _WakeMark:
+    """Endpoint-stage marker: a new utterance starts with the next chunk."""
+
+    def __init__(self, conversation: bool):
+        self.conversation = conversation
+
 
 class VoicePipeline:
-    def __init__(self, stt: "WhisperSTT", hub: DebugHub, tuning):
+    """One room's stages: wake (this thread) → endpointing → STT → Responder.
+
+    The wake loop only reads and scores audio; after a wake it forwards the
+    following chunks to the endpointing stage and keeps going, so it never
+    waits on Whisper, the LLM or playback.
+    """
+
+    def __init__(self, stt: "WhisperSTT", hub: DebugHub, tuning, source: AudioStream,
+                 wake: WakeDetector, pool: ModelPool, responder: Responder,
+                 room: str = AUDIO_DEFAULT_ROOM, intents: IntentMatcher | None = None,
+                 executor: IntentExecutor | None = None):
         self.stt = stt
         self.hub = hub
         self.tuning = tuning
-        self.model_path = os.getenv("WAKEWORD_MODEL",
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "wakeword", f"{WAKEWORD_NAME}.onnx"))
-        self.source = AudioSource(AUDIO_UDP_PORT, get_gain=lambda: self.tuning.gain)
-        self.wake = WakeDetector(self.model_path)
+        self.source = source
+        self.wake = wake
+        self.pool = pool
+        self.responder = responder
+        self.room = room
+        self.intents = intents
+        self.executor = executor
         self.running = False
+        self.endpoint = Stage(f"endpoint-{room}", self._on_endpoint_item,
+                              maxsize=ENDPOINT_QUEUE, drop_oldest=True,
+                              keep=lambda item: isinstance(item, _WakeMark))
+        self.transcribe = Stage(f"stt-{room}", self._on_utterance, maxsize=2)
+        self._capturing = threading.Event()     # wake stage forwards audio to endpointing
+        self._wake_reset = threading.Event()    # endpointing done: wake stage resets OWW
+        self._cap: UtteranceCapture | None = None
+        self._partials: IncrementalTranscriber | None = None    # of the capture in progress
+        self._partial_lock = threading.Lock()   # partial callbacks vs. the endpoint
+        self._endpointer: Endpointer | None = None
+        self._stable = StablePartial(      # latest partial order, for speculation
+            SPECULATE_STABLE_MS, lambda order: self.intents is not None and self.intents.matches(order))
+        self._conversation = False
+        self.partial_hits = 0       # finals served by a partial decode
+        self.partial_misses = 0     # finals that still needed a full decode
 
     def _new_capture(self) -> UtteranceCapture:
         import webrtcvad
         vad = webrtcvad.Vad(self.tuning.vad_aggressiveness)
+        self._endpointer = None
+        if ENDPOINT_ADAPTIVE:
+            commands = COMPLETE_COMMANDS + (self.intents.patterns if self.intents else [])
+            self._endpointer = Endpointer(ENDPOINT_MIN_MS, ENDPOINT_BASE_MS, ENDPOINT_MAX_MS,
+                                          commands=commands)
+            return UtteranceCapture(vad, endpointer=self._endpointer)
         return UtteranceCapture(vad)
 
-    def _capture_and_handle(self, conversation: bool) -> None:
-        cap = self._new_capture()
-        cap.reset()
-        utterance = None
-        while self.running and utterance is None:
-            chunk = self.source.read(OWW_CHUNK)
-            self.hub.publish_audio(chunk)
-            utterance = cap.feed(chunk)
-        if utterance is None or len(utterance) < 16000 // 2:    # < 0.5s -> ignore
+    # ---- endpointing stage ----
+    def _on_endpoint_item(self, item) -> None:
+        if isinstance(item, _WakeMark):
+            self._cap = self._new_capture()
+            if STT_PARTIAL_MS > 0:
+                endpointer = self._endpointer
+                partials = IncrementalTranscriber(
+                    self.stt.transcribe, self.pool, STT_PARTIAL_MS,
+                    on_partial=lambda p: self._on_partial(p, endpointer, partials))
+                self._partials = partials
+            self._conversation = item.conversation
+            self._stable.reset()
+            return
+        if self._cap is None:
+            return
+        cap = self._cap
+        utterance = cap.feed(item)
+        if utterance is None:
+            if self._partials is not None and cap.started:
+                self._partials.update(cap.audio, cap.length, cap.speech_end)
+            return
+        if self._endpointer is not None:
+            log.info(f"[{self.room}] endpoint after {len(utterance) * 1000 // 16000} ms: "
+                     f"{self._endpointer.describe()}")
+        self._cap = None
+        with self._partial_lock:
+            # Partials still decoding belong to a finished utterance: no
+            # speculation may start once its order is on its way.
+            partials, self._partials = self._partials, None
+            self._stable.reset()
+        self._capturing.clear()
+        self._wake_reset.set()
+        if len(utterance) < 16000 // 2:    # < 0.5s -> ignore
             return
-        text = self.stt.transcribe(utterance)
-        _save_debug_audio(utterance, "utterance")
+        self.transcribe.put((utterance, self._conversation, partials, cap.speech_end,
+                             time.monotonic()))
+
+    def _on_partial(self, partial: Partial, endpointer: Endpointer | None,
+                    partials: IncrementalTranscriber) -> None:
+        with self._partial_lock:
+            if partials is self._partials:
+                self._on_current_partial(partial, endpointer)
+
+    def _on_current_partial(self, partial: Partial, endpointer: Endpointer | None) -> None:
+        log.debug(f"[{self.room}] partial: {partial.committed!r} + {partial.tentative!r}")
+        order = strip_trigger(f"{partial.committed} {partial.tentative}")
+        if endpointer is not None:
+            endpointer.set_partial(order, partial.audio_ms)
+        self.hub.publish_partial(partial.committed, partial.tentative, self.room)
+        if SPECULATIVE_DISPATCH and self.tuning.send_to_ai:
+            self._maybe_speculate(order)
+
+    def _maybe_speculate(self, order: str) -> None:
+        action = self._stable.update(order, time.monotonic())
+        if action == "cancel":
+            self.responder.cancel_speculation(self.room, "partial changed")
+        elif action == "speculate":
+            self.responder.speculate(order, reset_convo=not self._conversation, room=self.room)
+
+    # ---- STT stage ----
+    def _on_utterance(self, item) -> None:
+        utterance, conversation, partials, speech_end, endpoint_at = item
+        if partials is None:
+            text = self.pool.run(self.stt.transcribe, utterance)
+        else:
+            text = partials.finish(utterance, speech_end)
+            self.partial_hits += partials.reused
+            self.partial_misses += partials.decoded
+        speaking = self.responder.speaking
+        kind, intent = route(text, self.intents if self.tuning.send_to_ai else None, self.room,
+                             speaking=speaking)
+        if kind == "intent" and speaking and is_stop_command(text):
+            self.responder.stop()               # "arrête la musique" over a reply: stop both
+        if kind == "intent" and self._run_intent(intent, endpoint_at):
+            self._record(utterance, text)
+            return
+        _save_debug_audio(utterance, f"utterance_{self.room}")
         if not text.strip():
-            log.info("empty transcription - ignored")
+            log.info(f"[{self.room}] empty transcription - ignored")
+            self.responder.cancel_speculation(self.room, "empty transcript")
             return
         wav_url = self._save_wake_wav(utterance)
-        self.hub.record_wake(self.tuning.threshold, text, wav_url)
-        lowered = text.strip().lower()
-        if any(lowered == w or lowered.startswith(w) for w in STOP_WORDS):
-            log.info(f"stop-word utterance: {text!r}")
+        self.hub.record_wake(self.tuning.threshold, text, wav_url, self.room)
+        if kind == "stop":
+            log.info(f"[{self.room}] stop-word utterance: {text!r}")
+            self.responder.stop()
             return
         clean = strip_trigger(text)
         if not self.tuning.send_to_ai:
-            log.info(f"send_to_ai OFF — dry-run, not forwarding: {clean!r}")
+            log.info(f"[{self.room}] send_to_ai OFF — dry-run, not forwarding: {clean!r}")
+            self.responder.cancel_speculation(self.room, "send_to_ai off")
             return
-        _post_order(clean, reset_convo=not conversation)
+        self.responder.submit(clean, reset_convo=not conversation, room=self.room)
+
+    def _run_intent(self, intent, endpoint_at: float) -> bool:
+        """Execute a matched local intent; False sends the order on to the LLM."""
+        self.responder.cancel_speculation(self.room, f"local intent {intent.name}")
+        if not self.executor.execute(intent):
+            log.info(f"[{self.room}] intent {intent.name} failed — falling back to the LLM")
+            return False
+        log.info(f"[{self.room}] intent {intent.name} done "
+                 f"{(time.monotonic() - endpoint_at) * 1000:.0f} ms after end of speech")
+        if intent.reply:
+            self.responder.say(intent.reply, self.room)
+        return True
+
+    def _record(self, utterance: np.ndarray, text: str) -> None:
+        _save_debug_audio(utterance, f"utterance_{self.room}")
+        self.hub.record_wake(self.tuning.threshold, text, self._save_wake_wav(utterance), self.room)
 
     def _save_wake_wav(self, pcm: np.ndarray) -> str:
         import wave, time
         os.makedirs(_WAKE_WAV_DIR, exist_ok=True)
-        name = f"wake-{int(time.time()*1000)}.wav"
+        name = f"wake-{self.room}-{int(time.time()*1000)}.wav"
         with wave.open(os.path.join(_WAKE_WAV_DIR, name), "wb") as w:
             w.setnchannels(1); w.setsampwidth(2); w.setframerate(16000)
             w.writeframes(pcm.tobytes())
         return f"/voice-debug/wakes/{name}"
 
+    # ---- wake stage ----
     def run(self) -> None:
         self.running = True
-        self.source.start()
+        self.endpoint.start()
+        self.transcribe.start()
         hot = 0
-        log.info("Voice pipeline listening (UDP audio -> OWW -> VAD -> Whisper)")
+        log.info(f"[{self.room}] Voice pipeline listening (UDP audio -> OWW -> VAD -> Whisper)")
         while self.running:
-            chunk = self.source.read(OWW_CHUNK)
-            self.hub.publish_audio(chunk)
+            chunk = self.source.read(OWW_CHUNK, copy=False)
+            self.hub.publish_audio(chunk, self.room)
+            if self._capturing.is_set():
+                self.endpoint.put(chunk.copy())     # the ring view won't outlive the queue
+                continue
+            if self._wake_reset.is_set():
+                self._wake_reset.clear()
+                self.wake.reset()
+                hot = 0
             in_convo = time.time() < _conversation_mode_until
             score = self.wake.score(chunk)
-            self.hub.publish_score(score)
+            self.hub.publish_score(score, self.room)
             hot = hot + 1 if score >= self.tuning.threshold else 0
             if hot >= WAKE_PATIENCE or in_convo:
                 hot = 0
                 if not in_convo:
-                    play_chime()
-                    log.info(f"wake fired (score={score:.3f})")
-                self._capture_and_handle(conversation=in_convo)
-                self.wake.reset()
+                    log.info(f"[{self.room}] wake fired (score={score:.3f})")
+                    # Don't cut the answer being spoken: the command just queues.
+                    if not self.responder.speaking:
+                        play_chime()
+                self._capturing.set()
+                self.endpoint.put(_WakeMark(in_convo))
 
     def stop(self) -> None:
         self.running = False
+        self.endpoint.stop()
+        self.transcribe.stop()
+
+    def stats(self) -> dict:
+        return {"lag_samples": self.source.lag_samples, "wake_gate": self.wake.stats(),
+                "endpoint": self.endpoint.stats(), "stt": self.transcribe.stats(),
+                "partial_hits": self.partial_hits, "partial_misses": self.partial_misses}
+
+
+class VoiceServer:
+    """One UDP AudioSource demultiplexed into rooms, one VoicePipeline per room.
+
+    Whisper and the OpenWakeWord sessions are loaded once (by the boot, in
+    parallel with everything else): transcriptions from every room go through
+    a shared ModelPool, and each room's WakeDetector is a fork() of a single
+    template. UDP audio is accepted from the start; a room's pipeline starts
+    consuming it once both models are ready. Answers go through a single
+    Responder.
+    """
+
+    def __init__(self, boot: Boot, hub: DebugHub, tuning):
+        self.boot = boot                        # provides "stt" and "wake" once loaded
+        self.hub = hub
+        self.tuning = tuning
+        self.pool = ModelPool(STT_WORKERS, name="stt")
+        self.responder = Responder()
+        self.intents: IntentMatcher | None = None
+        self.executor: IntentExecutor | None = None
+        if INTENTS_ENABLED:
+            self.intents = IntentMatcher([*INTENT_ROOMS, *AUDIO_ROOMS.values()],
+                                         load_grammar(_INTENTS_PATH))
+            self.executor = IntentExecutor(YUI_TOOLS_URL, BEARER_TOKEN)
+        self.pipelines: dict[str, VoicePipeline] = {}
+        self.running = False
+        self.source = AudioSource(AUDIO_UDP_PORT, get_gain=lambda: self.tuning.gain,
+                                  capacity_s=AUDIO_RING_S, overflow=AUDIO_OVERFLOW,
+                                  jitter_depth=AUDIO_JITTER_DEPTH,
+                                  rooms=AUDIO_ROOMS, default_room=AUDIO_DEFAULT_ROOM,
+                                  on_new_stream=self._add_room)
+
+    @property
+    def stt(self):
+        return self.boot.get("stt")
+
+    def _add_room(self, stream: AudioStream) -> None:
+        # Called from the UDP thread: bring the room up without blocking it.
+        threading.Thread(target=self._run_room, args=(stream,), name=f"wake-{stream.room}",
+                         daemon=True).start()
+
+    def _run_room(self, stream: AudioStream) -> None:
+        try:
+            stt, wake = self.boot.wait("stt"), self.boot.wait("wake")
+        except RuntimeError as e:
+            log.error(f"room '{stream.room}' not started: {e}")
+            return
+        pipeline = VoicePipeline(stt, self.hub, self.tuning, stream,
+                                 wake.fork(), self.pool, self.responder, room=stream.room,
+                                 intents=self.intents, executor=self.executor)
+        self.pipelines[stream.room] = pipeline
+        log.info(f"room '{stream.room}' online ({len(self.pipelines)} room(s))")
+        pipeline.run()
+
+    def start(self) -> None:
+        self.running = True
+        self.responder.start()
+        # Rooms from AUDIO_ROOMS come up immediately; others on first audio.
+        for room in dict.fromkeys([AUDIO_DEFAULT_ROOM, *AUDIO_ROOMS.values()]):
+            self.source.stream(room)
+        self.source.start()
+        threading.Thread(target=self._stats_loop, name="voice-stats", daemon=True).start()
+
+    def stats(self) -> dict:
+        return {
+            "rooms": {room: p.stats() for room, p in list(self.pipelines.items())},
+            **self.responder.stats(),
+            "stt_pool": self.pool.stats(),
+            **({"stt_cascade": self.stt.stats()} if isinstance(self.stt, CascadeSTT) else {}),
+            "boot": self.boot.report(),
+            **({"intents": {**self.intents.stats(), "actions": self.executor.stats()}}
+               if self.intents is not None else {}),
+        }
+
+    def _stats_loop(self) -> None:
+        while self.running:
+            time.sleep(STATS_LOG_S)
+            stats = self.stats()
+            log.info(f"pipeline stages: {stats}")
+            self.hub.publish_stats(stats)
+
+    def stop(self) -> None:
+        self.running = False
+        for pipeline in self.pipelines.values():
+            pipeline.stop()
         self.source.stop()
+        self.pool.shutdown()
 
 
 def main() -> None:
@@ -369,6 +798,9 @@ def main() -> None:
     parser.add_argument("--whisper-model", default=os.getenv("WHISPER_MODEL", "distil-large-v3-fr"))
     parser.add_argument("--whisper-device", default=os.getenv("WHISPER_DEVICE", "cuda"))
     parser.add_argument("--whisper-compute", default=os.getenv("WHISPER_COMPUTE_TYPE", "float16"))
+    parser.add_argument("--fast-model", default=os.getenv("WHISPER_FAST_MODEL", ""),
+                        help="small first-tier model; empty = large model only")
+    parser.add_argument("--fast-compute", default=os.getenv("WHISPER_FAST_COMPUTE_TYPE", "int8_float16"))
     args = parser.parse_args()
 
     tuning = load_tuning(_TUNING_PATH)
@@ -376,16 +808,36 @@ def main() -> None:
     def on_tuning_change() -> None:
         save_tuning(tuning, _TUNING_PATH)
 
-    hub = DebugHub(tuning, on_tuning_change, DEBUG_WS_PORT)
-    stt = WhisperSTT(args.whisper_model, args.whisper_device, args.whisper_compute)
-    pipeline = VoicePipeline(stt, hub, tuning)
-
-    t = threading.Thread(target=pipeline.run, daemon=True)
-    t.start()
+    def load_stt():
+        stt = WhisperSTT(args.whisper_model, args.whisper_device, args.whisper_compute)
+        if not args.fast_model:
+            return stt
+        fast = WhisperSTT(args.fast_model, args.whisper_device, args.fast_compute,
+                          beam_size=1, best_of=1)
+        vocabulary = {*COMMAND_VOCABULARY, TRIGGER_WORD.lower(), *AUDIO_ROOMS.values(),
+                      *re.findall(r"[\w']+", WhisperSTT.INITIAL_PROMPT.lower())}
+        return CascadeSTT(fast, stt, STT_CASCADE_MIN_LOGPROB, STT_CASCADE_MAX_NO_SPEECH,
+                          STT_CASCADE_MIN_VOCAB, vocabulary)
+
+    # Every subsystem loads in parallel; rooms start listening once stt and
+    # wake are up. GET :READY_PORT/ready reports progress and timings.
+    boot = Boot()
+    boot.add("stt", load_stt, warmup=lambda stt: stt.warmup())
+    boot.add("wake", lambda: WakeDetector(_wake_model_path()), warmup=lambda w: w.warmup())
+    boot.add("http", start_http)
+    boot.add("cast", start_cast, required=False)
+    boot.add("chimes", load_chimes, required=False)
+    serve_ready(boot, READY_PORT)
+    boot.start()
+
+    hub = DebugHub(tuning, on_tuning_change, DEBUG_WS_PORT, default_room=AUDIO_DEFAULT_ROOM)
+    server = VoiceServer(boot, hub, tuning)
+
+    server.start()
     try:
         asyncio.run(hub.serve())
     except KeyboardInterrupt:
-        pipeline.stop()
+        server.stop()
 
 
 if __name__ == "__main__":
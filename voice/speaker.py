@@ -2,10 +2,11 @@
 Optional speaker verification via resemblyzer.
 
 Fails open: if resemblyzer is not installed or the reference WAV is missing,
-is_user_voice() always returns True.
+is_user_voice() always returns True. The encoder is loaded on first use.
 """
 import logging
 import os
+import threading
 
 import numpy as np
 
@@ -15,34 +16,49 @@ log = logging.getLogger("voice")
 
 _encoder = None
 _user_embedding = None
+_loaded = False
+_load_lock = threading.Lock()
 
-try:
-    from resemblyzer import VoiceEncoder
-    from resemblyzer import preprocess_wav as _preprocess
-
-    _encoder = VoiceEncoder()
-    _ref_path = os.path.realpath(SPEAKER_REF_WAV)
-    if os.path.exists(_ref_path):
-        _user_embedding = _encoder.embed_utterance(_preprocess(_ref_path))
-        log.info(
-            f"Speaker verification: ON "
-            f"(ref={_ref_path}, threshold={SPEAKER_SIMILARITY_THRESH})"
-        )
-    else:
-        log.info(
-            f"Speaker verification: OFF "
-            f"(reference not found at {_ref_path} — run: npm run record-voice)"
-        )
-except ImportError:
-    log.info(
-        "Speaker verification: OFF "
-        "(resemblyzer not installed — pip install resemblyzer --break-system-packages)"
-    )
+
+def load() -> bool:
+    """Load the encoder and the reference embedding (once); True if verifying.
+
+    Called on first use rather than at import, so importing this module is
+    free; call it at startup to pay the cost up front.
+    """
+    global _encoder, _user_embedding, _loaded
+    with _load_lock:
+        if _loaded:
+            return _user_embedding is not None
+        _loaded = True
+        try:
+            from resemblyzer import VoiceEncoder
+            from resemblyzer import preprocess_wav as _preprocess
+        except ImportError:
+            log.info(
+                "Speaker verification: OFF "
+                "(resemblyzer not installed — pip install resemblyzer --break-system-packages)"
+            )
+            return False
+        _encoder = VoiceEncoder()
+        _ref_path = os.path.realpath(SPEAKER_REF_WAV)
+        if os.path.exists(_ref_path):
+            _user_embedding = _encoder.embed_utterance(_preprocess(_ref_path))
+            log.info(
+                f"Speaker verification: ON "
+                f"(ref={_ref_path}, threshold={SPEAKER_SIMILARITY_THRESH})"
+            )
+        else:
+            log.info(
+                f"Speaker verification: OFF "
+                f"(reference not found at {_ref_path} — run: npm run record-voice)"
+            )
+        return _user_embedding is not None
 
 
 def is_user_voice(audio_16k: np.ndarray) -> bool:
     """Return True if the audio matches the registered user's voice embedding."""
-    if _encoder is None or _user_embedding is None:
+    if not load():
         return True
     try:
         sim = float(np.dot(_encoder.embed_utterance(audio_16k), _user_embedding))
@@ -0,0 +1,164 @@
+"""Speculative orchestrator dispatch on stable partial transcripts.
+
+Once a room's partial transcript has been stable for ``stable_ms`` before
+the endpoint (``StablePartial``), the orchestrator request is opened early
+and its answer tokens are buffered (``Speculation``). The final transcript
+then claims it: a hit plays the buffered answer, a miss cancels it and the
+order is sent again. Stop words and local intents are never speculated,
+they are handled without the orchestrator.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import re
+import threading
+import time
+from typing import Callable, Iterator, Optional
+
+from text_utils import is_stop_command
+
+log = logging.getLogger("voice")
+
+# fetch(text, reset_convo, stop_event) -> answer tokens, e.g. server._sse_tokens
+Fetch = Callable[[str, bool, threading.Event], Iterator[str]]
+
+
+def same_order(a: str, b: str) -> bool:
+    """Transcripts that send the same order (case/punctuation-blind)."""
+    return re.sub(r"[^\w']+", " ", a.lower()).split() == re.sub(r"[^\w']+", " ", b.lower()).split()
+
+
+class Speculation:
+    """An orchestrator request opened on a stable partial transcript.
+
+    The answer tokens are buffered on a background thread until the final
+    transcript confirms the order (``Responder.submit`` then plays them) or
+    the speculation is cancelled, which closes the request.
+    """
+
+    def __init__(self, text: str, reset_convo: bool, room: str, fetch: Fetch):
+        self.text = text
+        self.reset_convo = reset_convo
+        self.room = room
+        self.started = time.monotonic()
+        self.cancelled = threading.Event()
+        self._fetch = fetch
+        self._tokens: queue.Queue = queue.Queue()
+        threading.Thread(target=self._run, name=f"speculate-{room}", daemon=True).start()
+
+    def _run(self) -> None:
+        try:
+            for token in self._fetch(self.text, self.reset_convo, self.cancelled):
+                self._tokens.put(token)
+        except Exception as e:
+            self._tokens.put(e)
+        finally:
+            self._tokens.put(None)
+
+    def tokens(self, stop_event: threading.Event):
+        """Buffered tokens, then the rest as they stream in."""
+        while True:
+            item = self._tokens.get()
+            if item is None:
+                return
+            if isinstance(item, Exception):
+                raise item
+            if stop_event.is_set():
+                self.cancel()
+                return
+            yield item
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+
+class Speculations:
+    """The open speculation of each room, and hit/miss/cancel counters."""
+
+    def __init__(self, fetch: Fetch):
+        self._fetch = fetch
+        self._lock = threading.Lock()
+        self._open: dict[str, Speculation] = {}     # room -> open speculation
+        self.hits = 0           # final transcript matched: answer already streaming
+        self.misses = 0         # final transcript differed: request re-issued
+        self.cancels = 0        # partial changed / stop / nothing sent before the endpoint
+
+    def open(self, text: str, reset_convo: bool, room: str) -> bool:
+        """Open the request for ``text`` unless the same order is already
+        open; replaces (cancels) the room's previous speculation."""
+        with self._lock:
+            current = self._open.get(room)
+            if current is not None:
+                if same_order(current.text, text):
+                    return False
+                current.cancel()
+                self.cancels += 1
+            self._open[room] = Speculation(text, reset_convo, room, self._fetch)
+        log.info(f"[{room}] speculative dispatch: {text!r}")
+        return True
+
+    def cancel(self, room: str, reason: str) -> None:
+        with self._lock:
+            spec = self._open.pop(room, None)
+            if spec is None:
+                return
+            spec.cancel()
+            self.cancels += 1
+        log.info(f"[{room}] speculation cancelled ({reason}): {spec.text!r}")
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            for spec in self._open.values():
+                spec.cancel()
+            self.cancels += len(self._open)
+            self._open.clear()
+
+    def claim(self, text: str, reset_convo: bool, room: str) -> Optional[Speculation]:
+        """The room's speculation if it sent ``text``; otherwise it is cancelled."""
+        with self._lock:
+            spec = self._open.pop(room, None)
+            if spec is None:
+                return None
+            if same_order(spec.text, text) and spec.reset_convo == reset_convo:
+                self.hits += 1
+                ahead = time.monotonic() - spec.started
+                log.info(f"[{room}] speculation hit ({ahead * 1000:.0f} ms ahead): {text!r}")
+                return spec
+            spec.cancel()
+            self.misses += 1
+        log.info(f"[{room}] speculation miss: {spec.text!r} != {text!r}")
+        return None
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "cancels": self.cancels}
+
+
+class StablePartial:
+    """One room's latest partial order, and when it last changed.
+
+    ``is_local(order)`` tells orders handled without the orchestrator
+    (local intents); they, and stop words, are never speculated.
+    """
+
+    def __init__(self, stable_ms: int, is_local: Callable[[str], bool] = lambda order: False):
+        self.stable_ms = stable_ms
+        self.is_local = is_local
+        self.text = ""
+        self.since = 0.0
+
+    def reset(self) -> None:
+        self.text, self.since = "", 0.0
+
+    def update(self, order: str, now: float) -> Optional[str]:
+        """"speculate" once ``order`` has been stable for ``stable_ms``,
+        "cancel" when it replaces a different order, else None."""
+        if is_stop_command(order) or self.is_local(order):
+            return None
+        if not order or not same_order(order, self.text):
+            changed = bool(self.text)
+            self.text, self.since = order, now
+            return "cancel" if changed else None
+        if now - self.since >= self.stable_ms / 1000:
+            return "speculate"
+        return None
@@ -0,0 +1,133 @@
+"""Pipeline stages: a worker thread draining a bounded queue.
+
+The voice pipeline is a chain of these (endpointing → STT → dialogue/TTS →
+playback), so a slow stage only backs up its own queue and wake detection
+keeps running in real time upstream.
+"""
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+from typing import Any, Callable
+
+log = logging.getLogger("voice")
+
+
+class Stage:
+    """Runs ``handler(item)`` for each queued item on its own thread.
+
+    ``put()`` never blocks by default: when the queue is full the oldest item
+    is dropped (``drop_oldest=True``, for real-time feeds) or the new one is
+    rejected. ``put(block=True)`` applies back-pressure instead. Items for
+    which ``keep(item)`` is true (control markers in a feed) are never
+    dropped: the oldest other item goes instead. When only markers are
+    queued, a new marker replaces the newest one (consecutive markers
+    coalesce) and any other new item is rejected.
+    """
+
+    def __init__(self, name: str, handler: Callable[[Any], None], maxsize: int = 4,
+                 drop_oldest: bool = False, keep: Callable[[Any], bool] | None = None):
+        self.name = name
+        self._handler = handler
+        self._queue: queue.Queue = queue.Queue(maxsize=maxsize)
+        self._drop_oldest = drop_oldest
+        self._keep = keep
+        self._running = False
+        self._busy = False
+        self._thread: threading.Thread | None = None
+        self.processed = 0
+        self.dropped = 0
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    @property
+    def busy(self) -> bool:
+        """True while the handler is running or items are waiting."""
+        return self._busy or not self._queue.empty()
+
+    def put(self, item: Any, block: bool = False, timeout: float | None = None) -> bool:
+        if block:
+            try:
+                self._queue.put(item, timeout=timeout)
+                return True
+            except queue.Full:
+                return False
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return True
+            except queue.Full:
+                if self._drop_oldest and self._drop_one():
+                    continue
+                if self._keep is not None and self._keep(item):
+                    if self._replace_newest(item):
+                        return True
+                    if not self._queue.full():
+                        continue                    # drained meanwhile
+                self.dropped += 1
+                if not self._drop_oldest:
+                    log.warning(f"stage {self.name}: queue full — dropping new item")
+                return False
+
+    def _drop_one(self) -> bool:
+        """Drop the oldest waiting item that may be dropped; False if none."""
+        with self._queue.mutex:
+            waiting = self._queue.queue
+            for i, queued in enumerate(waiting):
+                if self._keep is None or not self._keep(queued):
+                    del waiting[i]
+                    self._queue.not_full.notify()
+                    self.dropped += 1
+                    return True
+        return False
+
+    def _replace_newest(self, item: Any) -> bool:
+        """Put ``item`` in place of the newest waiting item if that one is kept
+        too; False otherwise."""
+        with self._queue.mutex:
+            waiting = self._queue.queue
+            if not waiting or not self._keep(waiting[-1]):
+                return False
+            waiting[-1] = item
+            self.dropped += 1
+            return True
+
+    def clear(self) -> int:
+        """Discard every waiting item; returns how many were dropped."""
+        n = 0
+        while True:
+            try:
+                self._queue.get_nowait()
+                n += 1
+            except queue.Empty:
+                return n
+
+    def start(self) -> None:
+        self._running = True
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._running = False
+
+    def _loop(self) -> None:
+        while self._running:
+            try:
+                item = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            self._busy = True
+            try:
+                self._handler(item)
+            except Exception as e:
+                log.exception(f"stage {self.name}: handler error: {e}")
+            finally:
+                self._busy = False
+                self.processed += 1
+
+    def stats(self) -> dict:
+        return {"depth": self.depth, "busy": self._busy,
+                "processed": self.processed, "dropped": self.dropped}
@@ -0,0 +1,160 @@
+"""Incremental transcription of the utterance being captured.
+
+While ``UtteranceCapture`` is still collecting speech, the growing utterance
+is re-decoded every ``interval_ms`` on the shared ``ModelPool``. Successive
+hypotheses are reconciled by local agreement: a word is *committed* once two
+consecutive decodes agree on it, and committed words never change between
+updates; only the tail after them is tentative.
+
+At the endpoint, the last decode usually already covers every voiced frame
+(the trailing silence is all that was added since), so its text is the final
+transcript and no decode is left to run after the user stops talking.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, NamedTuple, Optional
+
+import numpy as np
+
+log = logging.getLogger("voice")
+
+_WORD_NORM = re.compile(r"[^\w']+")
+
+
+class Partial(NamedTuple):
+    committed: str          # stable: never retracted by later updates
+    tentative: str          # may still change
+    audio_ms: int           # utterance length this hypothesis covers
+
+
+def _norm(word: str) -> str:
+    return _WORD_NORM.sub("", word.lower())
+
+
+def _agreed(a: list[str], b: list[str]) -> int:
+    """Number of leading words two hypotheses agree on (case/punctuation-blind)."""
+    n = 0
+    for x, y in zip(a, b):
+        if _norm(x) != _norm(y):
+            break
+        n += 1
+    return n
+
+
+class IncrementalTranscriber:
+    """Re-decodes one utterance as it grows (one instance per utterance).
+
+    ``transcribe`` is the blocking STT call (``WhisperSTT.transcribe``); jobs
+    go through ``pool`` so partials share the model with every other room. At
+    most one partial decode is in flight per utterance.
+    """
+
+    def __init__(self, transcribe: Callable[[np.ndarray], str], pool,
+                 interval_ms: int = 400, min_ms: int = 500, sample_rate: int = 16000,
+                 on_partial: Optional[Callable[[Partial], None]] = None):
+        self._transcribe = transcribe
+        self._pool = pool
+        self._interval = sample_rate * interval_ms // 1000
+        self._min = sample_rate * min_ms // 1000
+        self._rate = sample_rate
+        self._on_partial = on_partial
+        self._lock = threading.Lock()
+        self._idle = threading.Event()          # no partial decode in flight
+        self._idle.set()
+        self._inflight_len = 0                  # samples of the decode in flight, 0 if none
+        self._submitted_len = 0
+        self._hyp: list[str] = []               # latest hypothesis
+        self._hyp_len = 0                       # samples it covers
+        self._committed: list[str] = []
+        self._text = ""                         # raw text of the latest decode
+        self.reused = 0                         # 1 once the final came from a partial
+        self.decoded = 0                        # 1 once the final needed its own decode
+
+    @property
+    def partial(self) -> Partial:
+        with self._lock:
+            return self._partial()
+
+    def _partial(self) -> Partial:
+        n = len(self._committed)
+        return Partial(" ".join(self._committed), " ".join(self._hyp[n:]),
+                       self._hyp_len * 1000 // self._rate)
+
+    def update(self, audio: Callable[[], np.ndarray], length: int,
+               speech_end: Optional[int] = None) -> bool:
+        """Start a partial decode if ``interval_ms`` of new audio arrived.
+
+        ``audio`` builds the utterance so far (only called when a decode is
+        due); ``length`` is its current size in samples. Passing
+        ``speech_end`` decodes right away once a pause starts that no decode
+        covers yet, so the endpointer sees the whole phrase early. Returns
+        True when a decode was submitted.
+        """
+        with self._lock:
+            if self._inflight_len or length < self._min:
+                return False
+            pause = speech_end is not None and self._submitted_len < speech_end < length
+            if length - self._submitted_len < self._interval and not pause:
+                return False
+            self._submitted_len = self._inflight_len = length
+            self._idle.clear()
+        pcm = np.array(audio()[:length], dtype=np.int16, copy=True)
+        fut = self._pool.submit(self._transcribe, pcm)
+        fut.add_done_callback(lambda f: self._on_done(f, length))
+        return True
+
+    def _on_done(self, fut: Future, n: int) -> None:
+        try:
+            text = fut.result()
+        except Exception as e:
+            log.warning(f"partial STT failed: {e}")
+            text = None
+        partial = None
+        try:
+            if text is None:
+                return
+            with self._lock:
+                words = text.split()
+                keep = _agreed(self._hyp, words)
+                if keep > len(self._committed):
+                    self._committed = self._hyp[:keep]
+                # Committed words stay as first agreed; the new tail follows them.
+                self._hyp = self._committed + words[len(self._committed):]
+                self._text = text
+                self._hyp_len = n
+                partial = self._partial()
+            if self._on_partial is not None:
+                self._on_partial(partial)
+        finally:
+            # Idle only once the callback has returned: finish() waiting on
+            # this decode must not race its partial.
+            with self._lock:
+                self._inflight_len = 0
+                self._idle.set()
+
+    def finish(self, utterance: np.ndarray, speech_end: int) -> str:
+        """Final transcript of ``utterance``.
+
+        Reuses the latest partial when it covers every sample up to
+        ``speech_end`` (past that there is only trailing silence), waiting
+        for an in-flight decode if that one does; otherwise decodes now.
+        """
+        t0 = time.monotonic()
+        with self._lock:
+            pending = self._inflight_len >= max(speech_end, 1)
+        if pending:
+            self._idle.wait()
+        with self._lock:
+            covered = self._hyp_len >= speech_end and self._hyp_len > 0
+            text = self._text
+        if covered:
+            self.reused += 1
+            log.info(f"final transcript from partial in {(time.monotonic() - t0) * 1000:.0f} ms")
+            return text
+        self.decoded += 1
+        return self._pool.run(self._transcribe, utterance)
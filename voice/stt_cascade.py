@@ -0,0 +1,153 @@
+"""Two-tier STT: a small fast model first, the large one only when unsure.
+
+Most utterances are short home-automation commands that a small (or int8)
+Whisper gets right. ``CascadeSTT`` accepts the fast tier's transcript when
+its decoder was confident (mean segment log-prob, no-speech probability)
+and its words are in the known command vocabulary; anything else is
+re-transcribed by the accurate tier. Per-tier hit rates and latencies, and
+the escalation rate, are kept for tuning the thresholds.
+"""
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+log = logging.getLogger("voice")
+
+# Words expected in commands, besides the ones in the STT prompt.
+COMMAND_VOCABULARY = """
+le la les l' un une des du de d' au aux à et ou en sur dans pour avec tout toute
+toutes tous mon ma mes ce cette il elle est c'est fait quel quelle heure temps
+s'il te plaît merci oui non plus moins fort doucement encore
+allume allumer éteins éteindre ouvre ouvrir ferme fermer baisse baisser monte
+monter mets mettre règle régler lance lancer joue jouer coupe couper arrête
+arrêter reprends reprendre suivant suivante précédent précédente pause stop
+lumière lumières lampe lampes salon cuisine chambre bureau couloir salle bain
+entrée jardin garage maison télé télévision musique radio volume son scène
+minuteur minute minutes seconde secondes heure heures réveil rappel alarme
+volets volet porte serrure chauffage température degrés météo demain
+aujourd'hui ce soir matin
+zéro un deux trois quatre cinq six sept huit neuf dix vingt trente quarante
+cinquante soixante cent pour cent %
+""".split()
+
+_WORD = re.compile(r"[\w'%]+")
+_ELISION = re.compile(r"(?:qu|[cdjlmnst])'")      # l'entrée, d'accord, qu'il
+
+
+class Transcript(NamedTuple):
+    text: str
+    avg_logprob: float = 0.0        # duration-weighted mean over segments
+    no_speech_prob: float = 0.0     # worst segment
+    skipped: bool = False           # silence gate: no decode was run
+
+
+def vocabulary_coverage(text: str, vocabulary: set[str]) -> float:
+    """Fraction of the words of ``text`` found in ``vocabulary``."""
+    words = [w for w in _WORD.findall(text.lower().replace("’", "'")) if not w.isdigit()]
+    if not words:
+        return 1.0
+    return sum(_known(w, vocabulary) for w in words) / len(words)
+
+
+def _known(word: str, vocabulary: set[str]) -> bool:
+    if word in vocabulary:                  # c'est, aujourd'hui
+        return True
+    elided = _ELISION.match(word)
+    return elided is not None and word[elided.end():] in vocabulary
+
+
+def _words(text: str) -> list[str]:
+    return _WORD.findall(text.lower().replace("’", "'"))
+
+
+class _Tier:
+    """Call counters of one tier. ``accepted`` counts the fast tier's
+    transcripts that were kept, and the accurate tier's that differed from
+    the fast one (an escalation that changed the result)."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.calls = 0
+        self.accepted = 0
+        self.total_s = 0.0
+
+    def stats(self) -> dict:
+        return {
+            "calls": self.calls,
+            "accepted": self.accepted,
+            "hit_rate": round(self.accepted / self.calls, 3) if self.calls else 0.0,
+            "avg_ms": round(1000 * self.total_s / self.calls, 1) if self.calls else 0.0,
+        }
+
+
+class CascadeSTT:
+    """Drop-in for ``WhisperSTT``: ``transcribe(audio) -> str``.
+
+    ``fast`` and ``accurate`` expose ``transcribe_scored(audio) -> Transcript``.
+    """
+
+    def __init__(self, fast, accurate, min_logprob: float = -0.6,
+                 max_no_speech: float = 0.4, min_vocab: float = 0.8,
+                 vocabulary: Optional[set[str]] = None):
+        self.fast = fast
+        self.accurate = accurate
+        self.min_logprob = min_logprob
+        self.max_no_speech = max_no_speech
+        self.min_vocab = min_vocab
+        self.vocabulary = set(vocabulary) if vocabulary is not None else set(COMMAND_VOCABULARY)
+        self._tiers = {"fast": _Tier("fast"), "accurate": _Tier("accurate")}
+        self.escalations: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def warmup(self) -> None:
+        self.fast.warmup()
+        self.accurate.warmup()
+
+    def _run(self, tier: str, model, audio: np.ndarray) -> Transcript:
+        t0 = time.monotonic()
+        result = model.transcribe_scored(audio)
+        with self._lock:
+            stats = self._tiers[tier]
+            stats.calls += 1
+            stats.total_s += time.monotonic() - t0
+        return result
+
+    def _escalation_reason(self, result: Transcript) -> Optional[str]:
+        if not result.text:
+            return "empty"
+        if result.no_speech_prob > self.max_no_speech:
+            return "no_speech"
+        if result.avg_logprob < self.min_logprob:
+            return "low_logprob"
+        if vocabulary_coverage(result.text, self.vocabulary) < self.min_vocab:
+            return "out_of_vocabulary"
+        return None
+
+    def transcribe(self, audio_int16: np.ndarray) -> str:
+        first = self._run("fast", self.fast, audio_int16)
+        reason = None if first.skipped else self._escalation_reason(first)
+        if reason is None:
+            with self._lock:
+                self._tiers["fast"].accepted += 1
+            return first.text
+        log.info(f"STT cascade: escalating ({reason}, logprob={first.avg_logprob:.2f}, "
+                 f"no_speech={first.no_speech_prob:.2f}): {first.text!r}")
+        second = self._run("accurate", self.accurate, audio_int16)
+        with self._lock:
+            self.escalations[reason] = self.escalations.get(reason, 0) + 1
+            if _words(second.text) != _words(first.text):
+                self._tiers["accurate"].accepted += 1
+        return second.text
+
+    def stats(self) -> dict:
+        with self._lock:
+            fast, accurate = self._tiers["fast"], self._tiers["accurate"]
+            return {**{name: t.stats() for name, t in self._tiers.items()},
+                    "escalation_rate": round(accurate.calls / fast.calls, 3) if fast.calls else 0.0,
+                    "escalations": dict(self.escalations)}
@@ -1,4 +1,5 @@
 import numpy as np
+import pytest
 from audio_source import AudioSource
 
 def test_push_then_read_returns_samples():
@@ -27,3 +28,157 @@ def test_read_blocks_until_enough():
     src._push(np.ones(1280, dtype=np.int16).tobytes())
     t.join(timeout=2)
     assert len(result["data"]) == 1280
+
+def test_ring_drop_oldest_keeps_newest_and_counts_drops():
+    src = AudioSource(port=0, get_gain=lambda: 1.0, capacity_s=0.1)   # 1600 samples
+    src._push(np.arange(1000, dtype=np.int16).tobytes())
+    src._push(np.arange(1000, 2000, dtype=np.int16).tobytes())
+    assert src.lag_samples == 1600
+    assert src.dropped_samples == 400
+    out = src.read(1600)
+    assert out[0] == 400 and out[-1] == 1999
+
+def test_ring_skip_to_now_policy_discards_backlog():
+    src = AudioSource(port=0, get_gain=lambda: 1.0, capacity_s=0.1, overflow="skip_to_now")
+    src._push(np.arange(1000, dtype=np.int16).tobytes())
+    src._push(np.arange(1000, 2000, dtype=np.int16).tobytes())
+    assert src.lag_samples == 1000
+    assert src.dropped_samples == 1000
+    assert src.read(1000)[0] == 1000
+
+def test_skip_to_now_after_turn():
+    src = AudioSource(port=0, get_gain=lambda: 1.0)
+    src._push(np.arange(8000, dtype=np.int16).tobytes())
+    assert src.skip_to_now(keep_ms=50) == 7200
+    assert src.lag_samples == 800
+    assert src.read(800)[0] == 7200
+
+def test_read_wraps_around_ring():
+    src = AudioSource(port=0, get_gain=lambda: 1.0, capacity_s=0.1)
+    for start in range(0, 6400, 1280):
+        src._push(np.arange(start, start + 1280, dtype=np.int16).tobytes())
+        out = src.read(1280)
+        assert out[0] == start and out[-1] == start + 1279
+    assert src.dropped_samples == 0
+
+def test_read_view_is_read_only_and_copy_is_not():
+    src = AudioSource(port=0, get_gain=lambda: 1.0)
+    src._push(np.arange(2560, dtype=np.int16).tobytes())
+    view = src.read(1280, copy=False)
+    assert not view.flags.writeable and view[0] == 0
+    out = src.read(1280)
+    assert out.flags.writeable and out[0] == 1280
+
+def test_in_place_receive_spares_outstanding_views():
+    import socket
+    # 2.1 s ring: a full datagram fits in the free space, but the in-place
+    # landing zone would wrap onto the slots of the view being scored.
+    src = AudioSource(port=0, get_gain=lambda: 1.0, capacity_s=2.1)
+    src._push(np.arange(1280, dtype=np.int16).tobytes())
+    st = src.stream(src.default_room)
+    view = src.read(1280, copy=False)
+    ring = st._ring
+    assert ring.free * 2 >= 65536 and not ring.in_place_ok(32768)
+    landed = []
+    write_buffers = ring.write_buffers
+    ring.write_buffers = lambda n: landed.append(n) or write_buffers(n)
+    src._landing = st
+    src.start()
+    try:
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        tx.sendto(np.full(640, 7, dtype=np.int16).tobytes(), ("127.0.0.1", src._sock.getsockname()[1]))
+        tx.close()
+        assert np.all(src.read(640) == 7)
+    finally:
+        src.stop()
+    assert landed == [] and np.array_equal(view, np.arange(1280, dtype=np.int16))
+    big = AudioSource(port=0, get_gain=lambda: 1.0, capacity_s=10)
+    big._push(np.zeros(1280, dtype=np.int16).tobytes())
+    big.read(1280, copy=False)
+    assert big.stream(big.default_room)._ring.in_place_ok(32768)
+
+
+def test_udp_datagrams_land_in_ring():
+    import socket
+    src = AudioSource(port=0, get_gain=lambda: 1.0)
+    src.start()
+    try:
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        addr = ("127.0.0.1", src._sock.getsockname()[1])
+        for start in range(0, 3840, 640):
+            tx.sendto(np.arange(start, start + 640, dtype=np.int16).tobytes(), addr)
+        tx.close()
+        out = src.read(3840)
+        assert np.array_equal(out, np.arange(3840, dtype=np.int16))
+    finally:
+        src.stop()
+
+def test_framed_packets_are_reordered_and_legacy_still_accepted():
+    import time
+    from jitter_buffer import pack_header
+    src = AudioSource(port=0, get_gain=lambda: 1.0)
+    now_us = int(time.time() * 1e6)
+    def frame(seq):
+        pcm = np.arange(seq * 320, (seq + 1) * 320, dtype=np.int16)
+        return pack_header(1, seq, now_us + seq * 20_000) + pcm.tobytes()
+    for seq in (0, 2, 1, 3):
+        src._push(frame(seq))
+    out = src.read(1280)
+    assert np.array_equal(out, np.arange(1280, dtype=np.int16))
+    stats = src.stats()
+    assert stats["reordered"] == 1 and stats["lost"] == 0
+    assert stats["latency_ms"] is not None
+    src._push(np.full(320, 9, dtype=np.int16).tobytes())
+    assert src.read(320)[0] == 9 and src.stats()["legacy_packets"] == 1
+
+def test_udp_framed_and_legacy_datagrams():
+    import socket, time
+    from jitter_buffer import pack_header
+    src = AudioSource(port=0, get_gain=lambda: 1.0)
+    src.start()
+    try:
+        tx = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        addr = ("127.0.0.1", src._sock.getsockname()[1])
+        now_us = int(time.time() * 1e6)
+        for seq in (0, 1, 3, 2):
+            pcm = np.arange(seq * 320, (seq + 1) * 320, dtype=np.int16)
+            tx.sendto(pack_header(5, seq, now_us) + pcm.tobytes(), addr)
+            time.sleep(0.01)
+        tx.sendto(np.arange(1280, 1600, dtype=np.int16).tobytes(), addr)
+        tx.close()
+        out = src.read(1600)
+        assert np.array_equal(out, np.arange(1600, dtype=np.int16))
+        assert src.stats()["reordered"] == 1
+    finally:
+        src.stop()
+
+def test_demux_by_stream_id_and_sender_ip():
+    import time
+    from jitter_buffer import pack_header
+    seen = []
+    src = AudioSource(port=0, get_gain=lambda: 1.0, rooms={"2": "chambre", "10.0.0.42": "cuisine"},
+                      default_room="salon", on_new_stream=lambda st: seen.append(st.room))
+    now_us = int(time.time() * 1e6)
+    src._push(pack_header(2, 0, now_us) + np.full(320, 2, dtype=np.int16).tobytes())
+    src._push(np.full(320, 42, dtype=np.int16).tobytes(), sender_ip="10.0.0.42")
+    src._push(np.full(320, 7, dtype=np.int16).tobytes(), sender_ip="10.0.0.7")
+    assert seen == ["chambre", "cuisine", "salon"]
+    assert src.stream("chambre").read(320)[0] == 2
+    assert src.stream("cuisine").read(320)[0] == 42
+    assert src.read(320)[0] == 7
+    assert src.stream("chambre").lag_samples == 0
+
+def test_paused_stream_is_flushed_despite_other_traffic():
+    from jitter_buffer import pack_header
+    src = AudioSource(port=0, get_gain=lambda: 1.0, rooms={"1": "salon", "2": "cuisine"})
+    def frame(sid, seq):
+        return pack_header(sid, seq, seq * 20_000) + np.full(320, seq + 1, dtype=np.int16).tobytes()
+    # Both rooms stop with a hole (seq 1 lost); only the kitchen keeps sending.
+    for sid in (1, 2):
+        src._push(frame(sid, 0), arrival=10.0)
+        src._push(frame(sid, 2), arrival=10.02)
+    src._push(frame(2, 3), arrival=10.2)
+    salon, cuisine = src.stream("salon"), src.stream("cuisine")
+    assert cuisine._flush_if_idle(10.22) == pytest.approx(0.08)
+    assert salon._flush_if_idle(10.22) is None and not salon._jitter.holding
+    assert salon.lag_samples == 960 and cuisine.lag_samples == 320
@@ -0,0 +1,58 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from boot import Boot, serve_ready
+
+
+def test_subsystems_load_in_parallel_after_their_dependencies():
+    boot = Boot()
+    order = []
+    gate = threading.Event()
+    boot.add("slow", lambda: gate.wait(2) and "model", warmup=lambda r: order.append("warm"))
+    boot.add("fast", lambda: order.append("fast") or "http")
+    boot.add("rooms", lambda: order.append("rooms"), after=["slow"])
+    boot.start()
+    assert boot.wait("fast", 1) == "http"
+    assert boot.get("slow") is None and not boot.ready
+    gate.set()
+    assert boot.wait("slow", 1) == "model"
+    boot.wait("rooms", 1)
+    assert order == ["fast", "warm", "rooms"]
+    report = boot.report()
+    assert report["ready"]
+    assert report["subsystems"]["slow"]["warmup_ms"] is not None
+
+
+def test_failure_propagates_but_optional_ones_do_not_block_readiness():
+    boot = Boot()
+    boot.add("stt", lambda: 1)
+    boot.add("cast", lambda: 1 / 0, required=False)
+    boot.add("needs_cast", lambda: 2, after=["cast"], required=False)
+    boot.start()
+    with pytest.raises(RuntimeError):
+        boot.wait("needs_cast", 1)
+    boot.wait("stt", 1)
+    assert boot.ready
+    assert boot.report()["subsystems"]["cast"]["state"] == "failed"
+
+
+def test_ready_endpoint_reports_503_until_ready():
+    boot = Boot()
+    gate = threading.Event()
+    boot.add("stt", lambda: gate.wait(2))
+    server = serve_ready(boot, 0)
+    url = f"http://127.0.0.1:{server.server_address[1]}/ready"
+    boot.start()
+    with pytest.raises(urllib.error.HTTPError) as err:
+        urllib.request.urlopen(url, timeout=2)
+    assert err.value.code == 503
+    assert json.loads(err.value.read())["subsystems"]["stt"]["state"] in ("pending", "loading")
+    gate.set()
+    boot.wait("stt", 1)
+    with urllib.request.urlopen(url, timeout=2) as resp:
+        assert resp.status == 200 and json.loads(resp.read())["ready"]
+    server.shutdown()
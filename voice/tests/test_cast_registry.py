@@ -0,0 +1,28 @@
+import json
+
+from cast_registry import CastDevice, CastDiscovery, DeviceRegistry
+
+
+def test_registry_persists_and_reports_moves(tmp_path):
+    path = str(tmp_path / "cast-devices.json")
+    registry = DeviceRegistry(path)
+    salon = CastDevice("Salon", "10.0.0.20", 8009, "uuid-1", "Google Home", 1.0)
+    assert registry.update(salon)
+    assert not registry.update(salon._replace(seen=2.0))         # same address: no change
+    assert registry.update(salon._replace(host="10.0.0.31", seen=3.0))
+
+    reloaded = DeviceRegistry(path)
+    assert reloaded.get("salon").host == "10.0.0.31"
+    assert reloaded.get("salon").address == ("10.0.0.31", 8009, "uuid-1", "Google Home", "Salon")
+    assert reloaded.get("Cuisine") is None
+    assert len(json.load(open(path))["devices"]) == 1
+
+
+def test_discovery_notifies_every_announcement(tmp_path):
+    seen = []
+    discovery = CastDiscovery(DeviceRegistry(None), lambda d, changed: seen.append((d.host, changed)))
+    device = CastDevice("Salon", "10.0.0.20", uuid="u")
+    discovery.observe(device)
+    discovery.observe(device)
+    discovery.observe(device._replace(host="10.0.0.21"))
+    assert seen == [("10.0.0.20", True), ("10.0.0.20", False), ("10.0.0.21", True)]
@@ -0,0 +1,75 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from cast_tracker import PlaybackTracker
+
+
+def _status(url, state, idle_reason=None):
+    return SimpleNamespace(content_id=url, player_state=state, idle_reason=idle_reason)
+
+
+def test_idle_event_for_the_clip_ends_playback():
+    tracker = PlaybackTracker()
+    watch = tracker.expect("http://x/a.wav", duration_s=0.05)
+    tracker.new_media_status(_status("http://x/a.wav", "IDLE"))        # before load: ignored
+    tracker.new_media_status(_status("http://x/a.wav", "BUFFERING"))
+    tracker.new_media_status(_status("http://x/old.wav", "IDLE", "INTERRUPTED"))
+    assert not watch._done.is_set()
+
+    def finish():
+        time.sleep(0.1)
+        tracker.new_media_status(_status("http://x/a.wav", "IDLE", "FINISHED"))
+    threading.Thread(target=finish).start()
+    assert watch.wait(threading.Event(), timeout=2) == "finished"
+    assert watch.load_ms >= 0 and watch.end_lag_ms > 0
+    assert tracker.stats()["outcomes"] == {"finished": 1}
+
+
+def test_stop_is_served_without_waiting_for_the_device():
+    tracker = PlaybackTracker()
+    watch = tracker.expect("u", duration_s=30)
+    tracker.new_media_status(_status("u", "PLAYING"))
+    stop = threading.Event()
+
+    def stop_playback():
+        stop.set()
+        tracker.interrupt()
+    threading.Timer(0.05, stop_playback).start()
+    t0 = time.monotonic()
+    assert watch.wait(stop, timeout=30) == "stopped"
+    assert time.monotonic() - t0 < 0.5
+    # A late IDLE for the stopped clip changes nothing.
+    tracker.new_media_status(_status("u", "IDLE", "CANCELLED"))
+    assert tracker.stats()["outcomes"] == {"stopped": 1}
+
+
+def test_load_failure_and_timeout():
+    tracker = PlaybackTracker()
+    failed = tracker.expect("bad")
+    tracker.load_media_failed(1, 104)
+    assert failed.wait(threading.Event(), timeout=1) == "error"
+    silent = tracker.expect("lost")
+    assert silent.wait(threading.Event(), timeout=0.05) == "timeout"
+    stopped = threading.Event()
+    stopped.set()
+    assert tracker.expect("late").wait(stopped, timeout=30) == "stopped"   # set before the wait
+
+
+def test_live_stream_end_lag_uses_duration_known_at_close():
+    tracker = PlaybackTracker()
+    unknown = tracker.expect("live/1", duration_s=None)
+    tracker.new_media_status(_status("live/1", "PLAYING"))
+    tracker.new_media_status(_status("live/1", "IDLE", "FINISHED"))
+    assert unknown.wait(threading.Event(), timeout=1) == "finished"
+    assert unknown.end_lag_ms is None and tracker.stats()["avg_end_lag_ms"] == 0.0
+
+    live = tracker.expect("live/2", duration_s=None)
+    tracker.new_media_status(_status("live/2", "PLAYING"))
+    time.sleep(0.1)
+    live.duration_s = 0.1                   # set by finish_live_stream once closed
+    tracker.new_media_status(_status("live/2", "IDLE", "FINISHED"))
+    assert live.wait(threading.Event(), timeout=1) == "finished"
+    assert 0 <= live.end_lag_ms < 100
+    stats = tracker.stats()
+    assert stats["outcomes"] == {"finished": 2} and 0 <= stats["avg_end_lag_ms"] < 100
@@ -0,0 +1,37 @@
+import time
+
+from clip_store import ClipStore, byte_range
+
+
+def test_clips_do_not_overwrite_each_other():
+    store = ClipStore()
+    answer = store.put(b"RIFF answer", "audio/wav")
+    chime = store.put(b"RIFF chime", "audio/wav")
+    assert answer != chime
+    assert store.put(b"RIFF answer") == answer          # content-addressed
+    assert store.get(answer).data == b"RIFF answer"
+    assert store.get(chime).ext == "wav"
+    assert store.get("nope") is None
+    assert store.stats()["missing"] == 1
+
+
+def test_lru_and_ttl_eviction():
+    store = ClipStore(max_bytes=20, ttl_s=0.1)
+    a = store.put(b"a" * 10)
+    b = store.put(b"b" * 10)
+    store.get(a)                                        # b is now least recently used
+    c = store.put(b"c" * 10)
+    assert store.get(b) is None and store.get(a) and store.get(c)
+    time.sleep(0.15)
+    assert store.get(a) is None and store.stats()["clips"] == 0
+
+
+def test_byte_ranges():
+    assert byte_range(None, 100) is None
+    assert byte_range("bytes=0-", 100) == (0, 99)
+    assert byte_range("bytes=10-19", 100) == (10, 19)
+    assert byte_range("bytes=90-200", 100) == (90, 99)
+    assert byte_range("bytes=-30", 100) == (70, 99)
+    assert byte_range("bytes=100-", 100) == "unsatisfiable"
+    assert byte_range("bytes=0-1,5-6", 100) is None       # multi-range: whole body
+    assert byte_range("items=0-1", 100) is None
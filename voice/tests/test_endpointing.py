@@ -0,0 +1,66 @@
+import numpy as np
+from endpointing import Endpointer, frame_pitch
+from vad_capture import UtteranceCapture
+
+RATE = 16000
+FRAME = 480
+
+
+def _tone(hz, n=FRAME, amp=3000):
+    t = np.arange(n) / RATE
+    return (amp * np.sin(2 * np.pi * hz * t)).astype(np.int16)
+
+
+class FakeVad:
+    def is_speech(self, frame_bytes, rate):
+        return bool(np.abs(np.frombuffer(frame_bytes, dtype=np.int16)).max() > 100)
+
+
+def _speak(ep, frames):
+    for f in frames:
+        ep.observe(f, True)
+    ep.observe(np.zeros(FRAME, dtype=np.int16), False)
+
+
+def test_pitch_estimate():
+    assert abs(frame_pitch(_tone(200)) - 200) < 10
+    assert frame_pitch(np.zeros(FRAME, dtype=np.int16)) is None
+
+
+def test_complete_command_ends_fast_dangling_word_waits():
+    ep = Endpointer(min_ms=350, base_ms=800, max_ms=1500)
+    _speak(ep, [_tone(180)] * 30)
+    ep.set_partial("Éteins la lumière.", 30 * 30)
+    assert ep.silence_ms() == 350
+    ep.set_partial("allume la", 30 * 30)
+    assert ep.silence_ms() == 1500
+    assert "complete command" in ep.describe() and "dangling" in ep.describe()
+
+
+def test_stale_partial_falls_back_to_prosody():
+    level = Endpointer(min_ms=350, base_ms=800, max_ms=1500)
+    _speak(level, [_tone(180)] * 30)
+    level.set_partial("éteins la lumière", 300)          # covers only the first 300 ms
+    assert level.silence_ms() == 800
+
+    falling = Endpointer(min_ms=350, base_ms=800, max_ms=1500)
+    _speak(falling, [_tone(200)] * 22 + [_tone(150)] * 8)
+    assert falling.silence_ms() == (800 + 350) // 2
+
+    rising = Endpointer(min_ms=350, base_ms=800, max_ms=1500)
+    _speak(rising, [_tone(150)] * 22 + [_tone(200)] * 8)
+    assert rising.silence_ms() == (800 + 1500) // 2
+
+
+def test_capture_uses_the_endpointer_window():
+    ep = Endpointer(min_ms=300, base_ms=800, max_ms=1500)
+    cap = UtteranceCapture(FakeVad(), prebuffer_ms=0, endpointer=ep)
+    for _ in range(20):
+        assert cap.feed(_tone(180)) is None
+    ep.set_partial("stop", cap.speech_end * 1000 // RATE)
+    silent = 0
+    out = None
+    while out is None:
+        out = cap.feed(np.zeros(FRAME, dtype=np.int16))
+        silent += 1
+    assert silent == 10                                  # 300 ms, not 1200
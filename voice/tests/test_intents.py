@@ -0,0 +1,77 @@
+import json
+from intents import DEFAULT_GRAMMAR, IntentMatcher, load_grammar, parse_duration, parse_number, route
+
+ROOMS = ["salon", "cuisine", "salle de bain"]
+
+
+def test_device_commands_map_to_tool_calls():
+    m = IntentMatcher(ROOMS)
+    cases = {
+        "Allume le salon.": ("light_set", {"target": "salon", "on": True}),
+        "Éteins la lumière de la salle de bain, s'il te plaît": ("light_set", {"target": "salle de bain", "on": False}),
+        "éteins les lumières": ("light_set", {"target": "all", "on": False}),
+        "Mets le volume à vingt-cinq %": ("set_volume", {"percent": 25}),
+        "mets la lumière du salon à 40": ("light_set", {"target": "salon", "on": True, "brightness": 40}),
+        "Lance la scène cinéma": ("scene_trigger", {"id": "cinéma"}),
+        "Mets en pause": ("pause_music", {}),
+        "chanson suivante": ("next_track", {}),
+    }
+    for text, (tool, args) in cases.items():
+        intent = m.match(text, "salon")
+        assert intent is not None, text
+        assert (intent.tool, intent.args) == (tool, args), text
+
+
+def test_timer_slots_and_reply():
+    intent = IntentMatcher(ROOMS).match("Lance un minuteur de 10 minutes pour les pâtes", "cuisine")
+    assert intent.args == {"label": "pâtes", "duration_seconds": 600, "room": "cuisine"}
+    assert intent.reply == "Minuteur de 10 minutes lancé."
+    # No room known: the optional argument is left out.
+    intent = IntentMatcher(ROOMS).match("minuteur de trente secondes")
+    assert intent.args == {"label": "minuteur", "duration_seconds": 30}
+
+
+def test_unmatched_goes_to_llm_and_is_counted():
+    m = IntentMatcher(ROOMS)
+    assert m.match("allume la télé") is None             # not a known room
+    assert m.match("raconte-moi une blague") is None
+    assert m.match("mets le volume à 300") is None        # out of range
+    m.match("allume le salon")
+    stats = m.stats()
+    assert stats["misses"] == 3 and stats["hits"] == {"lights_on": 1}
+    assert "allume la télé" in stats["recent_misses"]
+    assert m.matches("éteins tout") and m.stats()["hits"] == {"lights_on": 1}
+
+
+def test_numbers_and_durations():
+    assert parse_number("soixante et onze") == 71
+    assert parse_number("12") == 12
+    assert parse_duration("une heure et demie") == 5400
+    assert parse_duration("2 minutes et 30 secondes") == 150
+
+
+def test_grammar_file_rules_come_first(tmp_path):
+    path = tmp_path / "voice-intents.json"
+    path.write_text(json.dumps([{"name": "movie", "patterns": ["mode cinéma"],
+                                 "tool": "scene_trigger", "args": {"id": "cinéma"}}]))
+    rules = load_grammar(str(path))
+    assert len(rules) == len(DEFAULT_GRAMMAR) + 1
+    assert IntentMatcher(ROOMS, rules).match("Mode cinéma !").name == "movie"
+    assert load_grammar(str(tmp_path / "missing.json")) is DEFAULT_GRAMMAR
+
+
+def test_stop_words_reach_music_intents_unless_a_reply_is_playing():
+    m = IntentMatcher(ROOMS)
+    for text, tool in (("stop la musique", "stop_music"), ("Arrête la musique.", "stop_music"),
+                       ("pause", "pause_music"), ("Mets en pause", "pause_music")):
+        kind, intent = route(text, m, "salon")
+        assert kind == "intent" and intent.tool == tool, text
+    # A bare stop word over a reply stops the reply.
+    for text in ("pause", "Pause.", "stop", "Stop !"):
+        assert route(text, m, "salon", speaking=True) == ("stop", None), text
+    assert route("stop la musique", m, "salon", speaking=True)[1].tool == "stop_music"
+    # Stop words no intent knows still stop the reply.
+    assert route("stop", m, "salon") == ("stop", None)
+    assert route("arrête de parler", m, "salon") == ("stop", None)
+    assert route("quel temps fait-il ?", m, "salon") == ("order", None)
+    assert route("pause", None) == ("stop", None)
@@ -0,0 +1,56 @@
+import numpy as np
+from jitter_buffer import JitterBuffer, pack_header, parse_header
+
+def _pkt(v, n=320):
+    return np.full(n, v, dtype=np.int16)
+
+def _values(chunks):
+    return [int(c[0]) if len(c) else None for c, _ in chunks]
+
+def test_header_roundtrip_and_legacy_detection():
+    hdr = parse_header(pack_header(7, 42, 123456789) + b"\x00\x00")
+    assert (hdr.stream_id, hdr.seq, hdr.capture_us) == (7, 42, 123456789)
+    assert parse_header(np.arange(320, dtype=np.int16).tobytes()) is None
+
+def test_in_order_packets_pass_straight_through():
+    jb = JitterBuffer(depth=3)
+    for seq in range(5):
+        assert jb.in_order(seq)
+        assert _values(jb.push(seq, seq * 20_000, _pkt(seq + 1), 0.0)) == [seq + 1]
+    assert jb.lost == 0 and jb.reordered == 0
+
+def test_reordered_packet_is_put_back_in_sequence():
+    jb = JitterBuffer(depth=3)
+    assert _values(jb.push(0, 0, _pkt(1), 0.0)) == [1]
+    assert jb.push(2, 0, _pkt(3), 0.0) == []
+    assert _values(jb.push(1, 0, _pkt(2), 0.0)) == [2, 3]
+    assert jb.reordered == 1 and jb.lost == 0
+
+def test_gap_is_concealed_with_silence_after_depth_packets():
+    jb = JitterBuffer(depth=2)
+    jb.push(0, 0, _pkt(1), 0.0)
+    assert jb.push(2, 0, _pkt(3), 0.0) == []
+    out = jb.push(3, 0, _pkt(4), 0.0)
+    assert _values(out) == [0, 3, 4]
+    assert out[0][1] is None and len(out[0][0]) == 320
+    assert jb.lost == 1
+    assert jb.push(1, 0, _pkt(2), 0.0) == [] and jb.late == 1
+
+def test_flush_releases_held_packets():
+    jb = JitterBuffer(depth=5)
+    jb.push(0, 0, _pkt(1), 0.0)
+    jb.push(2, 0, _pkt(3), 0.0)
+    assert _values(jb.flush()) == [0, 3]
+
+def test_counter_restart_resyncs_instead_of_concealing():
+    jb = JitterBuffer(depth=2, max_gap=50)
+    jb.push(1000, 0, _pkt(1), 0.0)
+    assert _values(jb.push(0, 0, _pkt(2), 0.0)) == [2]
+    assert jb.resyncs == 1 and jb.lost == 0
+
+def test_jitter_estimate_tracks_arrival_variation():
+    jb = JitterBuffer()
+    for seq in range(50):
+        jitter = 0.005 if seq % 2 else 0.0
+        jb.push(seq, seq * 20_000, _pkt(1), seq * 0.02 + jitter)
+    assert 2.0 < jb.jitter_ms < 6.0
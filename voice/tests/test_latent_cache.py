@@ -0,0 +1,52 @@
+import os
+import pickle
+
+from latent_cache import SUFFIX, LatentCache
+
+
+def test_latents_computed_once_per_reference(tmp_path):
+    ref = tmp_path / "ref.wav"
+    ref.write_bytes(b"RIFF v1")
+    computed = []
+
+    def compute(path):
+        computed.append(path)
+        return ("latent", open(path, "rb").read())
+
+    cache = LatentCache(compute, lambda name: ("builtin", name))
+    assert cache.get(speaker_wav=str(ref)) == ("latent", b"RIFF v1")
+    assert cache.get(speaker_wav=str(ref)) == ("latent", b"RIFF v1")
+    assert cache.get(speaker="Ana") == ("builtin", "Ana")
+    assert cache.get(speaker="Ana") == ("builtin", "Ana")
+    assert len(computed) == 1
+
+    ref.write_bytes(b"RIFF v2 re-recorded")              # new mtime/size → recompute
+    os.utime(ref, ns=(os.stat(ref).st_atime_ns, os.stat(ref).st_mtime_ns + 10**9))
+    assert cache.get(speaker_wav=str(ref)) == ("latent", b"RIFF v2 re-recorded")
+    stats = cache.stats()
+    assert len(computed) == 2
+    assert stats["entries"] == 2 and stats["hits"] == 2 and stats["hit_rate"] == 0.4
+
+
+def test_persisted_latents_survive_restart(tmp_path):
+    ref = tmp_path / "ref.wav"
+    ref.write_bytes(b"RIFF")
+
+    def save(latents, path):
+        with open(path, "wb") as f:
+            pickle.dump(latents, f)
+
+    def load(path):
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    first = LatentCache(lambda path: "computed", None, save=save, load=load)
+    assert first.get(speaker_wav=str(ref)) == "computed"
+    assert (tmp_path / f"ref.wav{SUFFIX}").exists()
+
+    def fail(path):
+        raise AssertionError("should load from disk")
+
+    restarted = LatentCache(fail, None, save=save, load=load)
+    assert restarted.get(speaker_wav=str(ref)) == "computed"
+    assert restarted.stats()["loaded_from_disk"] == 1
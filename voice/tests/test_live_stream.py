@@ -0,0 +1,54 @@
+import io
+import threading
+import time
+
+import numpy as np
+import soundfile as sf
+
+from live_stream import LiveStream
+from wav_stream import WavFormat, iter_pcm
+
+FMT = WavFormat(8000)
+
+
+def _wav(samples: np.ndarray, rate: int) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, samples, rate, format="WAV", subtype="PCM_16")
+    return buf.getvalue()
+
+
+def test_sentences_play_back_to_back_with_a_gap():
+    stream = LiveStream(FMT, gap_ms=50)
+    stream.append(b"\x01\x00" * 800)                # 100 ms
+    stream.append(b"\x02\x00" * 800)
+    stream.close()
+    fmt, pcm = iter_pcm(stream.reader())
+    data = b"".join(pcm)
+    assert fmt == FMT
+    assert data == b"\x01\x00" * 800 + b"\x00\x00" * 400 + b"\x02\x00" * 800
+    assert stream.sentences == 2 and stream.underrun_s == 0.0
+
+
+def test_late_sentence_is_preceded_by_realtime_silence():
+    stream = LiveStream(FMT, gap_ms=0, lead_ms=50, chunk_ms=20)
+    stream.append(b"\x01\x00" * 80)                 # 10 ms
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(stream.reader()))
+    reader.start()
+    time.sleep(0.2)
+    stream.append(b"\x02\x00" * 80)
+    stream.close()
+    reader.join(2)
+    data = b"".join(received[1:])
+    assert stream.underrun_s > 0.1
+    assert data.startswith(b"\x01\x00" * 80) and data.endswith(b"\x02\x00" * 80)
+    assert len(data) == round(stream.duration_s * 16000)
+
+
+def test_wav_is_resampled_and_cancel_ends_the_stream():
+    stream = LiveStream(FMT)
+    stream.append_wav(_wav(np.zeros(1600, dtype=np.float32), 16000))
+    assert abs(stream.duration_s - 0.1) < 0.002
+    stream.cancel.set()
+    assert list(stream.reader())[1:] == []
+    assert stream.close() and not stream.close()
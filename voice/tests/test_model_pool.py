@@ -0,0 +1,27 @@
+import threading
+import pytest
+from model_pool import ModelPool
+
+def test_run_returns_result_and_counts_jobs():
+    pool = ModelPool(workers=1)
+    assert pool.run(lambda x: x * 2, 21) == 42
+    assert pool.stats()["jobs"] == 1
+    pool.shutdown()
+
+def test_single_worker_serializes_jobs():
+    pool = ModelPool(workers=1)
+    started, gate = threading.Event(), threading.Event()
+    first = pool.submit(lambda: started.set() or gate.wait(2))
+    second = pool.submit(lambda: "done")
+    assert started.wait(2)
+    assert pool.depth == 1
+    gate.set()
+    assert first.result(timeout=2) and second.result(timeout=2) == "done"
+    assert pool.depth == 0
+    pool.shutdown()
+
+def test_run_reraises_job_errors():
+    pool = ModelPool()
+    with pytest.raises(ZeroDivisionError):
+        pool.run(lambda: 1 / 0)
+    pool.shutdown()
@@ -0,0 +1,80 @@
+import threading
+
+import pytest
+
+from intents import IntentMatcher
+from speculation import Speculation, Speculations, StablePartial, same_order
+
+
+def _fetch(log):
+    def fetch(text, reset_convo, stop_event):
+        log.append(text)
+        yield from ("Il fait ", "beau.")
+    return fetch
+
+
+def test_same_order_ignores_case_and_punctuation():
+    assert same_order("Quel temps fait-il ?", "quel temps fait il")
+    assert same_order("Allume l'entrée.", "allume l'entrée")
+    assert not same_order("allume le salon", "allume la cuisine")
+
+
+def test_speculation_buffers_tokens_and_reraises_errors():
+    spec = Speculation("quel temps", False, "salon", _fetch([]))
+    assert list(spec.tokens(threading.Event())) == ["Il fait ", "beau."]
+
+    def fail(text, reset_convo, stop_event):
+        raise ConnectionError("orchestrator down")
+        yield
+
+    with pytest.raises(ConnectionError):
+        list(Speculation("quel temps", False, "salon", fail).tokens(threading.Event()))
+    stopped = threading.Event()
+    stopped.set()
+    spec = Speculation("quel temps", False, "salon", _fetch([]))
+    assert list(spec.tokens(stopped)) == [] and spec.cancelled.is_set()
+
+
+def test_claim_counts_hits_misses_and_cancels():
+    sent = []
+    specs = Speculations(_fetch(sent))
+    assert specs.open("Quel temps fait-il", False, "salon")
+    assert not specs.open("quel temps fait-il ?", False, "salon")     # same order: kept
+    hit = specs.claim("Quel temps fait-il ?", False, "salon")
+    assert hit is not None and not hit.cancelled.is_set()
+    assert specs.claim("Quel temps fait-il ?", False, "salon") is None  # claimed once
+
+    specs.open("allume la", False, "salon")
+    miss = specs._open["salon"]
+    assert specs.claim("allume la cuisine", False, "salon") is None and miss.cancelled.is_set()
+    specs.open("quelle heure", True, "salon")
+    assert specs.claim("quelle heure", False, "salon") is None         # conversation differs
+
+    specs.open("mets de la", False, "salon")
+    specs.open("mets de la musique", False, "salon")                   # replaces: one cancel
+    specs.cancel("salon", "partial changed")
+    specs.open("quelle heure", False, "cuisine")
+    specs.cancel_all()
+    assert specs.stats() == {"hits": 1, "misses": 2, "cancels": 3}
+    assert sent.count("Quel temps fait-il") == 1
+
+
+def test_stop_words_and_local_intents_are_never_speculated():
+    intents = IntentMatcher(["salon"])
+    stable = StablePartial(500, intents.matches)
+    for order in ("pause", "stop", "arrête", "allume le salon", "mets en pause"):
+        assert stable.update(order, 0.0) is None
+        assert stable.update(order, 10.0) is None, order
+    assert stable.text == ""
+
+
+def test_order_is_speculated_once_stable():
+    stable = StablePartial(500)
+    assert stable.update("quel temps", 0.0) is None
+    assert stable.update("Quel temps ?", 0.3) is None
+    assert stable.update("quel temps", 0.5) == "speculate"
+    assert stable.update("quel temps fait-il", 0.6) == "cancel"
+    assert stable.update("quel temps fait-il", 1.0) is None
+    assert stable.update("quel temps fait-il", 1.1) == "speculate"
+    stable.reset()
+    assert stable.update("quel temps fait-il", 1.2) is None
@@ -0,0 +1,57 @@
+import threading, time
+from stages import Stage
+
+def test_items_are_handled_in_order_on_the_stage_thread():
+    seen, done = [], threading.Event()
+    def handler(item):
+        seen.append((item, threading.current_thread().name))
+        if item == 3:
+            done.set()
+    st = Stage("test", handler)
+    st.start()
+    for i in (1, 2, 3):
+        assert st.put(i)
+    assert done.wait(2)
+    assert [i for i, _ in seen] == [1, 2, 3] and seen[0][1] == "test"
+    st.stop()
+
+def test_full_queue_rejects_or_drops_oldest():
+    st = Stage("reject", lambda _: None, maxsize=2)
+    assert st.put(1) and st.put(2) and not st.put(3)
+    assert st.depth == 2 and st.dropped == 1
+    rt = Stage("realtime", lambda _: None, maxsize=2, drop_oldest=True)
+    for i in range(5):
+        assert rt.put(i)
+    assert rt.depth == 2 and rt.dropped == 3
+    assert rt._queue.get_nowait() == 3
+
+def test_drop_oldest_never_drops_kept_items():
+    rt = Stage("endpoint", lambda _: None, maxsize=3, drop_oldest=True,
+               keep=lambda item: item == "mark")
+    for item in ("a0", "mark", "a1", "a2", "a3"):
+        assert rt.put(item)
+    assert list(rt._queue.queue) == ["mark", "a2", "a3"] and rt.dropped == 2
+    assert rt.put("mark") and rt.put("mark")
+    assert list(rt._queue.queue) == ["mark", "mark", "mark"] and rt.dropped == 4
+    assert not rt.put("a4") and rt.dropped == 5      # nothing droppable: the audio goes
+
+def test_markers_coalesce_instead_of_blocking_when_only_markers_queue():
+    rt = Stage("endpoint", lambda _: None, maxsize=2, drop_oldest=True,
+               keep=lambda item: item[0] == "mark")
+    for item in (("mark", 1), ("mark", 2), ("mark", 3)):
+        assert rt.put(item)                          # returns at once: no consumer running
+    assert list(rt._queue.queue) == [("mark", 1), ("mark", 3)] and rt.dropped == 1
+    assert not rt.put(("audio", 0)) and rt.dropped == 2
+
+def test_busy_while_handler_runs_and_clear():
+    gate = threading.Event()
+    st = Stage("busy", lambda _: gate.wait(2), maxsize=4)
+    st.start()
+    st.put("a"); st.put("b"); st.put("c")
+    time.sleep(0.1)
+    assert st.busy
+    assert st.clear() == 2
+    gate.set()
+    time.sleep(0.1)
+    assert not st.busy and st.processed == 1
+    st.stop()
@@ -0,0 +1,87 @@
+import threading
+import time
+
+import numpy as np
+from model_pool import ModelPool
+from streaming_stt import IncrementalTranscriber
+
+
+def _scripted(*texts):
+    """Fake STT returning the given hypotheses in turn; records audio lengths."""
+    calls = []
+    def transcribe(pcm):
+        calls.append(len(pcm))
+        return texts[min(len(calls), len(texts)) - 1]
+    return transcribe, calls
+
+
+def _audio(n):
+    return lambda: np.ones(n, dtype=np.int16)
+
+
+def test_decodes_only_every_interval():
+    stt, calls = _scripted("allume")
+    pool = ModelPool(1)
+    t = IncrementalTranscriber(stt, pool, interval_ms=400, min_ms=500)
+    assert not t.update(_audio(4800), 4800)        # below min_ms
+    assert t.update(_audio(8000), 8000)
+    t._idle.wait(2)
+    assert not t.update(_audio(12000), 12000)      # only 250 ms new
+    assert t.update(_audio(14400), 14400)
+    t._idle.wait(2)
+    assert calls == [8000, 14400]
+    pool.shutdown()
+
+
+def test_committed_words_are_stable():
+    stt, _ = _scripted("allume la", "allume la lumière du", "allume la lumière de la cuisine")
+    pool = ModelPool(1)
+    seen = []
+    t = IncrementalTranscriber(stt, pool, interval_ms=100, min_ms=100, on_partial=seen.append)
+    for n in (3200, 6400, 9600):
+        assert t.update(_audio(n), n)
+        t._idle.wait(2)
+    assert [p.committed for p in seen] == ["", "allume la", "allume la lumière"]
+    assert seen[-1].tentative == "de la cuisine"
+    pool.shutdown()
+
+
+def test_final_reuses_partial_covering_the_speech():
+    stt, calls = _scripted("éteins la lumière")
+    pool = ModelPool(1)
+    t = IncrementalTranscriber(stt, pool, interval_ms=100, min_ms=100)
+    t.update(_audio(16000), 16000)
+    # Trailing silence added after the last decode: no new decode needed.
+    assert t.finish(np.ones(35200, dtype=np.int16), speech_end=16000) == "éteins la lumière"
+    assert calls == [16000] and t.reused == 1
+    pool.shutdown()
+
+
+def test_final_decodes_when_partial_is_behind():
+    stt, calls = _scripted("éteins", "éteins la lumière")
+    pool = ModelPool(1)
+    t = IncrementalTranscriber(stt, pool, interval_ms=100, min_ms=100)
+    t.update(_audio(8000), 8000)
+    t._idle.wait(2)
+    assert t.finish(np.ones(32000, dtype=np.int16), speech_end=16000) == "éteins la lumière"
+    assert calls == [8000, 32000] and t.decoded == 1
+    pool.shutdown()
+
+
+def test_finish_returns_after_the_partial_callback():
+    scripted, _ = _scripted("quel temps fait-il")
+    stt = lambda pcm: time.sleep(0.05) or scripted(pcm)    # still decoding at finish()
+    pool = ModelPool(1)
+    order = []
+
+    def on_partial(p):
+        time.sleep(0.1)                 # e.g. opening a speculation
+        order.append("partial")
+
+    t = IncrementalTranscriber(stt, pool, interval_ms=100, min_ms=100, on_partial=on_partial)
+    t.update(_audio(16000), 16000)
+    done = threading.Thread(target=lambda: order.append(t.finish(np.ones(20000, dtype=np.int16), 16000)))
+    done.start()
+    done.join(2)
+    assert order == ["partial", "quel temps fait-il"]
+    pool.shutdown()
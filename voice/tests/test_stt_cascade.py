@@ -0,0 +1,67 @@
+import numpy as np
+from stt_cascade import COMMAND_VOCABULARY, CascadeSTT, Transcript, vocabulary_coverage
+
+AUDIO = np.zeros(16000, dtype=np.int16)
+
+
+class FakeModel:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def transcribe_scored(self, audio):
+        self.calls += 1
+        return self.result
+
+
+def test_confident_in_vocabulary_command_stays_on_fast_tier():
+    fast = FakeModel(Transcript("Allume la lumière du salon.", -0.2, 0.05))
+    big = FakeModel(Transcript("unused"))
+    stt = CascadeSTT(fast, big)
+    assert stt.transcribe(AUDIO) == "Allume la lumière du salon."
+    assert big.calls == 0
+    assert stt.stats()["fast"]["hit_rate"] == 1.0
+
+
+def test_escalates_on_low_confidence_or_unknown_words():
+    big = FakeModel(Transcript("Raconte-moi une histoire de pirates.", -0.3, 0.1))
+    for fast_result, reason in [
+        (Transcript("allume la lumière", -1.2, 0.05), "low_logprob"),
+        (Transcript("allume la lumière", -0.2, 0.8), "no_speech"),
+        (Transcript("raconte moi une histoire de pirates", -0.2, 0.05), "out_of_vocabulary"),
+        (Transcript(""), "empty"),
+    ]:
+        stt = CascadeSTT(FakeModel(fast_result), big)
+        assert stt.transcribe(AUDIO) == big.result.text
+        assert stt.escalations == {reason: 1}
+        assert stt.stats()["accurate"]["calls"] == 1
+
+
+def test_accurate_tier_hits_only_when_the_escalation_changed_the_text():
+    fast = FakeModel(Transcript("allume la lumière", -1.2, 0.05))
+    big = FakeModel(Transcript("Allume la lumière."))
+    stt = CascadeSTT(fast, big)
+    stt.transcribe(AUDIO)
+    big.result = Transcript("allume la lumière du salon")
+    stt.transcribe(AUDIO)
+    stats = stt.stats()
+    assert stats["accurate"]["calls"] == 2 and stats["accurate"]["hit_rate"] == 0.5
+    assert stats["escalation_rate"] == 1.0
+
+
+def test_silence_gate_is_not_escalated():
+    big = FakeModel(Transcript("x"))
+    stt = CascadeSTT(FakeModel(Transcript("", skipped=True)), big)
+    assert stt.transcribe(AUDIO) == "" and big.calls == 0
+
+
+def test_vocabulary_coverage_ignores_case_punctuation_and_numbers():
+    assert vocabulary_coverage("Mets le volume à 30 %.", {"mets", "le", "volume", "à", "%"}) == 1.0
+    assert vocabulary_coverage("allume Netflix", {"allume"}) == 0.5
+
+
+def test_vocabulary_coverage_strips_elided_articles():
+    vocabulary = set(COMMAND_VOCABULARY)
+    assert vocabulary_coverage("Allume l'entrée.", vocabulary) == 1.0
+    assert vocabulary_coverage("Éteins la lumière de l’entrée, c'est l'heure.", vocabulary) == 1.0
+    assert vocabulary_coverage("l'Netflix", vocabulary) == 0.0
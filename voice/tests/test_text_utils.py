@@ -0,0 +1,47 @@
+from text_utils import SentenceSegmenter
+
+
+def _run(tokens, **kw):
+    seg = SentenceSegmenter(**kw)
+    out = []
+    for t in tokens:
+        out += seg.feed(t)
+    rest = seg.flush()
+    return out + ([rest] if rest else [])
+
+
+def _chars(text):
+    return list(text)          # worst case: one character per token
+
+
+def test_first_chunk_on_clause_then_whole_sentences():
+    text = "Bien sûr, je lance la musique dans le salon, tout de suite. Le volume est à 30, comme demandé. Bonne soirée !"
+    assert _run(_chars(text)) == [
+        "Bien sûr, je lance la musique dans le salon,",
+        "tout de suite.",
+        "Le volume est à 30, comme demandé.",
+        "Bonne soirée !",
+    ]
+
+
+def test_abbreviations_initials_and_numbers_are_not_boundaries():
+    text = "M. Dupont arrive à 12:30 avec J. Martin. Il fera 3,5 degrés, soit 1.5 de plus qu'hier. Fin."
+    assert _run(_chars(text), first_clause_chars=1000) == [
+        "M. Dupont arrive à 12:30 avec J. Martin.",
+        "Il fera 3,5 degrés, soit 1.5 de plus qu'hier.",
+        "Fin.",
+    ]
+
+
+def test_punctuation_runs_and_closing_quotes_stay_with_the_sentence():
+    text = "Tu as dit « stop » ?! D'accord… Je m'arrête."
+    tokens = ["Tu as dit « stop » ?", "! D'acc", "ord… Je m'arrête."]
+    assert "".join(tokens) == text
+    assert _run(tokens) == [
+        "Tu as dit « stop » ?!", "D'accord…", "Je m'arrête.",
+    ]
+
+
+def test_long_run_without_punctuation_is_cut_at_a_word():
+    chunks = _run(["mot " * 100], max_chars=50)
+    assert all(len(c) <= 50 for c in chunks) and " ".join(chunks).split() == ["mot"] * 100
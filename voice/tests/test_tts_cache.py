@@ -0,0 +1,52 @@
+from tts_cache import TtsCache, cache_key
+
+
+def test_key_covers_every_synthesis_param():
+    base = cache_key("C'est fait.", speaker="Ana", speed=1.0, language="fr", model="xtts_v2")
+    assert cache_key("  C'est   fait. ", speaker="Ana", speed=1.0, language="fr", model="xtts_v2") == base
+    assert cache_key("C'est fait.", speaker="Ana", speed=1.1, language="fr", model="xtts_v2") != base
+    assert cache_key("C'est fait.", speaker="Bob", speed=1.0, language="fr", model="xtts_v2") != base
+    assert cache_key("C'est fait.", speaker="Ana", speed=1.0, language="fr", model="xtts_v3") != base
+
+
+def test_hit_skips_synthesis_and_survives_restart(tmp_path):
+    calls = []
+    def synth():
+        calls.append(1)
+        return b"RIFF-audio"
+    cache = TtsCache(str(tmp_path))
+    assert cache.fetch("k1", synth) == b"RIFF-audio"
+    assert cache.fetch("k1", synth) == b"RIFF-audio"
+    assert len(calls) == 1
+    assert cache.stats()["memory_hits"] == 1
+
+    reopened = TtsCache(str(tmp_path))
+    assert reopened.fetch("k1", synth) == b"RIFF-audio"
+    assert len(calls) == 1
+    assert reopened.stats()["disk_hits"] == 1
+
+
+def test_size_bounded_lru_eviction(tmp_path):
+    cache = TtsCache(str(tmp_path), memory_bytes=20, disk_bytes=25)
+    cache.put("a", b"x" * 10)
+    cache.put("b", b"y" * 10)
+    assert cache.get("a") == b"x" * 10          # a is now the most recent
+    cache.put("c", b"z" * 10)
+    stats = cache.stats()
+    assert stats["memory_bytes"] <= 20 and stats["disk_bytes"] <= 25
+    assert cache.contains("a") and cache.contains("c")
+    assert not cache.contains("b")
+    assert not (tmp_path / "b.wav").exists()
+
+
+def test_prewarm_synthesizes_only_missing_phrases():
+    cache = TtsCache(None)
+    seen = []
+    def synth(text):
+        seen.append(text)
+        return text.encode()
+    key = lambda text: cache_key(text, model="m")
+    assert cache.prewarm(["Ok.", "D'accord.", ""], key, synth) == {"added": 2, "cached": 0, "failed": 0}
+    assert cache.prewarm(["Ok.", "Compris."], key, synth) == {"added": 1, "cached": 1, "failed": 0}
+    assert seen == ["Ok.", "D'accord.", "Compris."]
+    assert cache.get(key("Ok.")) == b"Ok."
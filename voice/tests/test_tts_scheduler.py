@@ -0,0 +1,62 @@
+import threading
+import time
+from tts_scheduler import TtsScheduler
+
+
+def _recording_synth(gate=None):
+    order = []
+    def synth(text):
+        if gate is not None:
+            gate.wait(2)
+        order.append(text)
+        return text.upper()
+    return synth, order
+
+
+def test_next_sentence_to_play_is_synthesized_first():
+    gate = threading.Event()
+    synth, order = _recording_synth(gate)
+    sched = TtsScheduler(synth, workers=1, prefetch=8)
+    go = threading.Event()
+    first = sched.submit("a0", (0, 0), go)            # occupies the worker
+    time.sleep(0.05)
+    later = sched.submit("b0", (1, 0), go)
+    sooner = sched.submit("a1", (0, 1), go)
+    gate.set()
+    assert [first.get(2), sooner.get(2), later.get(2)] == ["A0", "A1", "B0"]
+    assert order == ["a0", "a1", "b0"]
+    sched.stop()
+
+
+def test_prefetch_limits_synthesis_ahead_of_playback():
+    synth, order = _recording_synth()
+    sched = TtsScheduler(synth, workers=1, prefetch=2)
+    ev = threading.Event()
+    jobs = [sched.submit(f"s{i}", (0, i), ev) for i in range(5)]
+    time.sleep(0.2)
+    assert order == ["s0", "s1"]                      # nothing consumed yet
+    assert jobs[0].get(1) == "S0"
+    time.sleep(0.2)
+    assert order == ["s0", "s1", "s2"]
+    for j in jobs[1:]:
+        j.get(1)
+    assert order == ["s0", "s1", "s2", "s3", "s4"]
+    assert sched.stats()["jobs"] == 5
+    sched.stop()
+
+
+def test_cancelled_work_is_dropped():
+    gate = threading.Event()
+    synth, order = _recording_synth(gate)
+    sched = TtsScheduler(synth, workers=1, prefetch=8)
+    stop = threading.Event()
+    running = sched.submit("x0", (0, 0), stop)
+    time.sleep(0.05)
+    queued = [sched.submit(f"x{i}", (0, i), stop) for i in (1, 2)]
+    stop.set()
+    assert sched.purge() == 2
+    assert queued[0].get(1) is None
+    gate.set()
+    running.get(1)
+    assert order == ["x0"] and sched.stats()["cancelled"] == 2
+    sched.stop()
@@ -40,3 +40,13 @@ def test_max_duration_forces_end():
         if out is not None:
             break
     assert out is not None
+
+def test_tracks_end_of_speech_in_returned_utterance():
+    cap = UtteranceCapture(FakeVad(), silence_ms=300, max_ms=10000, prebuffer_ms=0)
+    for _ in range(5):
+        cap.feed(_chunk(500, 960))
+    assert cap.started and cap.length == len(cap.audio()) == 4320
+    out = None
+    while out is None:
+        out = cap.feed(_chunk(0, 960))
+    assert cap.speech_end == 4320 and len(out) > 4320
@@ -35,3 +35,93 @@ def test_reset_then_silence_scores_low():
     for _ in range(20):
         last = det.score(silence)
     assert last < 0.3
+
+@pytest.mark.skipif(not os.path.isfile(MODEL), reason="yui.onnx not present")
+def test_forks_share_sessions_but_not_state():
+    base = WakeDetector(MODEL)
+    a, b = base.fork(), base.fork()
+    assert a._model.preprocessor.melspec_model is base._model.preprocessor.melspec_model
+    pcm = _load(sorted(glob.glob(os.path.join(POS, "*.wav")))[0])
+    fed = max(a.score(pcm[i:i+OWW_CHUNK]) for i in range(0, len(pcm) - OWW_CHUNK, OWW_CHUNK))
+    assert fed > 0.5
+    silence = np.zeros(OWW_CHUNK, dtype=np.int16)
+    assert max(b.score(silence) for _ in range(20)) < 0.3
+
+@pytest.mark.skipif(not os.path.isfile(MODEL), reason="yui.onnx not present")
+def test_warmup_leaves_the_template_state_untouched():
+    det = WakeDetector(MODEL)
+    before = det._model.preprocessor.feature_buffer.copy()
+    det.warmup()
+    assert np.array_equal(det._model.preprocessor.feature_buffer, before)
+    assert det._model.preprocessor.accumulated_samples == 0
+
+@pytest.mark.skipif(not os.path.isfile(MODEL), reason="yui.onnx not present")
+def test_reset_is_instant_and_the_fired_word_cannot_retrigger():
+    import time
+    det = WakeDetector(MODEL).fork()
+    pcm = _load(sorted(glob.glob(os.path.join(POS, "*.wav")))[0])
+    chunks = [pcm[i:i+OWW_CHUNK] for i in range(0, len(pcm) - OWW_CHUNK, OWW_CHUNK)]
+    fired = next(i for i, c in enumerate(chunks) if det.score(c) >= 0.5)
+    t0 = time.perf_counter()
+    det.reset()
+    assert time.perf_counter() - t0 < 0.01             # no inference, just buffer copies
+    # The wake word's tail and then silence: nothing from before reset() may fire.
+    silence = np.zeros(OWW_CHUNK, dtype=np.int16)
+    after = [det.score(c) for c in chunks[fired + 1:]] + [det.score(silence) for _ in range(20)]
+    assert max(after) < 0.5
+    # Detection resumes at once: the same word said again fires.
+    det.reset()
+    assert max(det.score(c) for c in chunks) >= 0.5
+
+def test_energy_gate_skips_silence_but_opens_on_onsets():
+    from wake import EnergyGate
+    gate = EnergyGate(rms_floor=100, flux_db=6, hangover=3)
+    rng = np.random.default_rng(0)
+    hiss = lambda: rng.normal(0, 20, OWW_CHUNK).astype(np.int16)
+    assert [gate.silent(hiss()) for _ in range(5)] == [False, False, False, True, True]
+    t = np.arange(OWW_CHUNK) / 16000
+    voiced = sum(np.sin(2 * np.pi * 150 * k * t) for k in range(1, 20)) * 12
+    quiet_onset = (voiced + rng.normal(0, 20, OWW_CHUNK)).astype(np.int16)
+    assert np.sqrt(np.mean(quiet_onset.astype(float) ** 2)) < 100     # under the RMS floor
+    assert not gate.silent(quiet_onset)
+    assert [gate.silent(hiss()) for _ in range(4)] == [False, False, False, True]
+    stats = gate.stats()
+    assert stats["chunks"] == 10 and stats["skipped"] == 3
+
+def test_gate_savings_net_of_gate_and_preroll_cost():
+    from wake import EnergyGate
+    off = EnergyGate(rms_floor=0)
+    assert not any(off.silent(np.zeros(OWW_CHUNK, dtype=np.int16)) for _ in range(4))
+    off.ran(0.004)
+    assert off.stats()["chunks"] == 4 and off.stats()["model_ms"] == 4.0
+    gate = EnergyGate(rms_floor=100, flux_db=6, hangover=0)
+    silence = np.zeros(OWW_CHUNK, dtype=np.int16)
+    assert all(gate.silent(silence) for _ in range(1000))
+    gate.ran(0.005)
+    gate.prerolled(1.0)
+    gate.ran(0.003)
+    stats = gate.stats()
+    assert stats["model_ms"] == 4.0 and stats["preroll_s"] == 1.0
+    assert stats["cpu_saved_s"] == round(1000 * 0.004 - gate.gate_s - 1.0, 1)
+
+
+@pytest.mark.skipif(not os.path.isfile(MODEL), reason="yui.onnx not present")
+def test_gate_skips_quiet_room_without_delaying_detection():
+    base = WakeDetector(MODEL)
+    gated, ungated = base.fork(), base.fork()
+    ungated._gate.rms_floor = 0
+    pcm = _load(sorted(glob.glob(os.path.join(POS, "*.wav")))[0])
+    room = np.random.default_rng(1).normal(0, 10, 16000 * 3).astype(np.int16)
+    audio = np.concatenate([room, pcm])
+    chunks = [audio[i:i+OWW_CHUNK] for i in range(0, len(audio) - OWW_CHUNK, OWW_CHUNK)]
+
+    def first_fire(det):
+        return next(i for i, c in enumerate(chunks) if det.score(c) >= 0.5)
+
+    fired = first_fire(ungated)
+    assert abs(first_fire(gated) - fired) <= 1
+    stats = gated.stats()
+    assert stats["skipped"] > 0.5 * len(room) // OWW_CHUNK
+    assert gated._gate.preroll_s > 0 and gated._gate.runs == stats["chunks"] - stats["skipped"]
+    stats = ungated.stats()
+    assert stats["skipped"] == 0 and stats["chunks"] == fired + 1 and stats["model_ms"] > 0
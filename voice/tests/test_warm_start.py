@@ -0,0 +1,95 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+nn = torch.nn
+
+from warm_start import cpu_state, restore
+
+
+class _Transformer(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.h = nn.ModuleList(nn.Linear(8, 8) for _ in range(2))
+
+    def forward(self, x):
+        for layer in self.h:
+            x = torch.tanh(layer(x))
+        return x
+
+
+class _Inference(nn.Module):
+    """Like XTTS's GPT2InferenceModel: wraps the modules it is given."""
+
+    def __init__(self, transformer, pos_embedding, embeddings, norm, head):
+        super().__init__()
+        self.transformer = transformer
+        self.pos_embedding = pos_embedding
+        self.embeddings = embeddings
+        self.final_norm = norm
+        self.lm_head = head
+
+    def forward(self, codes):
+        positions = torch.arange(codes.shape[-1])
+        x = self.embeddings(codes) + self.pos_embedding(positions)
+        return self.lm_head(self.final_norm(self.transformer(x)))
+
+
+class _Gpt(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.gpt = _Transformer()
+        self.mel_embedding = nn.Embedding(16, 8)
+        self.mel_pos_embedding = nn.Embedding(32, 8)
+        self.final_norm = nn.LayerNorm(8)
+        self.mel_head = nn.Linear(8, 16)
+
+    def init_gpt_for_inference(self, kv_cache=True, use_deepspeed=False):
+        self.gpt_inference = _Inference(self.gpt, self.mel_pos_embedding, self.mel_embedding,
+                                        self.final_norm, self.mel_head)
+        self.gpt.wte = self.mel_embedding
+
+
+class _Xtts(nn.Module):
+    """The state-dict layout of Xtts: gpt.* (+ aliases once loaded) and hifigan_decoder.*."""
+
+    def __init__(self):
+        super().__init__()
+        self.gpt = _Gpt()
+        self.hifigan_decoder = nn.Linear(16, 4)
+
+    def forward(self, codes):
+        return self.hifigan_decoder(self.gpt.gpt_inference(codes))
+
+
+def _loaded():
+    model = _Xtts()
+    model.gpt.init_gpt_for_inference()
+    return model.eval()
+
+
+def test_snapshot_of_loaded_model_restores_onto_fresh_one(tmp_path):
+    cold = _loaded()
+    assert any(k.startswith("gpt.gpt_inference.") for k in cold.state_dict())
+    assert "gpt.gpt.wte.weight" in cold.state_dict()
+    path = tmp_path / "warm.pt"
+    torch.save({"state": cpu_state(cold)}, path)
+    cached = torch.load(path, mmap=True, map_location="cpu")
+
+    warm = restore(_Xtts, cached["state"])
+    warm.gpt.init_gpt_for_inference()
+    warm.eval()
+    codes = torch.tensor([[1, 2, 3, 4]])
+    with torch.no_grad():
+        assert torch.equal(warm(codes), cold(codes))
+    assert warm.state_dict().keys() == cold.state_dict().keys()
+    assert warm.gpt.gpt.wte is warm.gpt.mel_embedding
+
+
+def test_restore_ignores_aliases_and_rejects_missing_tensors():
+    cold = _loaded()
+    # A snapshot that still carries the inference aliases loads all the same.
+    restore(_Xtts, {k: v.detach() for k, v in cold.state_dict().items()})
+    state = cpu_state(cold)
+    del state["hifigan_decoder.weight"]
+    with pytest.raises(ValueError, match="hifigan_decoder.weight"):
+        restore(_Xtts, state)
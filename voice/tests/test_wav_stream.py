@@ -0,0 +1,32 @@
+import io
+
+import numpy as np
+import soundfile as sf
+
+from wav_stream import UNKNOWN_SIZE, WavFormat, iter_pcm, pcm_to_wav, wav_header
+
+
+def test_streaming_header_roundtrip():
+    head = wav_header(WavFormat(24000))
+    assert len(head) == 44 and head.endswith(UNKNOWN_SIZE.to_bytes(4, "little"))
+    fmt, pcm = iter_pcm([head])
+    assert fmt == WavFormat(24000, 1, 16)
+    assert list(pcm) == []
+
+
+def test_chunks_are_frame_aligned_across_splits():
+    samples = np.arange(-50, 50, dtype="<i2").tobytes()
+    stream = wav_header(WavFormat(16000)) + samples
+    # Header split mid-way, then odd-sized network chunks.
+    pieces = [stream[:10], stream[10:47], stream[47:120], stream[120:121], stream[121:]]
+    fmt, pcm = iter_pcm(pieces)
+    out = list(pcm)
+    assert all(len(c) % 2 == 0 for c in out)
+    assert b"".join(out) == samples
+
+
+def test_finished_pcm_is_a_regular_wav():
+    pcm = (np.sin(np.linspace(0, 20, 2400)) * 8000).astype("<i2")
+    wav = pcm_to_wav(WavFormat(24000), pcm.tobytes())
+    audio, sr = sf.read(io.BytesIO(wav), dtype="int16")
+    assert sr == 24000 and np.array_equal(audio, pcm)
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import pytest
+
+from xtts_queue import JobCancelled, JobQueue
+
+
+def _gated(log, name, chunks, gate=None):
+    def work():
+        for i in range(chunks):
+            if gate is not None:
+                gate.wait(2)
+            log.append(f"{name}{i}")
+            yield f"{name}{i}".encode()
+    return work
+
+
+def test_interactive_preempts_background_stream_at_chunk_boundary():
+    jobs, log = JobQueue(), []
+    gate = threading.Event()
+    batch = jobs.submit(_gated(log, "b", 3, gate), "batch")
+    announce = jobs.submit(_gated(log, "a", 1), "announcement")
+    jobs.start()
+    # The worker picks the earliest most-urgent job: the announcement, then the batch.
+    while log[:1] != ["a0"]:
+        time.sleep(0.001)
+    reply = jobs.submit(_gated(log, "i", 2), "interactive")
+    gate.set()
+    assert reply.result() == b"i0i1"
+    assert batch.result() == b"b0b1b2"
+    assert announce.result() == b"a0"
+    # At most one batch chunk (already in progress) ran before the reply.
+    assert log.index("i1") < log.index("b2")
+    assert log.index("i1") < log.index("b1") or log.count("b0") == 2
+    stats = jobs.stats()
+    assert stats["completed"] == 3 and stats["depth"] == {"interactive": 0, "announcement": 0, "batch": 0}
+    assert stats["latency_ms"]["interactive"]["wait_p50"] is not None
+
+
+def test_preempted_job_restarts_from_the_start():
+    jobs, log, opened, closed = JobQueue(), [], [], []
+    started = threading.Event()
+    gate = threading.Event()
+
+    def background():
+        opened.append(len(opened))
+        try:
+            for i in range(3):
+                log.append(f"b{i}")
+                started.set()
+                gate.wait(2)
+                yield f"b{i}".encode()
+        finally:
+            closed.append(len(closed))
+
+    batch = jobs.submit(background, "batch")
+    jobs.start()
+    started.wait(2)
+    reply = jobs.submit(_gated(log, "i", 2), "interactive")
+    gate.set()
+    assert reply.result() == b"i0i1"
+    # No chunk of the first run leaks out: the client gets one clean take.
+    assert batch.result() == b"b0b1b2"
+    assert log == ["b0", "i0", "i1", "b0", "b1", "b2"]
+    assert opened == [0, 1] and closed == [0, 1]        # closed, then run again
+    assert jobs.stats()["preempted"] == 1
+
+
+def test_cancelled_jobs_are_dropped():
+    jobs, log = JobQueue(), []
+    gate = threading.Event()
+    running = jobs.submit(_gated(log, "r", 5, gate), "interactive", job_id="turn-1")
+    queued = jobs.submit(_gated(log, "q", 1), "batch")
+    jobs.start()
+    assert jobs.cancel("turn-1") and not jobs.cancel("nope")
+    with pytest.raises(JobCancelled):
+        running.result()
+    gone = iter([False, True])
+    with pytest.raises(JobCancelled):
+        queued.result(poll=lambda: next(gone, True))   # client hung up while queued
+    gate.set()
+    while jobs.stats()["cancelled"] < 2:
+        time.sleep(0.001)
+    assert all(not entry.startswith("q") for entry in log)
+    assert len([e for e in log if e.startswith("r")]) <= 1
+
+
+def test_failed_job_reports_error():
+    jobs = JobQueue()
+
+    def boom():
+        raise RuntimeError("CUDA out of memory")
+        yield b""
+
+    job = jobs.submit(boom)
+    jobs.start()
+    with pytest.raises(RuntimeError, match="out of memory"):
+        job.result()
+    assert jobs.stats()["failed"] == 1
@@ -41,6 +41,13 @@ def contains_stop_word(text: str) -> bool:
     return bool(_stop_re and _stop_re.search(text))
 
 
+def is_stop_command(text: str) -> bool:
+    """An utterance that is (or opens with) a stop word: "stop", "Pause.",
+    "arrête la musique" — it stops the reply being spoken."""
+    lowered = strip_trigger(text).lower()
+    return any(lowered == w or lowered.startswith(w) for w in STOP_WORDS)
+
+
 def strip_stop_words(text: str) -> str:
     if not _stop_re:
         return text
@@ -65,3 +72,95 @@ def find_sentence_end(buf: str) -> int:
             if next_ch in " \n\r\t":
                 return i
     return -1
+
+
+# ── Incremental segmenter (SSE tokens → TTS chunks) ───────────────────────────
+
+# Words that end with a period without ending the sentence ("M. Dupont").
+_ABBREVIATIONS = {
+    "m", "mm", "mme", "mmes", "mlle", "mlles", "dr", "pr", "me", "st", "ste",
+    "etc", "cf", "ex", "env", "av", "apr", "min", "max", "no", "vol", "chap",
+    "fig", "tél", "bd", "hab",
+}
+_SENTENCE_END = ".!?…"
+_CLAUSE_END = ",;:"
+_CLOSERS = "»\"')]”"
+_LAST_WORD = re.compile(r"(\w+)\W*$")
+
+
+class SentenceSegmenter:
+    """
+    Cuts a token stream into chunks for TTS, remembering where it stopped
+    scanning so each token costs only its own characters.
+
+    The first chunk may end on a clause boundary (, ; :) once it is
+    ``first_clause_chars`` long, so the first TTS request goes out early;
+    later chunks are whole sentences for natural prosody. Periods after
+    French abbreviations and initials, and punctuation inside numbers
+    ("3,5", "12:30", "1.5"), are not boundaries.
+    """
+
+    def __init__(self, first_clause_chars: int = 25, min_chars: int = 5, max_chars: int = 250):
+        self.first_clause_chars = first_clause_chars
+        self.min_chars = min_chars
+        self.max_chars = max_chars
+        self._buf = ""
+        self._pos = 0           # first character not yet classified
+        self.emitted = 0
+
+    def feed(self, token: str) -> list[str]:
+        """Add a token; return the chunks it completed (possibly none)."""
+        self._buf += token
+        out = []
+        while True:
+            cut = self._scan()
+            if cut is None:
+                return out
+            chunk, self._buf, self._pos = self._buf[:cut].strip(), self._buf[cut:].lstrip(), 0
+            if chunk:
+                out.append(chunk)
+                self.emitted += 1
+
+    def flush(self) -> str:
+        """End of stream: return whatever is left."""
+        rest, self._buf, self._pos = self._buf.strip(), "", 0
+        if rest:
+            self.emitted += 1
+        return rest
+
+    def _scan(self) -> int | None:
+        buf, n = self._buf, len(self._buf)
+        i = self._pos
+        while i < n:
+            ch = buf[i]
+            if ch in _SENTENCE_END or (ch in _CLAUSE_END and self.emitted == 0):
+                j = i + 1
+                while j < n and (buf[j] in _SENTENCE_END or buf[j] in _CLOSERS):
+                    j += 1
+                if j >= n:
+                    self._pos = i           # need the next character to decide
+                    return None
+                if buf[j].isspace() and self._is_boundary(i, ch):
+                    return j
+                i = j
+                continue
+            i += 1
+        self._pos = n
+        if n > self.max_chars:              # no boundary in sight: cut at a word
+            cut = buf.rfind(" ", 0, self.max_chars)
+            return cut if cut > 0 else self.max_chars
+        return None
+
+    def _is_boundary(self, i: int, ch: str) -> bool:
+        head = self._buf[:i].strip()
+        if ch in _CLAUSE_END:
+            return len(head) >= self.first_clause_chars
+        if len(head) < self.min_chars:
+            return False
+        if ch == ".":
+            m = _LAST_WORD.search(head)
+            if m and m.end(1) == len(head):
+                word = m.group(1)
+                if word.lower() in _ABBREVIATIONS or (len(word) == 1 and word.isupper()):
+                    return False
+        return True
@@ -3,15 +3,24 @@ TTS module — XTTS v2 only.
 
 Provides:
   generate_tts(text)           → (audio_bytes, mime_type)
+  stream_tts(text)             → (format, PCM chunks as XTTS produces them)
   speak(text)                  → simple cast (used by /speak scheduler endpoint)
   play_audio_blocking(…)       → cast + block + stop_event support (used by pipeline)
   play_chime()                 → non-blocking trigger confirmation sound
-
-Also starts two HTTP servers at import time:
-  :{TTS_PORT}   — serves the latest TTS audio to the Chromecast
-  :{SPEAK_PORT} — POST /speak endpoint for the Node.js scheduler
+  start_live_stream(…)         → one continuous cast stream per answer
+  finish_live_stream(…)           (sentences appended as they are ready)
+  tts_cache                    → content-addressed cache behind generate_tts
+
+Importing it starts nothing; the voice server's boot calls:
+  start_http()  — :{TTS_PORT} serves clips (/clips/<id>.wav) and live streams
+                  to the Chromecast; :{SPEAK_PORT} takes POST /speak from the
+                  Node.js scheduler, plus POST /tts-cache/prewarm and
+                  GET /tts-cache/stats (admin)
+  start_cast()  — cast connection from the device registry + zeroconf browser
+  load_chimes() — trigger confirmation sounds
 """
 import io
+import itertools
 import json
 import logging
 import os
@@ -19,93 +28,289 @@ import random
 import struct
 import threading
 import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+from email.utils import formatdate
 from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
 
 import numpy as np
-import pychromecast
 import requests
 import soundfile as sf
 
 from config import (
+    CAST_LOAD_TIMEOUT_S,
+    CAST_REGISTRY_PATH,
+    CLIP_STORE_MB,
+    CLIP_TTL_S,
+    CAST_SENTENCE_GAP_MS,
     LOCAL_IP,
     SPEAK_PORT,
+    TTS_CACHE_DIR,
+    TTS_CACHE_DISK_MB,
+    TTS_CACHE_MEMORY_MB,
     TTS_PORT,
     TTS_SPEAKER,
+    XTTS_MODEL_VERSION,
     XTTS_SERVER_URL,
     XTTS_SPEAKER,
     XTTS_SPEAKER_WAV,
     XTTS_SPEED,
+    XTTS_STREAM,
+    XTTS_STREAM_URL,
 )
+from tts_cache import TtsCache, cache_key
+from cast_registry import CastDevice, CastDiscovery, DeviceRegistry
+from cast_tracker import ClipWatch, PlaybackTracker
+from clip_store import EXTENSIONS, Clip, ClipStore, byte_range
+from live_stream import LiveStream
+from wav_stream import WavFormat, iter_pcm, pcm_to_wav
+
+if TYPE_CHECKING:
+    import pychromecast
 
 log = logging.getLogger("voice")
 
 # ── TTS generation — XTTS v2 ─────────────────────────────────────────────────
 
-def generate_tts(text: str) -> tuple[bytes, str]:
-    """Call the local XTTS server and return (wav_bytes, 'audio/wav')."""
+# One pooled keep-alive session for every synthesis request.
+_xtts_session = requests.Session()
+_xtts_session.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
+
+tts_cache = TtsCache(TTS_CACHE_DIR or None, TTS_CACHE_MEMORY_MB << 20, TTS_CACHE_DISK_MB << 20)
+
+
+def _xtts_payload(text: str) -> dict:
     payload: dict = {"text": text, "language": "fr", "speed": XTTS_SPEED}
     if XTTS_SPEAKER_WAV:
         payload["speaker_wav"] = XTTS_SPEAKER_WAV
     else:
         payload["speaker"] = XTTS_SPEAKER
-    resp = requests.post(XTTS_SERVER_URL, json=payload, timeout=30)
+    return payload
+
+
+def _tts_key(text: str) -> str:
+    params = {k: v for k, v in _xtts_payload(text).items() if k != "text"}
+    if XTTS_STREAM:
+        params["streamed"] = True           # model-side speed, not time-stretched
+    if XTTS_SPEAKER_WAV:
+        # A re-recorded reference clip is a different voice.
+        try:
+            st = os.stat(XTTS_SPEAKER_WAV)
+            params["speaker_wav_stamp"] = [st.st_size, int(st.st_mtime)]
+        except OSError:
+            pass
+    return cache_key(text, model=XTTS_MODEL_VERSION, **params)
+
+
+def stream_tts(text: str, priority: str = "interactive") -> tuple[WavFormat, Iterator[bytes]]:
+    """Synthesize via POST /tts/stream: the WAV format and PCM chunks, each
+    yielded as soon as the XTTS server sends it."""
+    t0 = time.monotonic()
+    resp = _xtts_session.post(XTTS_STREAM_URL, json={**_xtts_payload(text), "priority": priority},
+                              stream=True, timeout=30)
     resp.raise_for_status()
-    return resp.content, "audio/wav"
+    try:
+        fmt, pcm = iter_pcm(resp.iter_content(chunk_size=None))
+    except Exception:
+        resp.close()
+        raise
+
+    def chunks() -> Iterator[bytes]:
+        with resp:
+            for i, data in enumerate(pcm):
+                if i == 0:
+                    log.debug(f"TTS stream: first audio after {(time.monotonic() - t0) * 1000:.0f} ms")
+                yield data
+
+    return fmt, chunks()
+
+
+def _synthesize(text: str, priority: str = "interactive") -> bytes:
+    """``priority`` is the XTTS server's queue class: interactive,
+    announcement or batch."""
+    if XTTS_STREAM:
+        fmt, pcm = stream_tts(text, priority)
+        return pcm_to_wav(fmt, b"".join(pcm))
+    resp = _xtts_session.post(XTTS_SERVER_URL, json={**_xtts_payload(text), "priority": priority},
+                              timeout=30)
+    resp.raise_for_status()
+    return resp.content
+
+
+def generate_tts(text: str) -> tuple[bytes, str]:
+    """Return (wav_bytes, 'audio/wav') for ``text``, from the cache or XTTS."""
+    return tts_cache.fetch(_tts_key(text), lambda: _synthesize(text)), "audio/wav"
+
+
+def prewarm_tts(phrases: list[str]) -> dict:
+    """Synthesize ``phrases`` into the cache ahead of time."""
+    # Batch class: a live answer arriving meanwhile goes ahead of these.
+    return tts_cache.prewarm(phrases, _tts_key, lambda text: _synthesize(text, "batch"))
 
 
 # ── TTS HTTP server (Chromecast fetches audio from here) ─────────────────────
 
-_tts_audio: bytes = b""
-_tts_mime: str = "audio/wav"
-_tts_lock = threading.Lock()
+clip_store = ClipStore(CLIP_STORE_MB << 20, CLIP_TTL_S)
+_live_lock = threading.Lock()
+_live_streams: dict[str, LiveStream] = {}       # /live/<id>.wav → open turn stream
+_live_watches: dict[str, ClipWatch] = {}
+_play_seq = itertools.count()
+
+
+def clip_url(audio: bytes, mime: str) -> str:
+    """Store ``audio`` and return a URL the cast device can fetch it from.
+
+    The query makes every play a distinct content id for the status
+    listener, even when the same clip is played twice.
+    """
+    clip_id = clip_store.put(audio, mime)
+    ext = EXTENSIONS.get(mime, "bin")
+    return f"http://{LOCAL_IP}:{TTS_PORT}/clips/{clip_id}.{ext}?p={next(_play_seq)}"
 
 
 class _TtsHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive; chunked transfer for live streams
+
     def do_GET(self):
-        with _tts_lock:
-            audio, mime = _tts_audio, _tts_mime
+        path = urlsplit(self.path).path
+        if path.startswith("/live/"):
+            self._serve_live(path[len("/live/"):].split(".")[0])
+        elif path.startswith("/clips/"):
+            self._serve_clip(path[len("/clips/"):].split(".")[0], body=True)
+        else:
+            self.send_error(404)
+
+    def do_HEAD(self):
+        path = urlsplit(self.path).path
+        if path.startswith("/clips/"):
+            self._serve_clip(path[len("/clips/"):].split(".")[0], body=False)
+        else:
+            self.send_error(404)
+
+    def _serve_clip(self, clip_id: str, body: bool) -> None:
+        clip = clip_store.get(clip_id)
+        if clip is None:
+            self.send_error(404)
+            return
+        if self.headers.get("If-None-Match") == clip.etag:
+            self.send_response(304)
+            self._clip_headers(clip)
+            self.end_headers()
+            return
+        size = len(clip.data)
+        span = byte_range(self.headers.get("Range"), size)
+        if span == "unsatisfiable":
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        start, end = span or (0, size - 1)
+        self.send_response(206 if span else 200)
+        self._clip_headers(clip)
+        self.send_header("Content-Type", clip.mime)
+        self.send_header("Content-Length", str(end - start + 1))
+        if span:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+        self.end_headers()
+        if body:
+            try:
+                self.wfile.write(clip.data[start:end + 1])
+            except (BrokenPipeError, ConnectionResetError):
+                self.close_connection = True
+
+    def _clip_headers(self, clip: Clip) -> None:
+        # Content-addressed: a clip id never changes meaning.
+        self.send_header("ETag", clip.etag)
+        self.send_header("Last-Modified", formatdate(clip.stored, usegmt=True))
+        self.send_header("Cache-Control", f"public, max-age={int(CLIP_TTL_S)}, immutable")
+        self.send_header("Accept-Ranges", "bytes")
+
+    def _serve_live(self, stream_id: str) -> None:
+        with _live_lock:
+            stream = _live_streams.get(stream_id)
+        if stream is None:
+            self.send_error(404)
+            return
         self.send_response(200)
-        self.send_header("Content-Type", mime)
-        self.send_header("Content-Length", str(len(audio)))
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Transfer-Encoding", "chunked")
         self.end_headers()
-        self.wfile.write(audio)
+        try:
+            for data in stream.reader():
+                self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        self.close_connection = True
 
     def log_message(self, *_):
         pass
 
 
-_http_server = ThreadingHTTPServer(("0.0.0.0", TTS_PORT), _TtsHandler)
-threading.Thread(target=_http_server.serve_forever, daemon=True).start()
-log.info(f"TTS HTTP server on :{TTS_PORT}")
-
-
 # ── Chromecast discovery ──────────────────────────────────────────────────────
 
-_cast: pychromecast.Chromecast | None = None
+_cast: "pychromecast.Chromecast | None" = None
+_cast_lock = threading.Lock()
+playback_tracker = PlaybackTracker()        # media status listener: clip start/end events
+cast_registry = DeviceRegistry(CAST_REGISTRY_PATH)
 
 
-def _discover_cast(name: str) -> None:
+def _connect_cast(device: CastDevice) -> None:
+    """(Re)connect to ``device`` unless already connected at that address."""
     global _cast
-    log.info(f"Discovering '{name}' via Bonjour…")
-    try:
-        chromecasts, browser = pychromecast.get_chromecasts(timeout=10)
-        pychromecast.discovery.stop_discovery(browser)
-        device = next(
-            (cc for cc in chromecasts if cc.name.lower() == name.lower()), None
-        )
-        if not device:
-            log.warning(f"'{name}' not found on the network.")
+    with _cast_lock:
+        if _cast is not None and (_cast.cast_info.host, _cast.cast_info.port) == (device.host, device.port):
             return
-        host, port = device.cast_info.host, device.cast_info.port
-        log.info(f"Found '{name}' at {host}:{port} — connecting…")
-        _cast = pychromecast.get_chromecast_from_host((host, port, None, None, name))
-        _cast.wait()
-        log.info(f"Connected to '{_cast.name}'")
-    except Exception as e:
-        log.error(f"Cast discovery failed: {e}")
+        log.info(f"Connecting to '{device.name}' at {device.host}:{device.port}…")
+        cast = None
+        try:
+            import pychromecast
+            cast = pychromecast.get_chromecast_from_host(device.address)
+            cast.wait(timeout=10)
+            if cast.status is None:
+                cast.disconnect(blocking=False)
+                log.warning(f"'{device.name}' did not answer at {device.host}:{device.port}")
+                return
+            cast.media_controller.register_status_listener(playback_tracker)
+        except Exception as e:
+            log.error(f"Cast connection failed: {e}")
+            if cast is not None:
+                cast.disconnect(blocking=False)     # e.g. wait() timed out half-open
+            return
+        old, _cast = _cast, cast
+    if old is not None:
+        old.disconnect(blocking=False)
+    log.info(f"Connected to '{cast.name}'")
+
+
+def _on_cast_device(device: CastDevice, changed: bool) -> None:
+    if device.name.lower() == TTS_SPEAKER.lower() and (changed or _cast is None):
+        threading.Thread(target=_connect_cast, args=(device,), daemon=True).start()
+
 
+cast_discovery = CastDiscovery(cast_registry, _on_cast_device)
 
-_discover_cast(TTS_SPEAKER)
+
+def start_cast() -> None:
+    """Connect from the cached registry entry and start the zeroconf browser.
+
+    Returns at once: the connection is made in the background and the
+    browser reconnects when the speaker shows up at a new address.
+    """
+    cached = cast_registry.get(TTS_SPEAKER)
+    if cached is not None:
+        threading.Thread(target=_connect_cast, args=(cached,), daemon=True).start()
+    else:
+        log.info(f"'{TTS_SPEAKER}' not in the cast registry yet — waiting for discovery")
+    cast_discovery.start()
+
+
+def cast_connected() -> bool:
+    return _cast is not None
 
 
 # ── WAV duration helper ───────────────────────────────────────────────────────
@@ -142,49 +347,76 @@ def play_audio_blocking(
         log.debug("No cast device — skipping playback.")
         return
 
-    audio_id = int(time.time() * 1000)
-    ext = "wav" if "wav" in mime else "mp3"
+    url = clip_url(audio, mime)
+    duration = _wav_duration(audio) if "wav" in mime else max(1.0, len(audio) / 16_000)
+    log.debug(f"Playback: ~{duration:.1f}s ({len(audio)} bytes, {mime})")
+    watch = playback_tracker.expect(url, duration)
+    try:
+        _cast.media_controller.play_media(url, mime)
+        # Resolved by the receiver's IDLE status for this url; the timeout only
+        # covers a lost connection.
+        outcome = watch.wait(stop_event, timeout=duration + CAST_LOAD_TIMEOUT_S)
+        if outcome == "stopped":
+            _stop_cast()
+        elif outcome != "finished":
+            log.warning(f"Playback ended: {outcome} ({duration:.1f}s clip)")
+    except Exception as e:
+        log.error(f"Playback error: {e}")
 
-    with _tts_lock:
-        global _tts_audio, _tts_mime
-        _tts_audio, _tts_mime = audio, mime
 
-    url = f"http://{LOCAL_IP}:{TTS_PORT}/tts.{ext}?t={audio_id}"
+def _stop_cast() -> None:
     try:
-        mc = _cast.media_controller
-        mc.play_media(url, mime)
-        mc.block_until_active(timeout=10)
+        _cast.media_controller.stop()
+    except Exception:
+        pass
 
-        duration = _wav_duration(audio) if "wav" in mime else max(1.0, len(audio) / 16_000)
-        log.debug(f"Playback: ~{duration:.1f}s ({len(audio)} bytes, {mime})")
-
-        # Phase 1 — sleep for most of the duration, checking stop_event every 50ms
-        deadline1 = time.time() + max(0.1, duration - 0.5)
-        while time.time() < deadline1:
-            if stop_event.is_set():
-                try:
-                    mc.stop()
-                except Exception:
-                    pass
-                return
-            time.sleep(0.05)
-
-        # Phase 2 — poll player_state for the tail
-        deadline2 = time.time() + 1.0
-        while time.time() < deadline2:
-            if stop_event.is_set():
-                try:
-                    mc.stop()
-                except Exception:
-                    pass
-                return
-            if getattr(mc.status, "player_state", None) not in ("PLAYING", "BUFFERING"):
-                break
-            time.sleep(0.1)
 
-        time.sleep(0.2)  # short tail buffer for clean transition
+# ── Live stream: one cast session per answer ─────────────────────────────────
+
+LIVE_FORMAT = WavFormat(24000)      # XTTS output rate
+
+
+def start_live_stream(first_wav: bytes, stop_event: threading.Event) -> LiveStream | None:
+    """Open a live stream holding ``first_wav`` and point the cast device at it.
+
+    Later sentences go in with ``stream.append_wav()``; the device plays them
+    back to back without reloading. Returns None when there is no device.
+    """
+    if not _cast:
+        log.debug("No cast device — skipping playback.")
+        return None
+    stream = LiveStream(LIVE_FORMAT, stop_event, gap_ms=CAST_SENTENCE_GAP_MS)
+    stream.append_wav(first_wav)
+    url = f"http://{LOCAL_IP}:{TTS_PORT}/live/{stream.id}.wav"
+    with _live_lock:
+        _live_streams[stream.id] = stream
+        _live_watches[stream.id] = playback_tracker.expect(url, duration_s=None)
+    try:
+        _cast.media_controller.play_media(url, "audio/wav", stream_type="LIVE")
     except Exception as e:
-        log.error(f"Playback error: {e}")
+        log.error(f"Live stream error: {e}")
+        with _live_lock:
+            _live_streams.pop(stream.id, None)
+            _live_watches.pop(stream.id, None)
+        return None
+    return stream
+
+
+def finish_live_stream(stream: LiveStream) -> None:
+    """Close the stream and block until it has played (or its turn is stopped)."""
+    if not stream.close():
+        return                          # already being finished elsewhere
+    with _live_lock:
+        watch = _live_watches.pop(stream.id, None)
+    watch.duration_s = stream.duration_s    # final now: end lag is measured against it
+    # The receiver goes IDLE once the closed stream has played out.
+    outcome = watch.wait(stream.cancel, timeout=stream.ahead_s() + CAST_LOAD_TIMEOUT_S)
+    if outcome != "finished":
+        _stop_cast()
+    with _live_lock:
+        _live_streams.pop(stream.id, None)
+    log.info(f"Live stream {outcome}: {stream.sentences} sentence(s), {stream.duration_s:.1f}s, "
+             f"{stream.underrun_s * 1000:.0f} ms of underrun silence")
 
 
 # ── Simple speak (used by the /speak scheduler endpoint) ─────────────────────
@@ -199,12 +431,7 @@ def speak(text: str) -> None:
         audio, mime = generate_tts(text)
         log.debug(f"TTS generated in {time.time() - t0:.1f}s ({len(audio)} bytes)")
 
-        with _tts_lock:
-            global _tts_audio, _tts_mime
-            _tts_audio, _tts_mime = audio, mime
-
-        ext = "wav" if "wav" in mime else "mp3"
-        url = f"http://{LOCAL_IP}:{TTS_PORT}/tts.{ext}?t={int(time.time())}"
+        url = clip_url(audio, mime)
         mc = _cast.media_controller
         mc.play_media(url, mime)
         mc.block_until_active(timeout=10)
@@ -255,22 +482,52 @@ def _generate_fallback_chime() -> bytes:
     return buf.getvalue()
 
 
-_CHIME_WAVS: list[bytes] = _load_chimes()
-if _CHIME_WAVS:
-    log.info(f"Chimes loaded: {len(_CHIME_WAVS)} phrase(s) from {_CHIMES_DIR}")
-else:
-    try:
-        _CHIME_WAVS = [_generate_fallback_chime()]
-        log.info("No chimes found — using fallback beep (run scripts/generate_chimes.py)")
-    except Exception as _e:
-        log.warning(f"Could not generate fallback chime: {_e}")
+# Spoken confirmations used when assets/chimes/ is empty, once prewarmed
+# into the TTS cache (never synthesized on the trigger path).
+CHIME_PHRASES = ["Oui ?", "Je t'écoute.", "Ok.", "Dis-moi."]
+
+# Replies common enough to keep synthesized (intent confirmations, chimes).
+PREWARM_PHRASES = CHIME_PHRASES + [
+    "D'accord.", "C'est fait.", "Compris.", "Je m'en occupe.", "Ça marche.",
+    "Désolée, je n'ai pas compris.", "Je n'ai pas réussi à joindre le serveur.",
+]
+
+_CHIME_WAVS: list[bytes] = []
+_CHIME_ASSETS = False
+
+
+def load_chimes() -> int:
+    """Read assets/chimes/ (or build the fallback beep); returns the count."""
+    global _CHIME_WAVS, _CHIME_ASSETS
+    wavs = _load_chimes()
+    _CHIME_ASSETS = bool(wavs)
+    if wavs:
+        log.info(f"Chimes loaded: {len(wavs)} phrase(s) from {_CHIMES_DIR}")
+    else:
+        try:
+            wavs = [_generate_fallback_chime()]
+            log.info("No chimes found — using cached phrases or fallback beep "
+                     "(run scripts/generate_chimes.py)")
+        except Exception as e:
+            log.warning(f"Could not generate fallback chime: {e}")
+    _CHIME_WAVS = wavs
+    return len(wavs)
+
+
+def _pick_chime() -> bytes | None:
+    if not _CHIME_ASSETS:
+        keys = [k for k in map(_tts_key, CHIME_PHRASES) if tts_cache.contains(k)]
+        wav = tts_cache.get(random.choice(keys)) if keys else None
+        if wav:
+            return wav
+    return random.choice(_CHIME_WAVS) if _CHIME_WAVS else None
 
 
 def play_chime() -> None:
     """Play a random confirmation phrase (or fallback beep) on the cast device."""
-    if not _CHIME_WAVS:
+    wav = _pick_chime()
+    if wav is None:
         return
-    wav = random.choice(_CHIME_WAVS)
     _ev = threading.Event()  # never set → plays to completion
     threading.Thread(
         target=play_audio_blocking, args=(wav, "audio/wav", _ev), daemon=True
@@ -283,23 +540,50 @@ class _SpeakHandler(BaseHTTPRequestHandler):
     def do_POST(self):
         try:
             length = int(self.headers.get("Content-Length", 0))
-            body = json.loads(self.rfile.read(length))
-            text = body.get("text", "").strip()
+            body = json.loads(self.rfile.read(length) or b"{}")
         except Exception:
             self.send_response(400)
             self.end_headers()
             return
 
+        if self.path == "/tts-cache/prewarm":
+            # body: {"phrases": [...]} — defaults to PREWARM_PHRASES
+            phrases = body.get("phrases") or PREWARM_PHRASES
+            self._send_json(202, {"queued": len(phrases)})
+            threading.Thread(target=prewarm_tts, args=(list(phrases),), daemon=True).start()
+            return
+
+        text = str(body.get("text", "")).strip()
         self.send_response(200)
         self.end_headers()
 
         if text:
             threading.Thread(target=speak, args=(text,), daemon=True).start()
 
+    def do_GET(self):
+        if self.path == "/tts-cache/stats":
+            self._send_json(200, tts_cache.stats())
+        else:
+            self.send_error(404)
+
+    def _send_json(self, code: int, obj) -> None:
+        data = json.dumps(obj).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
     def log_message(self, *_):
         pass
 
 
-_speak_server = ThreadingHTTPServer(("0.0.0.0", SPEAK_PORT), _SpeakHandler)
-threading.Thread(target=_speak_server.serve_forever, daemon=True).start()
-log.info(f"Speak HTTP endpoint on :{SPEAK_PORT}")
+# ── Startup ───────────────────────────────────────────────────────────────────
+
+def start_http() -> None:
+    """Start the clip server (:TTS_PORT) and the /speak endpoint (:SPEAK_PORT)."""
+    for port, handler, what in ((TTS_PORT, _TtsHandler, "TTS HTTP server"),
+                                (SPEAK_PORT, _SpeakHandler, "Speak HTTP endpoint")):
+        server = ThreadingHTTPServer(("0.0.0.0", port), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        log.info(f"{what} on :{port}")
@@ -0,0 +1,206 @@
+"""Content-addressed cache of synthesized speech.
+
+Much of what Yui says repeats word for word ("D'accord.", "C'est fait.",
+timer confirmations), and XTTS takes seconds per sentence. Audio is keyed by
+a hash of everything that changes the waveform — text, voice, speed,
+language, model version — and kept in two tiers: an in-memory LRU for the
+hot phrases and a directory of WAV files that survives restarts. Both tiers
+are bounded by size; the least recently used entries go first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+log = logging.getLogger("voice")
+
+
+def cache_key(text: str, **params) -> str:
+    """Stable hash of ``text`` (whitespace-normalized) and synthesis params."""
+    blob = json.dumps({"text": " ".join(text.split()), **params},
+                      sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class TtsCache:
+    """Two-tier LRU: ``memory_bytes`` in RAM, ``disk_bytes`` under ``directory``.
+
+    ``directory=None`` keeps the memory tier only.
+    """
+
+    def __init__(self, directory: Optional[str] = None,
+                 memory_bytes: int = 32 << 20, disk_bytes: int = 512 << 20):
+        self.directory = directory
+        self.memory_bytes = memory_bytes
+        self.disk_bytes = disk_bytes
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_size = 0
+        self._disk: OrderedDict[str, int] = OrderedDict()     # key → file size
+        self._disk_size = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.synth_s = 0.0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._scan()
+
+    def _scan(self) -> None:
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".wav"):
+                continue
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((st.st_mtime, name[:-4], st.st_size))
+        for _, key, size in sorted(entries):
+            self._disk[key] = size
+            self._disk_size += size
+        self._evict_disk()
+        if self._disk:
+            log.info(f"TTS cache: {len(self._disk)} clip(s) on disk "
+                     f"({self._disk_size / 1e6:.1f} MB)")
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.wav")
+
+    # ---- tiers ----
+    def _remember(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_bytes:
+            return
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_size -= len(old)
+        self._memory[key] = audio
+        self._memory_size += len(audio)
+        while self._memory_size > self.memory_bytes:
+            _, dropped = self._memory.popitem(last=False)
+            self._memory_size -= len(dropped)
+            self.evictions += 1
+
+    def _evict_disk(self) -> None:
+        while self._disk_size > self.disk_bytes and self._disk:
+            key, size = self._disk.popitem(last=False)
+            self._disk_size -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _store(self, key: str, audio: bytes) -> None:
+        if not self.directory or len(audio) > self.disk_bytes:
+            return
+        tmp = f"{self._path(key)}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, self._path(key))
+        except OSError as e:
+            log.warning(f"TTS cache: could not write {key[:12]}: {e}")
+            return
+        with self._lock:
+            self._disk_size += len(audio) - self._disk.pop(key, 0)
+            self._disk[key] = len(audio)
+            self._evict_disk()
+
+    # ---- API ----
+    def get(self, key: str) -> Optional[bytes]:
+        """Cached audio for ``key`` (memory first, then disk), or None."""
+        with self._lock:
+            audio = self._memory.get(key)
+            if audio is not None:
+                self._memory.move_to_end(key)
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+                self.memory_hits += 1
+                return audio
+            on_disk = key in self._disk
+        if on_disk:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as f:
+                    audio = f.read()
+                os.utime(path)                  # keeps LRU order across restarts
+            except OSError:
+                audio = None
+            with self._lock:
+                if audio is None:
+                    self._disk_size -= self._disk.pop(key, 0)
+                else:
+                    self._disk.move_to_end(key)
+                    self.disk_hits += 1
+                    self._remember(key, audio)
+                    return audio
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def contains(self, key: str) -> bool:
+        with self._lock:
+            return key in self._memory or key in self._disk
+
+    def put(self, key: str, audio: bytes) -> None:
+        with self._lock:
+            self._remember(key, audio)
+        self._store(key, audio)
+
+    def fetch(self, key: str, synthesize: Callable[[], bytes]) -> bytes:
+        """Cached audio for ``key``, synthesizing and storing it on a miss."""
+        audio = self.get(key)
+        if audio is not None:
+            return audio
+        t0 = time.monotonic()
+        audio = synthesize()
+        with self._lock:
+            self.synth_s += time.monotonic() - t0
+        self.put(key, audio)
+        return audio
+
+    def prewarm(self, phrases: Iterable[str], key_fn: Callable[[str], str],
+                synthesize: Callable[[str], bytes]) -> dict:
+        """Synthesize every phrase not cached yet; returns counts."""
+        added = cached = failed = 0
+        for phrase in phrases:
+            phrase = phrase.strip()
+            if not phrase:
+                continue
+            key = key_fn(phrase)
+            if self.contains(key):
+                cached += 1
+                continue
+            try:
+                self.put(key, synthesize(phrase))
+                added += 1
+            except Exception as e:
+                log.warning(f"TTS cache prewarm failed ({phrase[:40]!r}): {e}")
+                failed += 1
+        log.info(f"TTS cache prewarm: {added} added, {cached} already cached, {failed} failed")
+        return {"added": added, "cached": cached, "failed": failed}
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.memory_hits + self.disk_hits
+            lookups = hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_size,
+                "disk_entries": len(self._disk),
+                "disk_bytes": self._disk_size,
+                "avg_miss_synth_ms": round(1000 * self.synth_s / self.misses, 1) if self.misses else 0.0,
+            }
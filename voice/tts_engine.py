@@ -11,27 +11,211 @@ Exposes a simple HTTP API for voice_pipeline.py:
       "language":    "fr",
       "speaker":     "Lilya Stainthorpe",   # built-in speaker
       "speaker_wav": "/path/to/ref.wav",    # voice clone (overrides speaker)
-      "speed":       1.2                    # playback speed multiplier (default 1.0)
+      "speed":       1.2,                   # playback speed multiplier (default 1.0)
+      "priority":    "interactive",         # | "announcement" | "batch"
+      "job_id":      "…"                    # optional, for DELETE /jobs/<id>
     }
     → audio/wav
 
-  GET  /speakers   → JSON list of built-in speaker names
-  GET  /health     → 200 OK
+  POST /tts/stream
+    same body; audio is generated with XTTS streaming inference and sent
+    chunk by chunk (Transfer-Encoding: chunked) as soon as each is ready:
+    a 44-byte WAV header with unknown sizes (0xFFFFFFFF), then 16-bit mono
+    PCM at 24 kHz. Speed is applied by the model (no post time-stretch).
+    → audio/wav
+
+  GET  /speakers   → JSON list of built-in speaker names (503 while loading)
+  GET  /health     → 200, JSON {"status": "loading" | "ok", "profile": {…}, "latents": {…}, "queue": {…}}
+  GET  /ready      → 200 once the model is loaded, 503 before
+  GET  /jobs       → queue depth per class, completed/cancelled counts, wait/total latency
+  DELETE /jobs/<id> → cancel a queued or running synthesis (204, or 404 if unknown)
+
+Requests are served on threads, but syntheses run one at a time on a single
+worker (xtts_queue.py), most urgent class first: an interactive reply never
+waits behind an announcement or a batch prewarm, and takes over a running
+background stream at its next chunk (the background job restarts from the
+beginning afterwards, so its audio is only sent once it has completed).
+A job is dropped when its client disconnects.
+
+Speaker conditioning latents (GPT latent + speaker embedding) are computed
+once per reference WAV (path, mtime, size) or built-in speaker and reused;
+with XTTS_PERSIST_LATENTS=1 they are also saved as <speaker_wav>.xtts-latents.pt
+so a restart doesn't recompute them.
+
+Startup: the HTTP server and the job queue come up before torch is even
+imported, so /health answers and requests queue while the model loads. The
+first (cold) load goes through TTS(); the initialized weights and speaker
+table are then saved to XTTS_WARM_CACHE (data/xtts-warm.pt), and later
+starts rebuild the model on the meta device and assign the cached tensors
+memory-mapped (no random init, no checkpoint re-parsing). The cache is
+keyed on the torch version and the checkpoint file; any mismatch or error
+falls back to a cold load.
+
+Profiles (XTTS_PROFILE):
+  gpu  (default)  XTTS_DEVICE=cuda, float32, librosa time-stretch for /tts speed
+  cpu             XTTS_DEVICE=cpu, XTTS_THREADS intra-op threads (default: all
+                  cores), int8 dynamic quantization of the GPT cached in
+                  XTTS_CPU_CACHE, speed applied by the model
+                  (XTTS_QUANTIZE / XTTS_NATIVE_SPEED override either profile)
+  Compare them with scripts/bench_tts.py.
 
 Run with:
   /home/chuya/.venvs/xtts/bin/python src/xtts_server.py
 """
 
-import io, json, os, warnings
+import io, json, os, select, socket, threading, time, warnings
 warnings.filterwarnings("ignore")
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from wav_stream import WavFormat, wav_header   # stdlib-only, shared with voice/tts.py
+from xtts_queue import PRIORITIES, JobCancelled, JobQueue
 
 PORT     = int(os.getenv("XTTS_PORT", "18770"))
 LANGUAGE = os.getenv("XTTS_LANG", "fr")
-DEVICE   = os.getenv("XTTS_DEVICE", "cuda")
+PROFILE  = os.getenv("XTTS_PROFILE", "gpu")      # "cpu": no-GPU box, see _apply_cpu_profile
+CPU      = PROFILE == "cpu"
+DEVICE   = os.getenv("XTTS_DEVICE", "cpu" if CPU else "cuda")
+THREADS  = int(os.getenv("XTTS_THREADS") or 0) or os.cpu_count() or 1
+QUANTIZE = os.getenv("XTTS_QUANTIZE", "1" if CPU else "0") == "1"
+NATIVE_SPEED = os.getenv("XTTS_NATIVE_SPEED", "1" if CPU else "0") == "1"
+_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "data")
+CPU_CACHE  = os.getenv("XTTS_CPU_CACHE", os.path.join(_DATA, "xtts-gpt-int8.pt"))
+WARM_CACHE = os.getenv("XTTS_WARM_CACHE", os.path.join(_DATA, "xtts-warm.pt"))   # "" disables
+MODEL_NAME = "tts_models/multilingual/multi-dataset/xtts_v2"
+DEFAULT_SPEAKER = os.getenv("XTTS_SPEAKER", "Lilya Stainthorpe")
+DEFAULT_SPEED   = float(os.getenv("XTTS_SPEED", "1.15"))
+SAMPLE_RATE     = 24000
+STREAM_CHUNK    = int(os.getenv("XTTS_STREAM_CHUNK", "20"))   # GPT tokens per streamed chunk
+PERSIST_LATENTS = os.getenv("XTTS_PERSIST_LATENTS", "0") == "1"
+
+jobs = JobQueue()       # the only thread that touches the model; started once it is loaded
+loaded = threading.Event()
+_boot = time.monotonic()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # chunked responses, keep-alive clients
+
+    def do_POST(self):
+        if self.path not in ("/tts", "/tts/stream"):
+            self.send_error(404); return
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length))
+        text        = body.get("text", "")
+        language    = body.get("language", LANGUAGE)
+        speaker     = body.get("speaker", DEFAULT_SPEAKER)
+        speaker_wav = body.get("speaker_wav")
+        speed       = float(body.get("speed", DEFAULT_SPEED))
+        priority    = body.get("priority", "interactive")
+        if priority not in PRIORITIES:
+            self.send_error(400, f"priority must be one of {', '.join(PRIORITIES)}"); return
+        if self.path == "/tts/stream":
+            job = jobs.submit(lambda: generate_stream(text, language, speaker, speaker_wav, speed),
+                              priority, body.get("job_id"))
+            self._stream(job)
+            return
+        job = jobs.submit(lambda: iter([generate(text, language, speaker, speaker_wav, speed)]),
+                          priority, body.get("job_id"))
+        try:
+            audio = job.result(poll=self._client_gone)
+        except JobCancelled:
+            self.close_connection = True
+            return
+        except Exception as e:
+            self.send_error(500, str(e)); return
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Content-Length", str(len(audio)))
+        self.send_header("X-Job-Id", job.id)
+        self.end_headers()
+        self.wfile.write(audio)
 
-print("Loading XTTS v2 model…", flush=True)
+    def _stream(self, job):
+        chunks = job.chunks(poll=self._client_gone)
+        try:
+            first = next(chunks, b"")
+        except JobCancelled:
+            self.close_connection = True
+            return
+        except Exception as e:
+            self.send_error(500, str(e)); return
+        self.send_response(200)
+        self.send_header("Content-Type", "audio/wav")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("X-Job-Id", job.id)
+        self.end_headers()
+        try:
+            self._chunk(wav_header(WavFormat(SAMPLE_RATE)) + first)
+            for pcm in chunks:
+                self._chunk(pcm)
+        except (BrokenPipeError, ConnectionResetError, JobCancelled):
+            job.cancel()                    # client gave up (turn cancelled)
+            self.close_connection = True
+            return
+        except Exception:
+            # Headers are out: end the body early, the client sees a short clip.
+            import traceback; traceback.print_exc()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _chunk(self, data: bytes) -> None:
+        if data:
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+    def _client_gone(self) -> bool:
+        """True once the client closed its end while we were still working."""
+        try:
+            readable, _, _ = select.select([self.connection], [], [], 0)
+            return bool(readable) and not self.connection.recv(1, socket.MSG_PEEK)
+        except OSError:
+            return True
+
+    def do_DELETE(self):
+        # DELETE /jobs/<id> — cancel a queued or running synthesis
+        if not self.path.startswith("/jobs/"):
+            self.send_error(404); return
+        found = jobs.cancel(self.path[len("/jobs/"):])
+        self.send_response(204 if found else 404)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        if self.path == "/speakers":
+            self._json(speakers if loaded.is_set() else [], 200 if loaded.is_set() else 503)
+        elif self.path == "/health":
+            if not loaded.is_set():
+                self._json({"status": "loading", "uptime_s": round(time.monotonic() - _boot, 1),
+                            "queue": jobs.stats()})
+                return
+            self._json({"status": "ok", "profile": PROFILE_INFO, "load": LOAD_INFO,
+                        "latents": latent_cache.stats(), "queue": jobs.stats()})
+        elif self.path == "/ready":
+            self._json({"ready": loaded.is_set()}, 200 if loaded.is_set() else 503)
+        elif self.path == "/jobs":
+            self._json(jobs.stats())
+        else:
+            self.send_error(404)
+
+    def _json(self, data, status: int = 200) -> None:
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers(); self.wfile.write(body)
+
+    def log_message(self, fmt, *args):
+        print(f"[XTTS] {fmt % args}", flush=True)
+
+
+threading.Thread(target=ThreadingHTTPServer(("0.0.0.0", PORT), Handler).serve_forever,
+                 name="xtts-http").start()
+print(f"Listening on :{PORT} — loading XTTS v2 model…", flush=True)
 
 import torch
+if CPU:
+    # Explicit pools: intra-op threads for the matmuls, a single inter-op
+    # thread (XTTS runs one op graph at a time), set before any model work.
+    torch.set_num_threads(THREADS)
+    torch.set_num_interop_threads(int(os.getenv("XTTS_INTEROP_THREADS", "1")))
 # PyTorch 2.6 changed weights_only default to True, breaking TTS model loading
 _orig_load = torch.load
 torch.load = lambda *a, **kw: _orig_load(*a, **{**kw, "weights_only": False})
@@ -44,76 +228,213 @@ def _ta_load(filepath, *args, **kwargs):
 torchaudio.load = _ta_load
 
 os.environ["COQUI_TOS_AGREED"] = "1"
-from TTS.api import TTS
 import soundfile as sf
 import numpy as np
 import librosa
+from latent_cache import LatentCache   # stdlib-only, next to this file
+import warm_start
 
-tts = TTS("tts_models/multilingual/multi-dataset/xtts_v2").to(DEVICE)
-speakers = list(tts.synthesizer.tts_model.speaker_manager.name_to_id)
-DEFAULT_SPEAKER = os.getenv("XTTS_SPEAKER", "Lilya Stainthorpe")
-DEFAULT_SPEED   = float(os.getenv("XTTS_SPEED", "1.15"))
 
-print(f"XTTS v2 ready — {len(speakers)} speakers", flush=True)
-print(f"Default: speaker='{DEFAULT_SPEAKER}'  speed={DEFAULT_SPEED}", flush=True)
-print(f"Listening on :{PORT}", flush=True)
+def _model_dir() -> str:
+    from TTS.utils.generic_utils import get_user_data_dir
+    return os.path.join(get_user_data_dir("tts"), MODEL_NAME.replace("/", "--"))
 
 
-def generate(text: str, language: str, speaker: str | None,
-             speaker_wav: str | None, speed: float) -> bytes:
-    if speaker_wav:
-        wav = tts.tts(text=text, language=language, speaker_wav=speaker_wav)
-    else:
-        wav = tts.tts(text=text, language=language, speaker=speaker or DEFAULT_SPEAKER)
+def _warm_stamp() -> dict:
+    st = os.stat(os.path.join(_model_dir(), "model.pth"))
+    return {"torch": torch.__version__, "checkpoint": [st.st_size, int(st.st_mtime)]}
 
-    audio = np.array(wav, dtype=np.float32)
 
-    if speed != 1.0:
-        audio = librosa.effects.time_stretch(audio, rate=speed)
+def _load_warm():
+    """Rebuild Xtts from its config on the meta device (no allocation, no
+    random init) and assign the cached tensors, memory-mapped from disk
+    (warm_start.py)."""
+    from TTS.tts.configs.xtts_config import XttsConfig
+    from TTS.tts.layers.xtts.tokenizer import VoiceBpeTokenizer
+    from TTS.tts.layers.xtts.xtts_manager import SpeakerManager
+    from TTS.tts.models.xtts import Xtts
 
-    buf = io.BytesIO()
-    sf.write(buf, audio, 24000, format="WAV")
-    return buf.getvalue()
+    cached = torch.load(WARM_CACHE, mmap=True, map_location="cpu")
+    if cached.get("stamp") != _warm_stamp():
+        raise ValueError("stale (torch or checkpoint changed)")
+    config = XttsConfig()
+    config.load_json(os.path.join(_model_dir(), "config.json"))
+    xtts = warm_start.restore(lambda: Xtts.init_from_config(config), cached["state"])
+    xtts.tokenizer = VoiceBpeTokenizer(vocab_file=os.path.join(_model_dir(), "vocab.json"))
+    xtts.speaker_manager = SpeakerManager.__new__(SpeakerManager)
+    xtts.speaker_manager.speakers = cached["speakers"]
+    xtts.hifigan_decoder.eval()
+    xtts.gpt.init_gpt_for_inference(kv_cache=xtts.args.kv_cache, use_deepspeed=False)
+    xtts.gpt.eval()
+    return xtts.to(DEVICE)
 
 
-from http.server import BaseHTTPRequestHandler, HTTPServer
+def _warm_snapshot(xtts) -> dict:
+    """CPU copy of what _load_warm needs, taken before any quantization."""
+    return {
+        "stamp": _warm_stamp(),
+        "state": warm_start.cpu_state(xtts),
+        "speakers": {name: {k: v.detach().cpu() for k, v in latents.items()}
+                     for name, latents in xtts.speaker_manager.speakers.items()},
+    }
 
-class Handler(BaseHTTPRequestHandler):
-    def do_POST(self):
-        if self.path != "/tts":
-            self.send_error(404); return
-        length = int(self.headers.get("Content-Length", 0))
-        body = json.loads(self.rfile.read(length))
-        text        = body.get("text", "")
-        language    = body.get("language", LANGUAGE)
-        speaker     = body.get("speaker", DEFAULT_SPEAKER)
-        speaker_wav = body.get("speaker_wav")
-        speed       = float(body.get("speed", DEFAULT_SPEED))
+
+def _save_warm(snapshot: dict) -> None:
+    tmp = f"{WARM_CACHE}.tmp"
+    try:
+        os.makedirs(os.path.dirname(WARM_CACHE) or ".", exist_ok=True)
+        t0 = time.monotonic()
+        torch.save(snapshot, tmp)
+        os.replace(tmp, WARM_CACHE)
+        print(f"Warm-start cache written to {WARM_CACHE} ({time.monotonic() - t0:.1f} s)", flush=True)
+    except Exception as e:
+        print(f"Could not write warm-start cache {WARM_CACHE}: {e}", flush=True)
+
+
+def _load_model():
+    """(model, how, snapshot to save or None)."""
+    if WARM_CACHE and os.path.exists(WARM_CACHE):
         try:
-            audio = generate(text, language, speaker, speaker_wav, speed)
-            self.send_response(200)
-            self.send_header("Content-Type", "audio/wav")
-            self.send_header("Content-Length", str(len(audio)))
-            self.end_headers()
-            self.wfile.write(audio)
+            return _load_warm(), "warm", None
         except Exception as e:
-            import traceback; traceback.print_exc()
-            self.send_error(500, str(e))
+            print(f"Warm-start cache unusable ({e}) — cold load", flush=True)
+    from TTS.api import TTS
+    xtts = TTS(MODEL_NAME).to(DEVICE).synthesizer.tts_model
+    return xtts, "cold", _warm_snapshot(xtts) if WARM_CACHE else None
 
-    def do_GET(self):
-        if self.path == "/speakers":
-            body = json.dumps(speakers).encode()
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers(); self.wfile.write(body)
-        elif self.path == "/health":
-            self.send_response(200); self.end_headers()
+
+_t0 = time.monotonic()
+try:
+    model, _how, _snapshot = _load_model()
+except Exception:
+    import traceback; traceback.print_exc()
+    os._exit(1)                         # let pm2 restart us
+_load_s = time.monotonic() - _t0
+
+
+def _conv1d_to_linear(module: torch.nn.Module) -> None:
+    """Swap transformers' GPT-2 Conv1D (x @ W + b) for the equivalent
+    nn.Linear, the only layer type dynamic quantization handles."""
+    from transformers.pytorch_utils import Conv1D
+    for name, child in module.named_children():
+        if isinstance(child, Conv1D):
+            linear = torch.nn.Linear(child.weight.shape[0], child.weight.shape[1])
+            linear.weight.data = child.weight.data.t().contiguous()
+            linear.bias.data = child.bias.data
+            setattr(module, name, linear)
         else:
-            self.send_error(404)
+            _conv1d_to_linear(child)
 
-    def log_message(self, fmt, *args):
-        print(f"[XTTS] {fmt % args}", flush=True)
+
+def _apply_cpu_profile(model) -> None:
+    """int8 dynamic quantization of the GPT (autoregressive decoder, where
+    CPU time goes); the HiFi-GAN vocoder is convolutional and stays float32.
+    The quantized module is cached in XTTS_CPU_CACHE for the next start."""
+    stamp = {"torch": torch.__version__, "model": os.getenv("XTTS_MODEL_VERSION", "xtts_v2")}
+    if os.path.exists(CPU_CACHE):
+        try:
+            cached = torch.load(CPU_CACHE, map_location="cpu")
+            if cached.get("stamp") == stamp:
+                model.gpt = cached["gpt"]
+                print(f"CPU profile: quantized GPT loaded from {CPU_CACHE}", flush=True)
+                return
+        except Exception as e:
+            print(f"CPU profile: ignoring cache {CPU_CACHE}: {e}", flush=True)
+    _conv1d_to_linear(model.gpt)
+    torch.quantization.quantize_dynamic(model.gpt, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    # Rebuild the KV-cached inference wrapper around the quantized layers.
+    model.gpt.init_gpt_for_inference(kv_cache=model.args.kv_cache, use_deepspeed=False)
+    model.gpt.eval()
+    try:
+        os.makedirs(os.path.dirname(CPU_CACHE), exist_ok=True)
+        torch.save({"stamp": stamp, "gpt": model.gpt}, CPU_CACHE)
+    except Exception as e:
+        print(f"CPU profile: could not write {CPU_CACHE}: {e}", flush=True)
+
+
+if QUANTIZE:
+    _apply_cpu_profile(model)
+speakers = list(model.speaker_manager.name_to_id)
+
+PROFILE_INFO = {"profile": PROFILE, "device": DEVICE, "threads": torch.get_num_threads(),
+                "int8": QUANTIZE, "native_speed": NATIVE_SPEED}
+LOAD_INFO    = {"mode": _how, "load_s": round(_load_s, 2),
+                "ready_s": round(time.monotonic() - _boot, 2)}
+print(f"XTTS v2 ready — {len(speakers)} speakers, {_how} load in {_load_s:.1f} s "
+      f"({LOAD_INFO['ready_s']:.1f} s since start)", flush=True)
+print(f"Default: speaker='{DEFAULT_SPEAKER}'  speed={DEFAULT_SPEED}", flush=True)
+print(f"Profile: {PROFILE_INFO}", flush=True)
+
+
+def _wav_latents(path: str):
+    return model.get_conditioning_latents(audio_path=[path])
+
+
+def _builtin_latents(name: str):
+    latents = model.speaker_manager.speakers[name]
+    return latents["gpt_cond_latent"], latents["speaker_embedding"]
+
+
+def _save_latents(latents, path: str) -> None:
+    gpt_cond_latent, speaker_embedding = latents
+    torch.save({"gpt_cond_latent": gpt_cond_latent.cpu(),
+                "speaker_embedding": speaker_embedding.cpu()}, path)
+
+
+def _load_latents(path: str):
+    data = torch.load(path, map_location=DEVICE)
+    return data["gpt_cond_latent"], data["speaker_embedding"]
+
+
+latent_cache = LatentCache(
+    _wav_latents, _builtin_latents,
+    save=_save_latents if PERSIST_LATENTS else None,
+    load=_load_latents if PERSIST_LATENTS else None,
+)
+
+
+def _conditioning(speaker: str | None, speaker_wav: str | None):
+    if speaker_wav:
+        return latent_cache.get(speaker_wav=speaker_wav)
+    return latent_cache.get(speaker=speaker or DEFAULT_SPEAKER)
+
+
+def generate(text: str, language: str, speaker: str | None,
+             speaker_wav: str | None, speed: float) -> bytes:
+    # Low-level inference with cached latents: tts.tts() would recompute
+    # them from speaker_wav on every call.
+    gpt_cond_latent, speaker_embedding = _conditioning(speaker, speaker_wav)
+    out = model.inference(
+        text, language, gpt_cond_latent, speaker_embedding, enable_text_splitting=True,
+        speed=speed if NATIVE_SPEED else 1.0,
+    )
+    wav = out["wav"]
+    audio = (wav.squeeze().float().cpu().numpy() if torch.is_tensor(wav)
+             else np.array(wav, dtype=np.float32))
+
+    if speed != 1.0 and not NATIVE_SPEED:
+        audio = librosa.effects.time_stretch(audio, rate=speed)
+
+    buf = io.BytesIO()
+    sf.write(buf, audio, SAMPLE_RATE, format="WAV")
+    return buf.getvalue()
+
+
+def generate_stream(text: str, language: str, speaker: str | None,
+                    speaker_wav: str | None, speed: float):
+    """Yield PCM16 chunks as XTTS produces them."""
+    gpt_cond_latent, speaker_embedding = _conditioning(speaker, speaker_wav)
+    chunks = model.inference_stream(
+        text, language, gpt_cond_latent, speaker_embedding,
+        stream_chunk_size=STREAM_CHUNK, speed=speed, enable_text_splitting=True,
+    )
+    for chunk in chunks:
+        audio = chunk.squeeze().float().cpu().numpy()
+        yield (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2").tobytes()
 
 
-HTTPServer(("0.0.0.0", PORT), Handler).serve_forever()
+loaded.set()
+jobs.start()
+if _snapshot is not None:
+    _save_warm(_snapshot)               # after serving starts: next restart is warm
+    del _snapshot
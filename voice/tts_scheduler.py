@@ -0,0 +1,161 @@
+"""Bounded, in-order TTS synthesis scheduler.
+
+Sentences are submitted as soon as the dialogue stage cuts them, but only
+``workers`` syntheses run at once (the XTTS server is single-threaded) and
+the job with the lowest priority — the sentence that plays next — always
+goes first. Synthesis runs at most ``prefetch`` sentences ahead of what
+playback has taken; work for a cancelled turn is dropped before it starts.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Optional
+
+log = logging.getLogger("voice")
+
+
+class TtsJob:
+    """One sentence; ``get()`` blocks until it is synthesized or cancelled."""
+
+    def __init__(self, text: str, priority: tuple, cancel: threading.Event,
+                 scheduler: Optional["TtsScheduler"] = None):
+        self._scheduler = scheduler
+        self.text = text
+        self.priority = priority
+        self.cancel = cancel
+        self.submitted = time.monotonic()
+        self.wait_s = 0.0                # queued before a worker took it
+        self.synth_s = 0.0
+        self.result: Any = None
+        self.consumed = False
+        self._done = threading.Event()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """The synthesis result (None if cancelled or failed); marks it consumed."""
+        self._done.wait(timeout)
+        if self._scheduler is not None:
+            self._scheduler._consumed(self)
+        return self.result
+
+
+class TtsScheduler:
+    def __init__(self, synthesize: Callable[[str], Any], workers: int = 1, prefetch: int = 2):
+        self._synthesize = synthesize
+        self.prefetch = max(1, prefetch)
+        self._cond = threading.Condition()
+        self._heap: list[tuple[tuple, int, TtsJob]] = []
+        self._seq = itertools.count()
+        self._ready: list[TtsJob] = []          # synthesized, not yet taken by playback
+        self._running = 0
+        self._stopped = False
+        self.jobs = 0
+        self.cancelled = 0
+        self.wait_s = 0.0
+        self.synth_s = 0.0
+        for i in range(max(1, workers)):
+            threading.Thread(target=self._worker, name=f"tts-{i}", daemon=True).start()
+
+    @property
+    def depth(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    def submit(self, text: str, priority: tuple, cancel: threading.Event) -> TtsJob:
+        """Queue ``text``; lower ``priority`` plays (so is synthesized) first."""
+        job = TtsJob(text, priority, cancel, self)
+        with self._cond:
+            heapq.heappush(self._heap, (priority, next(self._seq), job))
+            self._cond.notify()
+        return job
+
+    def purge(self) -> int:
+        """Drop every queued job whose cancel event is set; returns how many."""
+        with self._cond:
+            keep, dropped = [], []
+            for entry in self._heap:
+                (dropped if entry[2].cancel.is_set() else keep).append(entry)
+            heapq.heapify(keep)
+            self._heap = keep
+            self._ready = [j for j in self._ready if not j.cancel.is_set()]
+            self.cancelled += len(dropped)
+            self._cond.notify_all()
+        for _, _, job in dropped:
+            job._done.set()
+        return len(dropped)
+
+    def stop(self) -> None:
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def _consumed(self, job: TtsJob) -> None:
+        with self._cond:
+            if not job.consumed:
+                job.consumed = True
+                if job in self._ready:
+                    self._ready.remove(job)
+                self._cond.notify_all()
+
+    def _eligible(self, job: TtsJob) -> bool:
+        """Within the prefetch window — or needed before anything already made."""
+        if len(self._ready) + self._running < self.prefetch:
+            return True
+        return all(job.priority < r.priority for r in self._ready)
+
+    def _next_job(self) -> Optional[TtsJob]:
+        with self._cond:
+            while not self._stopped:
+                while self._heap and self._heap[0][2].cancel.is_set():
+                    _, _, job = heapq.heappop(self._heap)
+                    self.cancelled += 1
+                    job._done.set()
+                if self._heap and self._eligible(self._heap[0][2]):
+                    _, _, job = heapq.heappop(self._heap)
+                    self._running += 1
+                    return job
+                self._cond.wait(0.5)
+            return None
+
+    def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                return
+            started = time.monotonic()
+            job.wait_s = started - job.submitted
+            try:
+                job.result = self._synthesize(job.text)
+            except Exception as e:
+                log.error(f"TTS error ({job.text[:40]!r}): {e}")
+            job.synth_s = time.monotonic() - started
+            log.info(f"TTS {job.text[:40]!r}: queued {job.wait_s * 1000:.0f} ms, "
+                     f"synthesized in {job.synth_s * 1000:.0f} ms")
+            with self._cond:
+                self._running -= 1
+                self.jobs += 1
+                self.wait_s += job.wait_s
+                self.synth_s += job.synth_s
+                if not job.consumed and not job.cancel.is_set():
+                    self._ready.append(job)
+                self._cond.notify_all()
+            job._done.set()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "queued": len(self._heap),
+                "running": self._running,
+                "ready": len(self._ready),
+                "jobs": self.jobs,
+                "cancelled": self.cancelled,
+                "avg_wait_ms": round(1000 * self.wait_s / self.jobs, 1) if self.jobs else 0.0,
+                "avg_synth_ms": round(1000 * self.synth_s / self.jobs, 1) if self.jobs else 0.0,
+            }
@@ -1,6 +1,7 @@
 """Utterance segmentation via an injected VAD. Feed arbitrary int16 chunks;
 returns the full utterance (np.int16) once end-of-speech (silence) or the max
-duration is reached."""
+duration is reached. The trailing silence is ``silence_ms``, or chosen per
+pause by an optional ``endpointing.Endpointer``."""
 from __future__ import annotations
 
 from typing import Optional
@@ -11,13 +12,18 @@ VAD_FRAME_MS = 30
 
 
 class UtteranceCapture:
-    def __init__(self, vad, sample_rate=16000, silence_ms=1200, max_ms=15000, prebuffer_ms=300):
+    def __init__(self, vad, sample_rate=16000, silence_ms=1200, max_ms=15000, prebuffer_ms=300,
+                 endpointer=None):
         self._vad = vad
+        self._endpointer = endpointer
         self._rate = sample_rate
         self._frame = sample_rate * VAD_FRAME_MS // 1000        # 480 @ 16k
         self._silence_frames = max(1, silence_ms // VAD_FRAME_MS)
         self._max_frames = max(1, max_ms // VAD_FRAME_MS)
         self._prebuffer_frames = prebuffer_ms // VAD_FRAME_MS
+        # Samples up to the end of the last speech frame of the current (or
+        # just returned) utterance — past it there is only trailing silence.
+        self.speech_end = 0
         self.reset()
 
     def reset(self) -> None:
@@ -28,6 +34,19 @@ class UtteranceCapture:
         self._silence_run = 0
         self._frames_since_start = 0
 
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    @property
+    def length(self) -> int:
+        """Samples collected so far for the utterance in progress."""
+        return len(self._collected) * self._frame
+
+    def audio(self) -> np.ndarray:
+        """The utterance in progress (what ``feed`` would return right now)."""
+        return np.concatenate(self._collected) if self._collected else np.zeros(0, dtype=np.int16)
+
     def feed(self, chunk_int16: np.ndarray) -> Optional[np.ndarray]:
         self._tail = np.concatenate([self._tail, chunk_int16])
         while len(self._tail) >= self._frame:
@@ -50,14 +69,27 @@ class UtteranceCapture:
                 self._prebuffer = []
                 self._frames_since_start = len(self._collected)
                 self._silence_run = 0
+                self.speech_end = self.length
+                if self._endpointer is not None:
+                    for f in self._collected:
+                        self._endpointer.observe(f, f is frame)
             return None
 
         self._collected.append(frame)
         self._frames_since_start += 1
         self._silence_run = 0 if is_speech else self._silence_run + 1
+        if is_speech:
+            self.speech_end = self.length
+        if self._endpointer is not None:
+            self._endpointer.observe(frame, is_speech)
 
-        if self._silence_run >= self._silence_frames or self._frames_since_start >= self._max_frames:
-            utterance = np.concatenate(self._collected) if self._collected else np.zeros(0, dtype=np.int16)
+        if self._silence_run >= self._required_silence() or self._frames_since_start >= self._max_frames:
+            utterance = self.audio()
             self.reset()
             return utterance
         return None
+
+    def _required_silence(self) -> int:
+        if self._endpointer is None or self._silence_run == 0:
+            return self._silence_frames
+        return max(1, self._endpointer.silence_ms() // VAD_FRAME_MS)
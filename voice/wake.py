@@ -1,9 +1,24 @@
 """Server-side OpenWakeWord detector (canonical Model; supports custom path or
-bundled model name). Mirrors the validated satellite engine."""
+bundled model name). Mirrors the validated satellite engine.
+
+One detector per room: ``fork()`` gives a detector with its own streaming
+state (feature buffers, score history, VAD/Speex state) that shares the
+loaded ONNX sessions — melspectrogram, embedding backbone, wake head, Silero
+VAD. onnxruntime sessions are safe to run from several threads.
+
+An ``EnergyGate`` in front of the models skips inference on clearly silent
+chunks (low RMS and no spectral onset). A skipped chunk still advances the
+streaming state as silence would, so the first chunk of speech is scored
+on a consistent 1.28 s window and detection isn't delayed."""
 from __future__ import annotations
 
+import copy
+import itertools
 import logging
 import os
+import time
+from collections import defaultdict, deque
+from functools import partial
 
 import numpy as np
 
@@ -11,6 +26,9 @@ log = logging.getLogger("voice")
 
 OWW_CHUNK = 1280          # 80 ms @ 16 kHz
 FLUSH_CHUNKS = 32         # ~2.5 s of silence to age out a just-fired wake word
+# Raw samples kept in the snapshot: the streaming melspectrogram only reads
+# the last (accumulated + 480) samples of the 10 s raw buffer.
+_RAW_TAIL = 4 * OWW_CHUNK
 
 # Gate wake scoring behind Silero VAD: when there's no human speech, the wake
 # score is forced to 0. Kills false positives on non-speech (birds, hum,
@@ -18,6 +36,172 @@ FLUSH_CHUNKS = 32         # ~2.5 s of silence to age out a just-fired wake word
 WAKE_VAD_THRESHOLD = float(os.getenv("WAKE_VAD_THRESHOLD", "0.5"))
 # Speex noise suppression on the wake-detector audio (needs speexdsp_ns).
 WAKE_NOISE_SUPPRESSION = os.getenv("WAKE_NOISE_SUPPRESSION", "1").lower() not in ("0", "false", "no")
+# Energy pre-gate: a chunk under WAKE_GATE_RMS (int16 units; 0 disables the
+# gate) whose loudest band energies rose by less than WAKE_GATE_FLUX_DB
+# skips OWW inference, once WAKE_GATE_HANGOVER chunks have passed since the
+# last loud one.
+WAKE_GATE_RMS = float(os.getenv("WAKE_GATE_RMS", "100"))
+WAKE_GATE_FLUX_DB = float(os.getenv("WAKE_GATE_FLUX_DB", "6"))
+WAKE_GATE_HANGOVER = int(os.getenv("WAKE_GATE_HANGOVER", "12"))
+_GATE_BANDS = 16
+# Skipped chunks re-featurized from the raw buffer when the gate opens: the
+# head's 16-embedding window plus the ~10 chunks of mel context (76 frames)
+# behind its oldest embedding.
+_PREROLL_CHUNKS = 26
+
+
+def _capture(model) -> dict:
+    """Copy of a Model's streaming state: preprocessor buffers, score
+    history and Silero VAD state (Speex keeps its C state)."""
+    pre = model.preprocessor
+    state = {
+        "raw": list(pre.raw_data_buffer)[-_RAW_TAIL:],
+        "raw_maxlen": pre.raw_data_buffer.maxlen,
+        "mel": pre.melspectrogram_buffer.copy(),
+        "features": pre.feature_buffer.copy(),
+        "accumulated": pre.accumulated_samples,
+        "scores": {k: list(v) for k, v in model.prediction_buffer.items()},
+    }
+    vad = getattr(model, "vad", None)
+    if vad is not None and model.vad_threshold > 0:
+        state["vad"] = (vad._h.copy(), vad._c.copy(), list(vad.prediction_buffer),
+                        vad.prediction_buffer.maxlen, vad._last_sr, vad._last_batch_size)
+    return state
+
+
+def _restore(model, state: dict) -> None:
+    """Put ``state`` (from ``_capture``) back into ``model`` — array copies
+    only, no inference."""
+    pre = model.preprocessor
+    pre.raw_data_buffer = deque(state["raw"], maxlen=state["raw_maxlen"])
+    pre.melspectrogram_buffer = state["mel"].copy()
+    pre.feature_buffer = state["features"].copy()
+    pre.accumulated_samples = state["accumulated"]
+    model.prediction_buffer = defaultdict(partial(deque, maxlen=30))
+    for k, scores in state["scores"].items():
+        model.prediction_buffer[k].extend(scores)
+    if "vad" in state:
+        h, c, scores, maxlen, last_sr, last_batch = state["vad"]
+        vad = model.vad
+        vad._h, vad._c = h.copy(), c.copy()
+        vad.prediction_buffer = deque(scores, maxlen=maxlen)
+        vad._last_sr, vad._last_batch_size = last_sr, last_batch
+
+
+def _advance_silent(model, chunk: np.ndarray, silent: dict) -> None:
+    """Advance ``model``'s streaming state over ``chunk`` without inference,
+    using the flushed-silence mel frames and embedding from ``silent`` (a
+    ``_capture`` snapshot). The raw audio itself is kept: the next scored
+    chunk's melspectrogram reads the samples just before it."""
+    pre = model.preprocessor
+    if getattr(model, "speex_ns", None):
+        chunk = model._suppress_noise_with_speex(chunk)
+    pre.raw_data_buffer.extend(chunk.tolist())
+    pre.melspectrogram_buffer = np.vstack(
+        (pre.melspectrogram_buffer, silent["mel"][-8:]))[-pre.melspectrogram_max_len:]
+    pre.feature_buffer = np.vstack(
+        (pre.feature_buffer, silent["features"][-1:]))[-pre.feature_buffer_max_len:]
+    for k in silent["scores"]:
+        model.prediction_buffer[k].append(0.0)
+    if "vad" in silent:
+        model.vad.prediction_buffer.append(0.0)
+
+
+def _rewind_silent(model, n: int) -> None:
+    """Undo the placeholders of the last ``n`` skipped chunks so the next
+    ``predict()`` re-featurizes them from the raw buffer (OWW's multi-chunk
+    path) — the head then scores speech onset on the real preceding audio.
+    The Silero VAD, whose gate looks 4-7 chunks back, is re-run on them."""
+    pre = model.preprocessor
+    pre.melspectrogram_buffer = pre.melspectrogram_buffer[:-8 * n]
+    pre.feature_buffer = pre.feature_buffer[:-n]
+    pre.accumulated_samples = n * OWW_CHUNK
+    vad = getattr(model, "vad", None)
+    if vad is not None and model.vad_threshold > 0:
+        tail = list(itertools.islice(reversed(pre.raw_data_buffer), n * OWW_CHUNK))
+        raw = np.array(tail[::-1], dtype=np.int16)
+        for _ in range(min(n, len(vad.prediction_buffer))):
+            vad.prediction_buffer.pop()
+        for chunk in raw.reshape(n, OWW_CHUNK):
+            vad(chunk)
+
+
+class EnergyGate:
+    """Decides per 80 ms chunk whether the wake models need to run.
+
+    A chunk is skipped when its RMS is under ``rms_floor`` *and* its
+    spectral flux (rise of log band energies over the previous chunk) is
+    under ``flux_db`` — a quiet onset still opens the gate — and
+    ``hangover`` chunks have passed since the last loud one, so word tails
+    are always scored.
+    """
+
+    def __init__(self, rms_floor: float = WAKE_GATE_RMS, flux_db: float = WAKE_GATE_FLUX_DB,
+                 hangover: int = WAKE_GATE_HANGOVER):
+        self.rms_floor = rms_floor
+        self.flux_db = flux_db
+        self.hangover = hangover
+        self._window = np.hanning(OWW_CHUNK).astype(np.float32)
+        self._edges = np.linspace(0, OWW_CHUNK // 2 + 1, _GATE_BANDS + 1).astype(int)[:-1]
+        self._prev: np.ndarray | None = None
+        self._open = hangover           # the first chunks always run the models
+        self.chunks = 0
+        self.skipped = 0
+        self.gate_s = 0.0
+        self.model_s = 0.0
+        self.runs = 0
+        self.preroll_s = 0.0
+
+    def silent(self, chunk: np.ndarray) -> bool:
+        """True if inference can be skipped for ``chunk``."""
+        self.chunks += 1
+        if self.rms_floor <= 0:
+            return False
+        t0 = time.perf_counter()
+        x = chunk.astype(np.float32)
+        rms = float(np.sqrt(np.dot(x, x) / len(x)))
+        power = np.abs(np.fft.rfft(x * self._window)) ** 2
+        bands = 10.0 * np.log10(np.add.reduceat(power, self._edges) + 1.0)
+        # Mean rise of the quarter of bands that rose most: broadband or not,
+        # an onset lifts a few bands well above the chunk-to-chunk jitter.
+        flux = 0.0 if self._prev is None else float(
+            np.mean(np.sort(np.maximum(bands - self._prev, 0.0))[-_GATE_BANDS // 4:]))
+        self._prev = bands
+        if rms >= self.rms_floor or flux >= self.flux_db:
+            self._open = self.hangover
+            skip = False
+        elif self._open > 0:
+            self._open -= 1
+            skip = False
+        else:
+            skip = True
+        self.skipped += skip
+        self.gate_s += time.perf_counter() - t0
+        return skip
+
+    def ran(self, seconds: float) -> None:
+        """Record the inference time of one chunk the gate let through."""
+        self.model_s += seconds
+        self.runs += 1
+
+    def prerolled(self, seconds: float) -> None:
+        """Record the cost of re-featurizing skipped chunks before a run."""
+        self.preroll_s += seconds
+
+    def stats(self) -> dict:
+        model_ms = self.model_s / self.runs * 1000 if self.runs else None
+        # What the skipped chunks would have cost, minus the gate and pre-rolls.
+        saved_s = (self.skipped * self.model_s / self.runs if self.runs else 0.0) \
+            - self.gate_s - self.preroll_s
+        return {
+            "chunks": self.chunks,
+            "skipped": self.skipped,
+            "skipped_fraction": round(self.skipped / self.chunks, 3) if self.chunks else 0.0,
+            "model_ms": round(model_ms, 2) if model_ms is not None else None,
+            "gate_us": round(self.gate_s / self.chunks * 1e6, 1) if self.chunks else None,
+            "preroll_s": round(self.preroll_s, 1),
+            "cpu_saved_s": round(saved_s, 1),
+        }
 
 
 def _resolve_model(model: str) -> str:
@@ -49,16 +233,66 @@ class WakeDetector:
                 log.warning("speexdsp_ns unavailable — wake noise suppression off")
         self._model = Model(**kwargs)
         self._key = list(self._model.models.keys())[0]
+        self._speex = speex_on
+        # Flush silence through once and keep the result: reset() and fork()
+        # restore this snapshot instead of re-running the models.
+        silence = np.zeros(OWW_CHUNK, dtype=np.int16)
+        for _ in range(FLUSH_CHUNKS):
+            self._model.predict(silence)
+        self._flushed = _capture(self._model)
+        self._gate = EnergyGate()
+        self._pending = 0               # chunks skipped since the last scored one
         log.info(
             f"WakeDetector ready (model={path}, key={self._key}, "
-            f"vad_threshold={WAKE_VAD_THRESHOLD}, speex_ns={speex_on})"
+            f"vad_threshold={WAKE_VAD_THRESHOLD}, speex_ns={speex_on}, gate_rms={WAKE_GATE_RMS})"
         )
 
+    def fork(self) -> "WakeDetector":
+        """A detector with fresh streaming state sharing this one's ONNX sessions."""
+        clone = copy.copy(self)
+        model = clone._model = copy.copy(self._model)
+        model.preprocessor = copy.copy(self._model.preprocessor)
+        if "vad" in self._flushed:
+            model.vad = copy.copy(self._model.vad)
+        if self._speex:
+            from speexdsp_ns import NoiseSuppression
+            model.speex_ns = NoiseSuppression.create(160, 16000)
+        _restore(model, self._flushed)
+        clone._gate = EnergyGate()
+        clone._pending = 0
+        return clone
+
+    def warmup(self, chunks: int = 8) -> None:
+        """Run the ONNX sessions a few times on a throwaway fork (first
+        inferences allocate and are slow); this detector's state is untouched."""
+        probe = self.fork()
+        noise = np.random.default_rng(0).normal(0, 300, OWW_CHUNK * chunks).astype(np.int16)
+        for chunk in noise.reshape(chunks, OWW_CHUNK):
+            probe.score(chunk)
+
     def score(self, chunk_int16: np.ndarray) -> float:
-        return float(self._model.predict(chunk_int16)[self._key])
+        if (self._model.preprocessor.accumulated_samples == 0 and len(chunk_int16) == OWW_CHUNK
+                and self._gate.silent(chunk_int16)):
+            _advance_silent(self._model, chunk_int16, self._flushed)
+            self._pending += 1
+            return 0.0
+        if self._pending:
+            t0 = time.perf_counter()
+            _rewind_silent(self._model, min(self._pending, _PREROLL_CHUNKS))
+            self._gate.prerolled(time.perf_counter() - t0)
+            self._pending = 0
+        t0 = time.perf_counter()
+        score = float(self._model.predict(chunk_int16)[self._key])
+        if len(chunk_int16) == OWW_CHUNK:         # model_ms is per single chunk
+            self._gate.ran(time.perf_counter() - t0)
+        return score
+
+    def stats(self) -> dict:
+        return self._gate.stats()
 
     def reset(self) -> None:
-        self._model.reset()
-        silence = np.zeros(OWW_CHUNK, dtype=np.int16)
-        for _ in range(FLUSH_CHUNKS):
-            self._model.predict(silence)
+        """Forget the audio heard so far (notably the wake word that just
+        fired): restores the flushed-silence snapshot, as if FLUSH_CHUNKS of
+        silence had been scored, without running any model."""
+        _restore(self._model, self._flushed)
+        self._pending = 0
@@ -0,0 +1,42 @@
+"""Snapshot and restore of an initialized XTTS model for fast restarts.
+
+``tts_engine.py`` saves the weights of a cold-loaded model once and later
+rebuilds the model on the meta device (no allocation, no random init) and
+assigns the saved tensors, memory-mapped from disk.
+
+A loaded Xtts has run ``gpt.init_gpt_for_inference()``, which registers the
+same tensors a second time under ``gpt.gpt_inference.*`` (the HF wrapper
+around the GPT) and ``gpt.gpt.wte.*`` (the mel embedding). A freshly built
+model has neither, so those aliases are left out of the snapshot, and any
+key the fresh model does not have is ignored on restore; the caller runs
+``init_gpt_for_inference()`` again afterwards, as a cold load does.
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Callable
+
+import torch
+
+INFERENCE_ALIASES = ("gpt.gpt_inference.", "gpt.gpt.wte.")
+
+
+def cpu_state(module: torch.nn.Module) -> dict:
+    """CPU copy of ``module``'s state dict, without the inference aliases."""
+    return {k: v.detach().cpu() for k, v in module.state_dict().items()
+            if not k.startswith(INFERENCE_ALIASES)}
+
+
+def restore(build: Callable[[], torch.nn.Module], state: dict) -> torch.nn.Module:
+    """``build()`` on the meta device, then assign ``state`` into it.
+
+    Raises ValueError if a parameter or buffer is not in ``state``.
+    """
+    with torch.device("meta"):
+        module = build()
+    module.load_state_dict(state, strict=False, assign=True)     # aliases: unexpected keys
+    missing = [name for name, t in itertools.chain(module.named_parameters(), module.named_buffers())
+               if t.is_meta]
+    if missing:
+        raise ValueError(f"tensors not in cache: {', '.join(missing[:3])}")
+    return module
@@ -0,0 +1,78 @@
+"""PCM16 WAV framing for audio that is still being produced.
+
+``tts_engine.py`` streams a WAV header whose sizes are unknown (0xFFFFFFFF)
+followed by raw PCM as XTTS generates it. These helpers build such headers,
+split a byte stream back into its format and sample-aligned PCM chunks, and
+re-wrap finished PCM as an ordinary WAV.
+"""
+from __future__ import annotations
+
+import struct
+from typing import Iterable, Iterator, NamedTuple
+
+UNKNOWN_SIZE = 0xFFFFFFFF
+HEADER_SIZE = 44
+
+
+class WavFormat(NamedTuple):
+    sample_rate: int
+    channels: int = 1
+    bits: int = 16
+
+    @property
+    def frame_bytes(self) -> int:
+        return self.channels * self.bits // 8
+
+
+def wav_header(fmt: WavFormat, data_size: int = UNKNOWN_SIZE) -> bytes:
+    """Canonical 44-byte PCM header; the default sizes mean "streaming"."""
+    riff_size = UNKNOWN_SIZE if data_size == UNKNOWN_SIZE else 36 + data_size
+    return (b"RIFF" + struct.pack("<I", riff_size) + b"WAVEfmt "
+            + struct.pack("<IHHIIHH", 16, 1, fmt.channels, fmt.sample_rate,
+                          fmt.sample_rate * fmt.frame_bytes, fmt.frame_bytes, fmt.bits)
+            + b"data" + struct.pack("<I", data_size))
+
+
+def parse_header(header: bytes) -> WavFormat:
+    if len(header) < HEADER_SIZE or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+        raise ValueError("not a WAV stream")
+    channels, sample_rate = struct.unpack_from("<HI", header, 22)
+    bits = struct.unpack_from("<H", header, 34)[0]
+    if header[36:40] != b"data":
+        raise ValueError("WAV stream must start its data chunk at byte 36")
+    return WavFormat(sample_rate, channels, bits)
+
+
+def iter_pcm(chunks: Iterable[bytes]) -> tuple[WavFormat, Iterator[bytes]]:
+    """Split a streamed WAV into its format and frame-aligned PCM chunks.
+
+    Reads just enough of ``chunks`` to parse the header; the PCM iterator
+    then yields each network chunk as it arrives, holding back a partial
+    sample frame until the rest of it comes in.
+    """
+    it = iter(chunks)
+    head = b""
+    while len(head) < HEADER_SIZE:
+        data = next(it, None)
+        if data is None:
+            raise ValueError("WAV stream ended inside its header")
+        head += data
+    fmt = parse_header(head)
+
+    def pcm() -> Iterator[bytes]:
+        carry = head[HEADER_SIZE:]
+        for data in it:
+            carry += data
+            cut = len(carry) - len(carry) % fmt.frame_bytes
+            if cut:
+                yield carry[:cut]
+                carry = carry[cut:]
+        cut = len(carry) - len(carry) % fmt.frame_bytes
+        if cut:
+            yield carry[:cut]
+
+    return fmt, pcm()
+
+
+def pcm_to_wav(fmt: WavFormat, pcm: bytes) -> bytes:
+    return wav_header(fmt, len(pcm)) + pcm
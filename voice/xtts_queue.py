@@ -0,0 +1,216 @@
+"""Prioritized, cancellable job queue in front of the XTTS model.
+
+The model can only run one synthesis at a time, so every request becomes a
+``Job`` executed by a single worker thread while the HTTP handlers (one
+thread each) only wait for output, which leaves /health and /speakers
+responsive during a long synthesis. A job's work is a generator of audio
+chunks. The worker advances the highest-priority job by one chunk at a
+time, so an interactive reply that arrives while a background stream is
+running takes over at the next chunk boundary instead of waiting for it
+to finish. The model keeps streaming state between chunks, so two
+generators are never interleaved: the preempted job is closed and
+requeued from the start. Its output is held until it completes, so a
+restart only throws away work, never audio a client has already
+received. Interactive jobs are never preempted and stream as they go.
+
+Classes, most urgent first: ``interactive`` (live answers), ``announcement``
+(scheduled speech) and ``batch`` (cache prewarm, chime regeneration). A job
+is dropped before its next chunk once it is cancelled, whether because the
+client disconnected or through ``cancel(job_id)``.
+"""
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import queue
+import threading
+import time
+import uuid
+from typing import Callable, Iterator, Optional
+
+log = logging.getLogger("voice")
+
+PRIORITIES = {"interactive": 0, "announcement": 1, "batch": 2}
+_DONE = object()
+_HISTORY = 200          # latency samples kept per class
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    def __init__(self, work: Callable[[], Iterator[bytes]], klass: str,
+                 job_id: Optional[str] = None):
+        self.id = job_id or uuid.uuid4().hex[:12]
+        self.klass = klass
+        self.work = work
+        self.submitted = time.monotonic()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.error: Optional[BaseException] = None
+        self.cancelled = threading.Event()
+        self._out: queue.Queue = queue.Queue()
+        self._gen: Optional[Iterator[bytes]] = None
+        self._held: list[bytes] = []              # output of a preemptible job, until done
+
+    def cancel(self) -> None:
+        self.cancelled.set()
+
+    def chunks(self, poll: Optional[Callable[[], bool]] = None,
+               poll_s: float = 0.1) -> Iterator[bytes]:
+        """Yield output as the worker produces it; re-raises the job's error.
+
+        ``poll()`` is called while waiting and cancels the job when it
+        returns True (e.g. the client hung up).
+        """
+        while True:
+            try:
+                item = self._out.get(timeout=poll_s)
+            except queue.Empty:
+                if poll is not None and poll():
+                    self.cancel()
+                if self.cancelled.is_set():
+                    raise JobCancelled(self.id)     # the worker drops it at its next step
+                continue
+            if item is _DONE:
+                if self.error is not None:
+                    raise self.error
+                if self.cancelled.is_set():
+                    raise JobCancelled(self.id)
+                return
+            yield item
+
+    def result(self, poll: Optional[Callable[[], bool]] = None) -> bytes:
+        return b"".join(self.chunks(poll))
+
+
+class JobQueue:
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, Job]] = []
+        self._seq = itertools.count()
+        self._jobs: dict[str, Job] = {}           # queued or running, by id
+        self.running: Optional[Job] = None
+        self.completed = 0
+        self.cancelled = 0
+        self.failed = 0
+        self.preempted = 0
+        self._waits: dict[str, list[float]] = {k: [] for k in PRIORITIES}
+        self._totals: dict[str, list[float]] = {k: [] for k in PRIORITIES}
+
+    def submit(self, work: Callable[[], Iterator[bytes]], klass: str = "interactive",
+               job_id: Optional[str] = None) -> Job:
+        """Queue ``work`` (a generator function); ``job_id`` lets the client
+        choose the id it will cancel with."""
+        if klass not in PRIORITIES:
+            raise ValueError(f"unknown priority class {klass!r}")
+        job = Job(work, klass, job_id)
+        with self._cond:
+            heapq.heappush(self._heap, (PRIORITIES[klass], next(self._seq), job))
+            self._jobs[job.id] = job
+            self._cond.notify()
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def start(self) -> None:
+        threading.Thread(target=self.run_forever, name="xtts-worker", daemon=True).start()
+
+    def run_forever(self) -> None:
+        while True:
+            with self._cond:
+                while not self._heap:
+                    self._cond.wait()
+                prio, seq, job = heapq.heappop(self._heap)
+                self.running = job
+            again = self._step(job)
+            with self._cond:
+                self.running = None
+                if again:
+                    if self._heap and self._heap[0][0] < prio:
+                        # Something more urgent is waiting: restart this one
+                        # later rather than resuming a stale generator.
+                        self.preempted += 1
+                        job._gen.close()
+                        job._gen = None
+                        job._held.clear()
+                    # Back in line under its original sequence number: it keeps
+                    # its place among equals, but anything more urgent goes first.
+                    heapq.heappush(self._heap, (prio, seq, job))
+
+    def _step(self, job: Job) -> bool:
+        """Advance ``job`` by one chunk; False once it is over."""
+        if job.cancelled.is_set():
+            if job._gen is not None:
+                job._gen.close()
+            self._finish(job)
+            return False
+        try:
+            if job._gen is None:
+                if job.started is None:
+                    job.started = time.monotonic()
+                job._gen = iter(job.work())
+            chunk = next(job._gen)
+            if PRIORITIES[job.klass] == 0:
+                job._out.put(chunk)
+            else:
+                job._held.append(chunk)
+            return True
+        except StopIteration:
+            pass
+        except Exception as e:
+            job.error = e
+            log.warning(f"XTTS job {job.id} ({job.klass}) failed: {e}")
+        self._finish(job)
+        return False
+
+    def _finish(self, job: Job) -> None:
+        job.finished = time.monotonic()
+        with self._cond:
+            self._jobs.pop(job.id, None)
+            if job.cancelled.is_set():
+                self.cancelled += 1
+            elif job.error is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+                for chunk in job._held:
+                    job._out.put(chunk)
+                for samples, value in ((self._waits, job.started - job.submitted),
+                                       (self._totals, job.finished - job.submitted)):
+                    samples[job.klass].append(value)
+                    del samples[job.klass][:-_HISTORY]
+        job._out.put(_DONE)
+
+    def stats(self) -> dict:
+        def ms(values: list[float], q: float) -> Optional[float]:
+            if not values:
+                return None
+            ordered = sorted(values)
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 1)
+
+        with self._cond:
+            depth = {k: 0 for k in PRIORITIES}
+            for _, _, job in self._heap:
+                depth[job.klass] += 1
+            return {
+                "depth": depth,
+                "running": self.running.klass if self.running else None,
+                "completed": self.completed,
+                "cancelled": self.cancelled,
+                "failed": self.failed,
+                "preempted": self.preempted,
+                "latency_ms": {
+                    k: {"wait_p50": ms(self._waits[k], 0.5), "wait_p95": ms(self._waits[k], 0.95),
+                        "total_p50": ms(self._totals[k], 0.5), "total_p95": ms(self._totals[k], 0.95)}
+                    for k in PRIORITIES
+                },
+            }